@@ -0,0 +1,59 @@
+# benchmarks/__main__.py
+
+"""Command line entry point: python -m benchmarks [options].
+
+Examples:
+    python -m benchmarks --save-baseline benchmarks/baseline.json
+    python -m benchmarks --baseline benchmarks/baseline.json --output benchmarks/latest.json
+
+Exits with status 1 when any case is slower than the baseline by more than
+the tolerance.
+"""
+
+import argparse
+import sys
+
+from benchmarks.cases import CASES
+from benchmarks.harness import compare, load_report, run_suite, save_report
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="Battle engine benchmarks")
+    parser.add_argument("cases", nargs="*", help="Only run these cases (default: all)")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed samples per case")
+    parser.add_argument("--min-time", type=float, default=0.05, help="Minimum seconds per sample")
+    parser.add_argument("--output", help="Write the results as JSON to this path")
+    parser.add_argument("--baseline", help="Compare against a previously saved report")
+    parser.add_argument("--save-baseline", help="Write the results as the new baseline to this path")
+    parser.add_argument("--tolerance", type=float, default=0.10, help="Allowed slowdown before failing (fraction)")
+    args = parser.parse_args(argv)
+
+    known = {case.name: case for case in CASES}
+    unknown = [name for name in args.cases if name not in known]
+    if unknown:
+        parser.error(f"unknown case(s): {', '.join(unknown)} (choose from {', '.join(known)})")
+    cases = [known[name] for name in args.cases] if args.cases else CASES
+
+    def show(result):
+        print(f"{result.name:<30} {result.ops_per_sec:>14,.0f} ops/s {result.units_per_sec:>14,.0f} {result.unit}/s"
+              f"  ±{result.spread:5.1%}  peak {result.alloc_peak_bytes:>8,} B  {result.alloc_blocks_per_op:+.2f} blocks/op")
+
+    report = run_suite(cases, repeat=args.repeat, min_time=args.min_time, progress=show)
+    if args.output:
+        save_report(report, args.output)
+    if args.save_baseline:
+        save_report(report, args.save_baseline)
+
+    if args.baseline:
+        changes = compare(report, load_report(args.baseline), args.tolerance)
+        print()
+        for change in changes:
+            flag = "REGRESSION" if change["regression"] else ""
+            print(f"{change['name']:<30} {change['change']:+7.1%} {flag}")
+        if any(change["regression"] for change in changes):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
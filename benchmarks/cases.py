@@ -0,0 +1,131 @@
+# benchmarks/cases.py
+
+"""Benchmark cases for the battle engine hot paths.
+
+Every case builds its inputs from fixed stats and fixed seeds, so runs are
+comparable across commits.
+"""
+
+from game.battle import Battle
+from game.classes.move import Move
+from game.classes.player import Player
+from game.classes.pokemon import Pokemon
+from benchmarks.harness import Case, Op
+
+SEED = 1234
+
+
+def _pokemon(name: str, max_hp: int = 120, speed: int = 50) -> Pokemon:
+    pokemon = Pokemon(species_name=name, types=["Electric"], level=30, max_hp=max_hp, attack=45, defense=40, speed=speed)
+    pokemon.moves = [Move(name="Thunder Shock", type="Electric", category="Special", power=40, accuracy=100, pp=30),
+                     Move(name="Quick Attack", type="Normal", category="Physical", power=40, accuracy=100, pp=30)]
+    return pokemon
+
+
+def _battle(player_hp: int = 120, opponent_hp: int = 120) -> Battle:
+    player = Player("Bench")
+    player.team.append(_pokemon("Pikachu", player_hp, speed=90))
+    opponent = _pokemon("Rattata", opponent_hp, speed=72)
+    opponent.types = ["Normal"]
+    return Battle(player, opponent, headless=True, seed=SEED)
+
+
+def calculate_damage() -> Op:
+    battle = _battle()
+    attacker, defender = battle.player_active_pokemon, battle.opponent
+    move = attacker.moves[0]
+    calc = battle._calculate_damage
+
+    def op() -> int:
+        calc(attacker, defender, move)
+        return 1
+    return op
+
+
+def execute_turn() -> Op:
+    # Enough HP that the defender never faints while the benchmark runs
+    battle = _battle(opponent_hp=10**12)
+    attacker, defender = battle.player_active_pokemon, battle.opponent
+    move = attacker.moves[0]
+    execute = battle._execute_turn
+
+    def op() -> int:
+        execute(attacker, defender, move)
+        return 1
+    return op
+
+
+def run_battle_headless() -> Op:
+    player = Player("Bench")
+    player_poke = _pokemon("Pikachu", speed=90)
+    player.team.append(player_poke)
+    opponent = _pokemon("Rattata", speed=72)
+    seed = [SEED]
+
+    def op() -> int:
+        player_poke.current_hp, opponent.current_hp = player_poke.max_hp, opponent.max_hp
+        seed[0] += 1 # A different but fixed sequence of battles
+        battle = Battle(player, opponent, headless=True, seed=seed[0])
+        battle.run_battle()
+        return battle.turn_count
+    return op
+
+
+def run_team_battle_headless() -> Op:
+    """Six against six with forced replacements; per turn it should cost about the same as 1v1."""
+    player, rival = Player("Bench"), Player("Rival")
+    player.team.extend(_pokemon(f"Member{i}", speed=90) for i in range(6))
+    rival.team.extend(_pokemon(f"Rival{i}", speed=72) for i in range(6))
+    seed = [SEED]
+
+    def op() -> int:
+        for pokemon in player.team + rival.team:
+            pokemon.current_hp = pokemon.max_hp
+        seed[0] += 1
+        battle = Battle(player, rival, headless=True, seed=seed[0])
+        battle.run_battle()
+        return battle.turn_count
+    return op
+
+
+def pokemon_construction() -> Op:
+    def op() -> int:
+        Pokemon(species_name="Pikachu", types=["Electric"], level=30, max_hp=120, attack=45, defense=40, speed=90)
+        return 1
+    return op
+
+
+def gain_xp_large() -> Op:
+    import random
+    rng = random.Random(SEED)
+
+    def op() -> int:
+        pokemon = _pokemon("Pikachu")
+        pokemon.level = 1
+        pokemon.gain_xp(50_000, rng) # Runs all the way to the level cap
+        return pokemon.level - 1 # Levels gained
+    return op
+
+
+def get_active_pokemon_full_team() -> Op:
+    player = Player("Bench")
+    player.team.extend(_pokemon(f"Member{i}") for i in range(6))
+    for pokemon in player.team[:5]:
+        pokemon.current_hp = 0 # Worst case: only the last one can fight
+    get_active = player.get_active_pokemon
+
+    def op() -> int:
+        get_active()
+        return 1
+    return op
+
+
+CASES: list[Case] = [
+    Case("calculate_damage", calculate_damage, "calls"),
+    Case("execute_turn", execute_turn, "moves"),
+    Case("run_battle_headless", run_battle_headless, "turns"),
+    Case("run_team_battle_headless", run_team_battle_headless, "turns"),
+    Case("pokemon_construction", pokemon_construction, "pokemon"),
+    Case("gain_xp_large", gain_xp_large, "levels"),
+    Case("get_active_pokemon_full_team", get_active_pokemon_full_team, "lookups"),
+]
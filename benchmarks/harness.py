@@ -0,0 +1,168 @@
+# benchmarks/harness.py
+
+"""Timing, allocation measurement, and baseline comparison for benchmark cases.
+
+A case is a function `setup() -> op`, where `op()` performs one operation
+and returns how many work units it processed (e.g. turns played). Each case
+is calibrated so one sample takes at least `min_time` seconds, then timed
+for `repeat` samples with the garbage collector disabled (as timeit does);
+the median sample is reported, with the spread between samples as a
+stability check. Allocations are measured separately under tracemalloc so
+tracing does not distort the timings.
+"""
+
+import contextlib
+import gc
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass, asdict
+from typing import Callable
+
+Op = Callable[[], int]
+
+
+@dataclass
+class Case:
+    name: str
+    setup: Callable[[], Op]
+    unit: str = "ops" # What the numbers returned by op() count
+
+
+@dataclass
+class CaseResult:
+    name: str
+    unit: str
+    ops_per_sec: float
+    units_per_sec: float
+    median_s: float          # Seconds per op (median sample)
+    spread: float            # (max - min) / median over the samples
+    alloc_peak_bytes: int    # Peak traced memory during one op
+    alloc_blocks_per_op: float # Net memory blocks still allocated after each op
+
+
+class _NullWriter:
+    """Stand-in for stdout so cases that print are timed without the terminal."""
+
+    def write(self, text: str) -> int:
+        return len(text)
+
+    def flush(self):
+        pass
+
+
+def _time_op(op: Op, number: int) -> tuple[float, int]:
+    units = 0
+    started = time.perf_counter()
+    for _ in range(number):
+        units += op()
+    return time.perf_counter() - started, units
+
+
+def _calibrate(op: Op, min_time: float) -> int:
+    number = 1
+    while True:
+        elapsed, _ = _time_op(op, number)
+        if elapsed >= min_time:
+            return number
+        number *= 2 if elapsed == 0 else max(2, min(10, int(min_time / elapsed) + 1))
+
+
+def _measure_allocations(op: Op, number: int) -> tuple[int, float]:
+    op() # Let caches fill outside the measurement
+    tracemalloc.start()
+    try:
+        base, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        op()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    blocks_before = sys.getallocatedblocks()
+    for _ in range(number):
+        op()
+    blocks_after = sys.getallocatedblocks()
+    return max(0, peak - base), (blocks_after - blocks_before) / number
+
+
+def run_case(case: Case, repeat: int = 5, min_time: float = 0.05) -> CaseResult:
+    """Benchmark one case and return its result."""
+    with contextlib.redirect_stdout(_NullWriter()):
+        op = case.setup()
+        op() # Warm up
+        number = _calibrate(op, min_time)
+        samples = []
+        units = 0
+        gc_was_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            for _ in range(repeat):
+                elapsed, units = _time_op(op, number)
+                samples.append(elapsed / number)
+        finally:
+            if gc_was_enabled:
+                gc.enable()
+        peak, blocks = _measure_allocations(op, min(number, 1000))
+    median = statistics.median(samples)
+    units_per_op = units / number
+    return CaseResult(name=case.name, unit=case.unit, ops_per_sec=1 / median if median else float("inf"),
+                      units_per_sec=units_per_op / median if median else float("inf"), median_s=median,
+                      spread=(max(samples) - min(samples)) / median if median else 0.0,
+                      alloc_peak_bytes=peak, alloc_blocks_per_op=blocks)
+
+
+def run_suite(cases: list[Case], repeat: int = 5, min_time: float = 0.05,
+              progress: Callable[[CaseResult], None] | None = None) -> dict:
+    """Run every case and return a JSON-serialisable report."""
+    results = {}
+    for case in cases:
+        result = run_case(case, repeat, min_time)
+        results[case.name] = asdict(result)
+        if progress is not None:
+            progress(result)
+    return {
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "machine": platform.machine(),
+        "repeat": repeat,
+        "min_time": min_time,
+        "results": results,
+    }
+
+
+def save_report(report: dict, path: str):
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2, sort_keys=True)
+        f.write("\n")
+
+
+def load_report(path: str) -> dict:
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def compare(report: dict, baseline: dict, tolerance: float = 0.10) -> list[dict]:
+    """Per-case throughput changes against `baseline`.
+
+    Each entry has the case name, both ops/sec figures, the relative change
+    and whether it is a regression (slower by more than `tolerance`). Cases
+    missing from either report are skipped.
+    """
+    changes = []
+    for name, current in report["results"].items():
+        previous = baseline.get("results", {}).get(name)
+        if previous is None or not previous["ops_per_sec"]:
+            continue
+        change = current["ops_per_sec"] / previous["ops_per_sec"] - 1
+        changes.append({"name": name, "baseline_ops_per_sec": previous["ops_per_sec"],
+                        "ops_per_sec": current["ops_per_sec"], "change": change,
+                        "regression": change < -tolerance})
+    return changes
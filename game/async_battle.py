@@ -0,0 +1,134 @@
+# game/async_battle.py
+
+"""Awaitable decision providers and helpers for running many battles on one event loop.
+
+Battle.run_battle_async asks each side for its move through a provider: any
+async callable taking the battle and returning a Move (or None to give up).
+Because providers are awaited, a slow decision (an LLM call, a remote agent)
+only suspends its own battle, and hundreds of battles can share one
+interpreter and one event loop. Providers that also define
+choose_replacement() pick which team member goes in after a faint.
+"""
+
+import asyncio
+from typing import Callable
+
+from game.battle import Battle
+from game.classes.move import Move
+
+
+class DecisionProvider:
+    """Base class for providers; subclasses implement choose_move() and may override choose_replacement()."""
+
+    async def choose_move(self, battle: Battle) -> Move | None:
+        raise NotImplementedError
+
+    async def choose_replacement(self, battle: Battle) -> int | None:
+        """Team slot to send in after this side's active Pokémon fainted (None: the first usable one)."""
+        return None
+
+    async def __call__(self, battle: Battle) -> Move | None:
+        return await self.choose_move(battle)
+
+
+def _active_moves(battle: Battle, side: str) -> list[Move]:
+    pokemon = battle.player_active_pokemon if side == "player" else battle.opponent
+    return pokemon.moves if pokemon else []
+
+
+class ChooserProvider(DecisionProvider):
+    """Adapts a regular chooser (e.g. SearchOpponent) to the provider interface.
+
+    With `in_thread=True` the chooser runs in a worker thread so CPU-heavy
+    searches do not stall the other battles on the loop.
+    """
+
+    def __init__(self, chooser: Callable[[Battle], Move | None], in_thread: bool = False,
+                 replacement_chooser: Callable[[Battle], int | None] | None = None):
+        self.chooser = chooser
+        self.in_thread: bool = in_thread
+        self.replacement_chooser = replacement_chooser
+
+    async def choose_move(self, battle: Battle) -> Move | None:
+        if self.in_thread:
+            return await asyncio.to_thread(self.chooser, battle)
+        return self.chooser(battle)
+
+    async def choose_replacement(self, battle: Battle) -> int | None:
+        if self.replacement_chooser is None:
+            return None
+        return self.replacement_chooser(battle)
+
+
+class QueueProvider(DecisionProvider):
+    """Takes move indices pushed by an external agent (e.g. a network handler).
+
+    Put an int (index into the active Pokémon's moves) or None (give up)
+    into `queue`; invalid indices are ignored until a valid one arrives.
+    After a faint the next int taken is the team slot to send in instead
+    (None, or a slot that cannot battle, sends the first usable Pokémon).
+    """
+
+    def __init__(self, side: str = "player", queue: asyncio.Queue | None = None):
+        if side not in ("player", "opponent"):
+            raise ValueError("side must be 'player' or 'opponent'.")
+        self.side: str = side
+        self.queue: asyncio.Queue = queue or asyncio.Queue()
+
+    async def choose_move(self, battle: Battle) -> Move | None:
+        moves = _active_moves(battle, self.side)
+        while True:
+            index = await self.queue.get()
+            if index is None:
+                return None
+            if 0 <= index < len(moves):
+                return moves[index]
+
+    async def choose_replacement(self, battle: Battle) -> int | None:
+        return await self.queue.get()
+
+
+class ConsoleProvider(DecisionProvider):
+    """Interactive prompt that reads stdin in a thread instead of blocking the loop."""
+
+    async def choose_move(self, battle: Battle) -> Move | None:
+        moves = _active_moves(battle, "player")
+        if not moves:
+            return None
+        for i, move in enumerate(moves):
+            battle.output.write(f"  {i + 1}: {move.name}")
+        while True:
+            try:
+                battle.output.frame(battle) # Show the menu (or the last error) before waiting
+                choice = await asyncio.to_thread(input, "Enter move number: ")
+            except EOFError:
+                return None
+            if choice.isdigit() and 1 <= int(choice) <= len(moves):
+                return moves[int(choice) - 1]
+            battle.output.write(f"Invalid choice. Please enter a number between 1 and {len(moves)}.")
+
+    async def choose_replacement(self, battle: Battle) -> int | None:
+        team = battle.player.team
+        options = [slot for slot in team.alive_slots() if slot != battle.state.active[0]]
+        for slot in options:
+            battle.output.write(f"  {slot + 1}: {team[slot].nickname or team[slot].species_name}")
+        battle.output.frame(battle)
+        try:
+            choice = await asyncio.to_thread(input, "Which Pokemon should go in? ")
+        except EOFError:
+            return None
+        return int(choice) - 1 if choice.isdigit() else None
+
+
+async def run_battles(jobs: list[tuple[Battle, Callable | None, Callable | None]],
+                      decision_timeout: float | None = None, max_concurrency: int | None = None) -> list:
+    """Run (battle, player_provider, opponent_provider) jobs concurrently; return winners in job order."""
+    limit = asyncio.Semaphore(max_concurrency) if max_concurrency else None
+
+    async def run_one(battle: Battle, player_provider, opponent_provider):
+        if limit is None:
+            return await battle.run_battle_async(player_provider, opponent_provider, decision_timeout)
+        async with limit:
+            return await battle.run_battle_async(player_provider, opponent_provider, decision_timeout)
+
+    return await asyncio.gather(*(run_one(*job) for job in jobs))
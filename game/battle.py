@@ -3,8 +3,10 @@
 """Contains the logic for handling Pokémon battles."""
 
 # Need to import the relevant classes
+import asyncio
 import random
-import time
+from dataclasses import dataclass
+from typing import Callable
 # Assuming Pokemon and Move classes are in game.classes
 # We'll need to adjust imports if structure changes
 try:
@@ -18,27 +20,167 @@ except ImportError:
     class Pokemon: pass
     class Move: pass
     class Player: pass # Dummy classes
+from game.output import OutputSink, StdoutSink, NullSink, Pacer, SleepPacer, NoPacer
+from game.replay import BattleReplay, SWITCH_FLAG
+from game.types import TYPES, STAB_MULTIPLIER
+from game.classes.move import STATUS
+from game.state import BattleState, PLAYER, OPPONENT
+from game.events import (EventBus, BattleStarted, TurnStarted, MoveUsed, MoveHit, MoveMissed, DamageDealt,
+                         Fainted, Switched, BattleEnded)
+
+# Random damage variance band applied on top of the base damage
+DAMAGE_VARIANCE_MIN = 0.85
+DAMAGE_VARIANCE_MAX = 1.00
+
+def calculate_base_damage(attacker: Pokemon, defender: Pokemon, move: Move) -> float:
+    """Return the damage a move would deal before random variance (0 for no direct damage).
+
+    This is the deterministic part of Battle._calculate_damage, shared with the
+    batch simulator so both follow exactly the same rules. Type effectiveness
+    and STAB are looked up by integer id, so the cost does not depend on types.
+    """
+    if move.category_id == STATUS:
+        return 0.0 # Status moves don't do direct damage
+    effectiveness = TYPES.dual_chart[move.type_id][defender.type_key]
+    if effectiveness == 0:
+        return 0.0 # Immune
+
+    # TODO: Add Special Attack/Defense distinction based on move.category_id
+    # TODO: Add critical hits
+
+    # Simplified Formula (based loosely on Gen 1-4 formula parts)
+    level_factor = (2 * attacker.level / 5) + 2
+    # Use Attack/Defense for now regardless of category
+    atk_def_ratio = attacker.attack / defender.defense
+    damage = ((level_factor * move.power * atk_def_ratio) / 50) + 2
+    if TYPES.has_type(attacker.type_key, move.type_id):
+        damage *= STAB_MULTIPLIER
+    return damage * effectiveness
+
+@dataclass(frozen=True, slots=True)
+class Switch:
+    """Battle action: send out the team member in `slot` instead of using a move."""
+    slot: int
 
 class Battle:
-    """Manages a single 1v1 Pokémon battle."""
+    """Manages a Pokémon battle against a wild Pokémon or another trainer's team."""
 
-    def __init__(self, player: Player, opponent_pokemon: Pokemon):
-        """Initialize the battle with a Player object and an opponent Pokemon."""
+    def __init__(self, player: Player, opponent_pokemon: Pokemon | Player,
+                 output: OutputSink | None = None, pacer: Pacer | None = None,
+                 headless: bool = False,
+                 player_move_chooser: Callable[["Battle"], Move | Switch | None] | None = None,
+                 opponent_move_chooser: Callable[["Battle"], Move | Switch | None] | None = None,
+                 max_turns: int | None = None, seed: int | None = None, events: EventBus | None = None,
+                 stats=None,
+                 player_switch_chooser: Callable[["Battle"], int] | None = None,
+                 opponent_switch_chooser: Callable[["Battle"], int] | None = None):
+        """Initialize the battle with a Player object and an opponent.
+
+        The opponent is either a wild Pokemon or another Player (a trainer),
+        whose whole team takes part. Each side battles with its first usable
+        Pokémon; choosers may return a Switch(slot) instead of a Move to swap
+        in another team member, and when an active Pokémon faints its side
+        must send in a replacement. `player_switch_chooser` and
+        `opponent_switch_chooser` pick that replacement's team slot; by
+        default it is the first usable Pokémon (the player is asked instead
+        when choosing moves interactively).
+
+        `output` receives all battle text and `pacer` handles the pauses between
+        messages. With `headless=True` they default to a NullSink and NoPacer so
+        the battle runs silently at full speed; otherwise they default to stdout
+        and real sleeps. `player_move_chooser` replaces the interactive prompt;
+        headless battles without one fall back to the player's first move.
+        `opponent_move_chooser` likewise replaces the built-in opponent AI.
+        `max_turns` caps the battle length (a battle that hits it ends with no winner).
+
+        All randomness comes from `self.rng`, seeded with `seed` (a fresh seed is
+        drawn when omitted), and the moves chosen each turn are recorded in
+        `self.replay`, so any battle can be reproduced with game.replay.replay_battle.
+        Choosers should not draw from `self.rng`, or replays will diverge.
+
+        `events` is the EventBus the battle publishes typed events on (see
+        game.events); a private bus is created when omitted. `stats` is an
+        optional game.instrumentation.BattleStats that times each phase and
+        counts hits, misses, damage and decision latency; without one the
+        battle runs uninstrumented.
+        """
         if not isinstance(player, Player):
             raise TypeError("First participant must be a Player object.")
-        if not isinstance(opponent_pokemon, Pokemon):
-            raise TypeError("Second participant must be a Pokemon object.")
+        if isinstance(opponent_pokemon, Player):
+            self.opponent_trainer: Player | None = opponent_pokemon
+            opponent_team = list(opponent_pokemon.team)
+            opponent_slot = opponent_pokemon.team.first_alive()
+            if opponent_slot is None:
+                raise ValueError(f"{opponent_pokemon.name} has no Pokemon that can battle.")
+        elif isinstance(opponent_pokemon, Pokemon):
+            self.opponent_trainer = None # Wild battle
+            opponent_team, opponent_slot = [opponent_pokemon], 0
+        else:
+            raise TypeError("Second participant must be a Pokemon or Player object.")
             
         self.player: Player = player
-        self.opponent: Pokemon = opponent_pokemon
+        self.opponent: Pokemon = opponent_team[opponent_slot] # The opponent's active Pokemon
+        self.headless: bool = headless
+        self.output: OutputSink = output or (NullSink() if headless else StdoutSink())
+        self.pacer: Pacer = pacer or (NoPacer() if headless else SleepPacer())
+        if player_move_chooser is None and headless:
+            player_move_chooser = Battle._first_move_chooser
+        self.player_move_chooser = player_move_chooser
+        self.opponent_move_chooser = opponent_move_chooser
+        self.player_switch_chooser = player_switch_chooser
+        self.opponent_switch_chooser = opponent_switch_chooser
+        if seed is None:
+            seed = random.getrandbits(64)
+        self.rng: random.Random = random.Random(seed)
+        self.replay: BattleReplay = BattleReplay(seed)
         
         # Get the player's active Pokemon
-        self.player_active_pokemon: Pokemon | None = self.player.get_active_pokemon()
-        if not self.player_active_pokemon:
+        player_slot = self.player.team.first_alive()
+        if player_slot is None:
             raise ValueError("Player has no active Pokemon to start the battle.")
+        self.player_active_pokemon: Pokemon | None = self.player.team[player_slot]
             
-        self.turn_count: int = 0
-        print(f"\n--- Battle Start: {self.player.name}'s {self.player_active_pokemon.nickname or self.player_active_pokemon.species_name} vs Wild {self.opponent.species_name} ---")
+        # Dynamic battle data lives in an immutable BattleState; HP changes are
+        # written through to the Pokemon objects so the rest of the game sees them.
+        self.combatants: tuple[list[Pokemon], list[Pokemon]] = (list(self.player.team), opponent_team)
+        self.state: BattleState = BattleState.from_teams(*self.combatants, active=(player_slot, opponent_slot))
+        self._history: list[BattleState] = [] # States before each turn, for undo_turn()
+        self.max_turns: int | None = max_turns
+        self.decision_timeouts: list[int] = [0, 0] # Per side, for run_battle_async
+        self._async_mode: bool = False
+        self._pending_pause: float = 0.0
+        self.events: EventBus = events or EventBus()
+        self.stats = stats
+        if stats is not None:
+            stats.attach(self) # Wraps the phase methods on this instance only
+        if self.events.active:
+            self.events.publish(BattleStarted(seed, self.player_active_pokemon.nickname or self.player_active_pokemon.species_name,
+                                              self.opponent.species_name))
+        opponent_label = f"{self.opponent_trainer.name}'s" if self.opponent_trainer else "Wild"
+        self._print(f"\n--- Battle Start: {self.player.name}'s {self.player_active_pokemon.nickname or self.player_active_pokemon.species_name} vs {opponent_label} {self.opponent.species_name} ---")
+
+    def _print(self, text: str = "", end: str = "\n"):
+        """Send a line of battle text to the configured output sink."""
+        self.output.write(text, end)
+
+    def _input(self, prompt: str) -> str:
+        """Read a line from the player, after putting everything printed so far on screen."""
+        self.output.frame(self) # Buffering sinks would otherwise hold back menus and error messages
+        return input(prompt)
+
+    def _pause(self, seconds: float):
+        """Pause for readability (a no-op when running headless)."""
+        self.output.frame(self) # Let screen renderers draw what happened before the pause
+        if self._async_mode:
+            self._pending_pause += seconds # Slept later by the async loop
+        else:
+            self.pacer.pause(seconds)
+
+    @staticmethod
+    def _first_move_chooser(battle: "Battle") -> Move | None:
+        """Non-interactive player choice: always use the first move."""
+        active_poke = battle.player_active_pokemon
+        return active_poke.moves[0] if active_poke and active_poke.moves else None
 
     def _get_turn_order(self) -> tuple[Pokemon, Pokemon]:
         """Determine which Pokémon attacks first based on speed."""
@@ -50,61 +192,90 @@ class Battle:
         elif opponent_poke.speed > player_poke.speed:
             return opponent_poke, player_poke
         else:
-            return (player_poke, opponent_poke) if random.choice([True, False]) else (opponent_poke, player_poke)
+            return (player_poke, opponent_poke) if self.rng.choice([True, False]) else (opponent_poke, player_poke)
 
     def _calculate_damage(self, attacker: Pokemon, defender: Pokemon, move: Move) -> int:
         """Calculate damage for a move (simplified version)."""
-        if move.category == "Status":
+        damage = calculate_base_damage(attacker, defender, move)
+        if damage <= 0:
             return 0 # Status moves don't do direct damage
-        
-        # Basic factors
-        # TODO: Add Special Attack/Defense distinction based on move.category
-        # TODO: Implement type effectiveness
-        # TODO: Add critical hits
-        # TODO: Add STAB (Same-type attack bonus)
-        # TODO: Add random damage variance (e.g., 85% to 100%)
-        
-        # Simplified Formula (based loosely on Gen 1-4 formula parts)
-        level_factor = (2 * attacker.level / 5) + 2
-        # Use Attack/Defense for now regardless of category
-        atk_def_ratio = attacker.attack / defender.defense 
-        damage = ((level_factor * move.power * atk_def_ratio) / 50) + 2
-        
+
         # Apply random variance (85% - 100%)
-        variance = random.uniform(0.85, 1.00)
+        variance = self.rng.uniform(DAMAGE_VARIANCE_MIN, DAMAGE_VARIANCE_MAX)
         final_damage = int(damage * variance)
         
         return max(1, final_damage) # Ensure at least 1 damage is dealt
 
-    def _get_player_move_choice(self) -> Move | None:
-        """Prompt the player to choose a move."""
+    @property
+    def seed(self) -> int:
+        """The seed of this battle's random stream."""
+        return self.replay.seed
+
+    def _get_player_move_choice(self) -> Move | Switch | None:
+        """Prompt the player to choose a move (or a switch)."""
+        if self.player_move_chooser is not None:
+            return self.player_move_chooser(self)
+
         active_poke = self.player_active_pokemon
         if not active_poke or not active_poke.moves:
             return None
 
-        print(f"\nWhat should {active_poke.nickname or active_poke.species_name} do?")
+        self._print(f"\nWhat should {active_poke.nickname or active_poke.species_name} do?")
         for i, move in enumerate(active_poke.moves):
             # TODO: Add current PP / max PP display
-            print(f"  {i + 1}: {move.name}")
-        # TODO: Add options for switching Pokemon, using items, running
+            self._print(f"  {i + 1}: {move.name}")
+        can_switch = self.alive_count(PLAYER) > 1
+        if can_switch:
+            self._print("  s: Switch Pokemon")
+        # TODO: Add options for using items, running
 
         while True:
             try:
-                choice = input("Enter move number: ")
+                choice = self._input("Enter move number: ")
+                if can_switch and choice.strip().lower() == "s":
+                    slot = self._prompt_switch(allow_cancel=True)
+                    if slot is not None:
+                        return Switch(slot)
+                    continue
                 move_index = int(choice) - 1
                 if 0 <= move_index < len(active_poke.moves):
                     # TODO: Check if move has PP left
                     return active_poke.moves[move_index]
                 else:
-                    print(f"Invalid choice. Please enter a number between 1 and {len(active_poke.moves)}.")
+                    self._print(f"Invalid choice. Please enter a number between 1 and {len(active_poke.moves)}.")
             except ValueError:
-                print("Invalid input. Please enter a number.")
+                self._print("Invalid input. Please enter a number.")
             except EOFError: # Handle Ctrl+D or similar EOF
-                 print("\nBattle input cancelled.")
+                 self._print("\nBattle input cancelled.")
                  return None # Indicate cancellation or inability to choose
 
+    def _prompt_switch(self, allow_cancel: bool) -> int | None:
+        """Ask the player which Pokémon to send out; None if they cancel (when allowed)."""
+        team, active = self.combatants[PLAYER], self.state.active[PLAYER]
+        options = [slot for slot in self.player.team.alive_slots() if slot != active]
+        self._print("\nWhich Pokemon should go in?")
+        for slot in options:
+            pokemon = team[slot]
+            self._print(f"  {slot + 1}: {pokemon.nickname or pokemon.species_name} ({pokemon.current_hp}/{pokemon.max_hp} HP)")
+        while True:
+            try:
+                choice = self._input("Enter team number" + (" (blank to go back): " if allow_cancel else ": "))
+                if allow_cancel and not choice.strip():
+                    return None
+                slot = int(choice) - 1
+                if slot in options:
+                    return slot
+                self._print("That Pokemon can't go in.")
+            except ValueError:
+                self._print("Invalid input. Please enter a number.")
+            except EOFError:
+                self._print("\nBattle input cancelled.")
+                return None if allow_cancel else options[0]
+
     def _get_opponent_move_choice(self) -> Move | None:
         """Select a move for the opponent (simple AI)."""
+        if self.opponent_move_chooser is not None:
+            return self.opponent_move_chooser(self)
         if not self.opponent or not self.opponent.moves:
             return None
         # Simple AI: Choose the first available move
@@ -114,130 +285,437 @@ class Battle:
         
     def _execute_turn(self, attacker: Pokemon, defender: Pokemon, move: Move):
         """Executes a single Pokémon's move against another."""
-        print(f"\n{attacker.nickname or attacker.species_name} uses {move.name}!", end="")
-        time.sleep(0.5) # Small pause for readability
+        self._print(f"\n{attacker.nickname or attacker.species_name} uses {move.name}!", end="")
+        publish = self.events.active # Only build events when someone is listening
+        if publish:
+            self.events.publish(MoveUsed(self.turn_count, self._side_of(attacker),
+                                         attacker.nickname or attacker.species_name, move.name))
+        self._pause(0.5) # Small pause for readability
         
         # --- Accuracy Check --- 
         accuracy_threshold = move.accuracy
         # TODO: Add modifiers for accuracy/evasion stats if implemented
-        if accuracy_threshold > 100 or random.randint(1, 100) <= accuracy_threshold:
-            print(f" - It hits!", end="")
+        if accuracy_threshold > 100 or self.rng.randint(1, 100) <= accuracy_threshold:
+            self._print(f" - It hits!", end="")
+            if publish:
+                self.events.publish(MoveHit(self.turn_count, self._side_of(attacker), move.name))
             # --- Damage Calculation --- 
             damage = self._calculate_damage(attacker, defender, move)
+            effectiveness = TYPES.dual_chart[move.type_id][defender.type_key]
             if damage > 0:
-                print(f" - Dealt {damage} damage.")
-                defender.current_hp -= damage
-                defender.current_hp = max(0, defender.current_hp) # Prevent negative HP
-                print(f"{defender.nickname or defender.species_name} HP: {defender.current_hp}/{defender.max_hp}")
+                self._print(f" - Dealt {damage} damage.")
+                if effectiveness > 1:
+                    self._print("It's super effective!")
+                elif effectiveness < 1:
+                    self._print("It's not very effective...")
+                side = self._side_of(defender)
+                self.state = self.state.damage(side, damage) # Clamps at 0 HP
+                defender.current_hp = self.state.active_hp(side) # Write through to the Pokemon
+                if publish:
+                    self.events.publish(DamageDealt(self.turn_count, side, damage, defender.current_hp, effectiveness))
+                self._print(f"{defender.nickname or defender.species_name} HP: {defender.current_hp}/{defender.max_hp}")
+            elif move.category_id != STATUS and effectiveness == 0:
+                self._print(f" - It doesn't affect {defender.nickname or defender.species_name}...")
             else:
-                print(" - But it had no direct effect.") # Status move or 0 power
+                self._print(" - But it had no direct effect.") # Status move or 0 power
                 # TODO: Implement status effects (e.g., Growl lowering Attack)
 
             # TODO: Implement move side effects (status conditions, stat changes)
         else:
-            print(f" - But it missed!")
+            self._print(f" - But it missed!")
+            if publish:
+                self.events.publish(MoveMissed(self.turn_count, self._side_of(attacker), move.name))
             
         # TODO: Deduct PP for the move
 
-    def run_battle(self):
-        """Run the main battle loop until one Pokémon faints."""
-        
+    # --- State management ---
+
+    @property
+    def turn_count(self) -> int:
+        return self.state.turn_count
+
+    def _side_of(self, pokemon: Pokemon) -> int:
+        """Which side (PLAYER or OPPONENT) a battling Pokémon is on."""
+        return PLAYER if pokemon is self.player_active_pokemon else OPPONENT
+
+    def _active(self, side: int) -> Pokemon:
+        return self.player_active_pokemon if side == PLAYER else self.opponent
+
+    def alive_count(self, side: int) -> int:
+        """How many Pokémon `side` can still send out (read from the team's alive mask)."""
+        if side == PLAYER:
+            return self.player.team.alive_count
+        if self.opponent_trainer is not None:
+            return self.opponent_trainer.team.alive_count
+        return 0 if self.opponent.is_fainted() else 1
+
+    def _sync_pokemon(self):
+        """Write the HP stored in the current state back onto every battling Pokémon."""
+        for side, team in enumerate(self.combatants):
+            for slot, pokemon in enumerate(team):
+                pokemon.current_hp = self.state.hp[side][slot]
+        self.player_active_pokemon = self.combatants[PLAYER][self.state.active[PLAYER]]
+        self.opponent = self.combatants[OPPONENT][self.state.active[OPPONENT]]
+
+    def snapshot(self) -> BattleState:
+        """Return the current state. States are immutable, so this is an O(1) clone."""
+        return self.state
+
+    def restore(self, state: BattleState):
+        """Jump to a previously taken snapshot (HP is written back to the Pokémon)."""
+        self.state = state
+        self._sync_pokemon()
+
+    def undo_turn(self) -> BattleState:
+        """Undo the most recent turn and return the restored state.
+
+        Only the battle state and replay log are rolled back; the random
+        stream keeps going, so re-playing the turn can roll differently.
+        """
+        if not self._history:
+            raise IndexError("No turn to undo.")
+        self.restore(self._history.pop())
+        self.replay.truncate(self.turn_count)
+        return self.state
+
+    def _begin_turn(self):
+        """Save the current state for undo and advance the turn counter."""
+        self._history.append(self.state)
+        self.state = self.state.next_turn()
+        if self.events.active:
+            self.events.publish(TurnStarted(self.turn_count, self.state.active_hp(PLAYER), self.state.active_hp(OPPONENT)))
+
+    def _record_choices(self, player_move: Move | Switch, opponent_move: Move | Switch):
+        """Record the choices so the battle can be replayed from its seed."""
+        self.replay.record_turn(self._action_code(self.player_active_pokemon, player_move),
+                                self._action_code(self.opponent, opponent_move))
+
+    @staticmethod
+    def _action_code(pokemon: Pokemon, action: Move | Switch) -> int:
+        if isinstance(action, Switch):
+            return SWITCH_FLAG | action.slot
+        return pokemon.moves.index(action)
+
+    def _check_switch(self, side: int, slot: int):
+        team = self.combatants[side]
+        if not 0 <= slot < len(team) or slot == self.state.active[side] or team[slot].is_fainted():
+            raise ValueError(f"Cannot switch to team slot {slot}.")
+
+    def _switch(self, side: int, slot: int, forced: bool = False):
+        """Send out the Pokémon in team `slot` on `side`."""
+        self._check_switch(side, slot)
+        self.state = self.state.with_active(side, slot)
+        pokemon = self.combatants[side][slot]
+        if side == PLAYER:
+            self.player_active_pokemon = pokemon
+            trainer_name = self.player.name
+        else:
+            self.opponent = pokemon
+            trainer_name = self.opponent_trainer.name
+        name = pokemon.nickname or pokemon.species_name
+        self._print(f"\n{trainer_name} sent out {name}!")
+        if self.events.active:
+            self.events.publish(Switched(self.turn_count, side, name, forced))
+        self._pause(0.5)
+
+    def _choose_replacement(self, side: int, interactive: bool = True) -> int:
+        """Team slot `side` sends in after a faint: its switch chooser, the prompt, or the first usable Pokémon.
+
+        The player is only prompted when `interactive` and no move chooser is set.
+        """
+        chooser = self.player_switch_chooser if side == PLAYER else self.opponent_switch_chooser
+        if chooser is not None:
+            return chooser(self)
+        if side == PLAYER and interactive and self.player_move_chooser is None:
+            return self._prompt_switch(allow_cancel=False) # Interactive battle: let the player pick
+        team = self.player.team if side == PLAYER else self.opponent_trainer.team
+        return team.first_alive()
+
+    def _needs_replacement(self, side: int) -> bool:
+        return self.state.is_fainted(side) and self.alive_count(side) > 0
+
+    def _send_replacement(self, side: int, slot: int):
+        self._switch(side, slot, forced=True)
+        self.replay.record_replacement(self.turn_count, side, slot)
+
+    def _replace_fainted(self, interactive: bool = True):
+        """Send in a replacement for each fainted active Pokémon whose side has any left."""
+        for side in (PLAYER, OPPONENT):
+            if self._needs_replacement(side):
+                self._send_replacement(side, self._choose_replacement(side, interactive))
+
+    def _resolve_turn(self, first: Pokemon, second: Pokemon, move1: Move | Switch, move2: Move | Switch) -> bool:
+        """Execute both actions (switches before moves); return True if a Pokémon fainted."""
+        first_side = self._side_of(first)
+        actions = ((first_side, move1), (1 - first_side, move2))
+        for side, action in actions:
+            if isinstance(action, Switch):
+                self._switch(side, action.slot)
+
+        self._print("-"*20) # Separator
+        acted = False
+        for side, action in actions:
+            if isinstance(action, Switch):
+                continue
+            if acted:
+                self._print("-"*20) # Separator
+                self._pause(0.5)
+            attacker, defender = self._active(side), self._active(1 - side)
+            self._execute_turn(attacker, defender, action)
+            acted = True
+            if defender.is_fainted(): # A fainted Pokémon doesn't get to move
+                self._announce_faint(defender)
+                return True
+        return False
+
+    def _announce_faint(self, pokemon: Pokemon):
+        self._print(f"\n{pokemon.nickname or pokemon.species_name} fainted!")
+        if self.events.active:
+            self.events.publish(Fainted(self.turn_count, self._side_of(pokemon), pokemon.nickname or pokemon.species_name))
+
+    def apply_turn(self, player_move: Move | Switch, opponent_move: Move | Switch) -> BattleState:
+        """Play one full turn with the given actions (no prompts) and return the new state.
+
+        The previous state is kept so the turn can be rolled back with undo_turn().
+        """
+        if self.is_over:
+            raise ValueError("The battle is already over.")
+        for side, action in ((PLAYER, player_move), (OPPONENT, opponent_move)):
+            if isinstance(action, Switch):
+                self._check_switch(side, action.slot) # Reject before the turn starts
+        self._begin_turn()
+        first, second = self._get_turn_order()
+        if first is self.player_active_pokemon:
+            fainted = self._finish_turn(first, second, player_move, opponent_move, replace=False)
+        else:
+            fainted = self._finish_turn(first, second, opponent_move, player_move, replace=False)
+        if fainted:
+            self._replace_fainted(interactive=False) # Switch choosers or the first usable Pokémon, never input()
+        if self.is_over and self.events.active:
+            self.events.publish(BattleEnded(self.turn_count, PLAYER if self.alive_count(OPPONENT) == 0 else OPPONENT))
+        return self.state
+
+    @property
+    def is_over(self) -> bool:
+        """A side loses once it has no Pokémon left that can battle."""
+        return self.alive_count(PLAYER) == 0 or self.alive_count(OPPONENT) == 0
+
+    def _prepare_battle(self) -> bool:
+        """Pre-battle checks shared by the sync and async loops; False if the battle cannot run."""
         # Ensure player has an active Pokemon (checked in init, but double check)
         if not self.player_active_pokemon:
-            print("ERROR: Player has no active Pokemon to battle with.")
-            return None
+            self._print("ERROR: Player has no active Pokemon to battle with.")
+            return False
             
         # --- TEMP: Assign default moves if opponent has none --- 
-        if not self.opponent.moves:
-             try:
-                 self.opponent.moves = [Move(name="Tackle", type="Normal", category="Physical", power=40, accuracy=100, pp=35)]
-             except NameError:
-                 print("WARN: Could not create default Move for Opponent")
+        for pokemon in self.combatants[OPPONENT]:
+            if not pokemon.moves:
+                 try:
+                     pokemon.moves = [Move(name="Tackle", type="Normal", category="Physical", power=40, accuracy=100, pp=35)]
+                 except NameError:
+                     self._print("WARN: Could not create default Move for Opponent")
         # --- END TEMP HACK --- 
+        return True
+
+    def _should_continue(self) -> bool:
+        if self.is_over:
+            return False
+        if self.max_turns is not None and self.turn_count >= self.max_turns:
+            return False # Neither side could finish the other off in time
+        return True
+
+    def _start_turn(self) -> tuple[Pokemon, Pokemon]:
+        """Advance the turn, show HP and return (first, second) in move order."""
+        self._begin_turn()
+        self._print(f"\n--- Turn {self.turn_count} ---")
+        # Make sure we use the potentially updated active pokemon
+        current_player_poke = self.player_active_pokemon
+        if not self.output.draws_status:
+            self._print(f"{current_player_poke.nickname or current_player_poke.species_name}: {current_player_poke.current_hp}/{current_player_poke.max_hp} HP")
+            self._print(f"{self.opponent.species_name}: {self.opponent.current_hp}/{self.opponent.max_hp} HP")
+        self._pause(1)
+
+        # Determine turn order
+        # Note: _get_turn_order compares self.player_active_pokemon and self.opponent
+        first, second = self._get_turn_order()
+        self._print(f"{first.nickname or first.species_name} goes first this turn.")
+        self._pause(0.5)
+        return first, second
+
+    def _get_move_choice(self, pokemon: Pokemon) -> Move | Switch | None:
+        """Ask whichever side `pokemon` belongs to for its move."""
+        if pokemon is self.player_active_pokemon:
+            return self._get_player_move_choice()
+        return self._get_opponent_move_choice()
+
+    def _finish_turn(self, first: Pokemon, second: Pokemon, move1: Move | Switch, move2: Move | Switch,
+                     replace: bool = True) -> bool:
+        """Record and execute the chosen actions, then replace any fainted Pokémon.
+
+        With `replace=False` replacing is left to the caller (the async loop
+        asks its providers). Returns True if a Pokémon fainted.
+        """
+        first_side = self._side_of(first)
+        for side, action in ((first_side, move1), (1 - first_side, move2)):
+            if isinstance(action, Switch):
+                self._check_switch(side, action.slot) # Before anything is recorded
+        if first_side == PLAYER:
+            self._record_choices(move1, move2)
+        else:
+            self._record_choices(move2, move1)
+        fainted = self._resolve_turn(first, second, move1, move2)
+        if fainted and replace:
+            self._replace_fainted()
+        return fainted
+
+    def _end_battle(self):
+        """Announce the result and return the winning Pokémon (None for no winner)."""
+        self._print(f"\n--- Battle End --- Turn {self.turn_count}")
+        if self.alive_count(PLAYER) == 0:
+            trainer = f"{self.opponent_trainer.name}'s " if self.opponent_trainer else ""
+            self._print(f"{trainer}{self.opponent.species_name} wins!")
+            winner, winning_side = self.opponent, OPPONENT
+        elif self.alive_count(OPPONENT) == 0:
+            self._print(f"{self.player.name}'s {self.player_active_pokemon.nickname or self.player_active_pokemon.species_name} wins!")
+            winner, winning_side = self.player_active_pokemon, PLAYER
+        else:
+            self._print("Battle ended unexpectedly (maybe a draw?).")
+            winner, winning_side = None, None
+        if self.events.active:
+            self.events.publish(BattleEnded(self.turn_count, winning_side))
+        self.output.frame(self)
+        return winner # The winning Pokemon, or None
+
+    def run_battle(self):
+        """Run the main battle loop until one Pokémon faints."""
+        if not self._prepare_battle():
+            return None
         
-        while not self.player_active_pokemon.is_fainted() and not self.opponent.is_fainted():
-            self.turn_count += 1
-            print(f"\n--- Turn {self.turn_count} ---")
-            # Make sure we use the potentially updated active pokemon
-            # TODO: Handle switching - for now, always use the initial one
-            current_player_poke = self.player_active_pokemon 
-            print(f"{current_player_poke.nickname or current_player_poke.species_name}: {current_player_poke.current_hp}/{current_player_poke.max_hp} HP")
-            print(f"{self.opponent.species_name}: {self.opponent.current_hp}/{self.opponent.max_hp} HP")
-            time.sleep(1)
-
-            # Determine turn order
-            # Note: _get_turn_order compares self.player_active_pokemon and self.opponent
-            first, second = self._get_turn_order()
-            print(f"{first.nickname or first.species_name} goes first this turn.")
-            time.sleep(0.5)
+        while self._should_continue():
+            first, second = self._start_turn()
             
             # --- Select Moves --- 
-            move1 = None
-            if first == current_player_poke:
-                move1 = self._get_player_move_choice()
-            else:
-                move1 = self._get_opponent_move_choice()
-            
-            move2 = None
-            if second == current_player_poke:
-                move2 = self._get_player_move_choice()
-            else:
-                move2 = self._get_opponent_move_choice()
+            move1 = self._get_move_choice(first)
+            move2 = self._get_move_choice(second)
                 
             # Handle potential cancellation from player input
             if move1 is None or move2 is None:
-                print("Move selection failed or was cancelled. Ending battle.")
+                self._print("Move selection failed or was cancelled. Ending battle.")
+                self.output.frame(self)
                 return None
 
             # --- Execute Turns --- 
-            print("-"*20) # Separator
-            # Execute first Pokémon's turn
-            if not first.is_fainted(): # Check faint status before turn
-                self._execute_turn(first, second, move1)
-                if second.is_fainted():
-                    print(f"\n{second.nickname or second.species_name} fainted!")
-                    break 
-            
-            print("-"*20) # Separator
-            time.sleep(0.5)
-            
-            # Execute second Pokémon's turn
-            if not second.is_fainted(): # Check faint status before turn
-                self._execute_turn(second, first, move2)
-                if first.is_fainted(): 
-                    print(f"\n{first.nickname or first.species_name} fainted!")
-                    break 
+            self._finish_turn(first, second, move1, move2)
+            if self.is_over:
+                break
                  
-            time.sleep(1)
-
-        # --- Battle End --- 
-        print(f"\n--- Battle End --- Turn {self.turn_count}")
-        if self.player_active_pokemon.is_fainted():
-            print(f"{self.opponent.species_name} wins!")
-            return self.opponent # Return the winner
-        elif self.opponent.is_fainted():
-            print(f"{self.player.name}'s {self.player_active_pokemon.nickname or self.player_active_pokemon.species_name} wins!")
-            return self.player_active_pokemon # Return the winner
-        else:
-            print("Battle ended unexpectedly (maybe a draw?).")
+            self._pause(1)
+
+        return self._end_battle()
+
+    # --- Async battle loop ---
+
+    async def _get_move_choice_async(self, pokemon: Pokemon, provider, timeout: float | None) -> Move | Switch | None:
+        """Await a move from `provider`, falling back to the side's default choice on timeout."""
+        if provider is None:
+            return self._get_move_choice(pokemon)
+        try:
+            return await asyncio.wait_for(provider(self), timeout)
+        except asyncio.TimeoutError:
+            side = self._side_of(pokemon)
+            self.decision_timeouts[side] += 1
+            self._print(f"{pokemon.nickname or pokemon.species_name} took too long to decide!")
+            if side == PLAYER:
+                return Battle._first_move_chooser(self)
+            return self._get_opponent_move_choice()
+
+    async def _choose_replacement_async(self, side: int, provider, timeout: float | None) -> int:
+        """Ask `provider` for the slot to send in after a faint.
+
+        Providers without a choose_replacement() method (plain async callables)
+        and ones that return None, an unusable slot or time out get the first
+        usable Pokémon. Sides without a provider choose like run_battle does.
+        A switch chooser set on the battle always takes precedence.
+        """
+        has_chooser = (self.player_switch_chooser if side == PLAYER else self.opponent_switch_chooser) is not None
+        if provider is None or has_chooser:
+            return self._choose_replacement(side)
+        choose = getattr(provider, "choose_replacement", None)
+        if choose is not None:
+            try:
+                slot = await asyncio.wait_for(choose(self), timeout)
+            except asyncio.TimeoutError:
+                self.decision_timeouts[side] += 1
+                slot = None
+            team = self.combatants[side]
+            if isinstance(slot, int) and 0 <= slot < len(team) and not team[slot].is_fainted():
+                return slot
+        return self._choose_replacement(side, interactive=False)
+
+    async def _flush_pauses(self):
+        """Sleep off the pauses collected since the last await, without blocking the event loop."""
+        seconds, self._pending_pause = self._pending_pause, 0.0
+        if seconds > 0:
+            await self.pacer.pause_async(seconds)
+
+    async def run_battle_async(self, player_provider=None, opponent_provider=None,
+                               decision_timeout: float | None = None):
+        """Async version of run_battle driven by awaitable decision providers.
+
+        A provider is any async callable `provider(battle) -> Move | None`
+        (see game.async_battle); providers with a choose_replacement() method
+        also pick the team slot sent in after a faint (others get the first
+        usable Pokémon). Sides without a provider use the same choosers as
+        run_battle. Both sides' decisions are awaited concurrently, and a
+        provider that takes longer than `decision_timeout` seconds is
+        cancelled and that side falls back to its default move. Pauses never block the event loop, so many battles
+        can share one loop.
+        """
+        if not self._prepare_battle():
             return None
+        self._async_mode = True
+        try:
+            while self._should_continue():
+                first, second = self._start_turn()
+                await self._flush_pauses()
+                provider1, provider2 = ((player_provider, opponent_provider) if first is self.player_active_pokemon
+                                        else (opponent_provider, player_provider))
+                # Both sides decide at once, so a turn waits for the slower agent rather than both
+                move1, move2 = await asyncio.gather(self._get_move_choice_async(first, provider1, decision_timeout),
+                                                    self._get_move_choice_async(second, provider2, decision_timeout))
+                if move1 is None or move2 is None:
+                    self._print("Move selection failed or was cancelled. Ending battle.")
+                    self.output.frame(self)
+                    return None
+                if self._finish_turn(first, second, move1, move2, replace=False):
+                    await self._flush_pauses()
+                    for side, provider in ((PLAYER, player_provider), (OPPONENT, opponent_provider)):
+                        if self._needs_replacement(side):
+                            self._send_replacement(side, await self._choose_replacement_async(side, provider, decision_timeout))
+                if self.is_over:
+                    break
+                self._pause(1)
+                await self._flush_pauses()
+            return self._end_battle()
+        finally:
+            self._async_mode = False
+            self._pending_pause = 0.0
 
 # Example Usage (if running this file directly)
 if __name__ == "__main__":
+    from game.dex import get_default_dex
     print("Setting up example battle...")
     # Need dummy Pokemon and Moves if classes weren't imported
     # This will likely fail if Pokemon/Move are not properly defined/imported
     try:
         # Create player
         player = Player("Tester")
-        # Create pokemon and add to team
-        pika = Pokemon(species_name="Pikachu", types=["Electric"], level=50, max_hp=150, attack=55, defense=40, speed=90)
-        pika.moves = [Move(name="Thunder Shock", type="Electric", category="Special", power=40, accuracy=100, pp=30),
-                      Move(name="Growl", type="Normal", category="Status", power=0, accuracy=100, pp=40)]
+        # Create pokemon from the dex and add to team
+        dex = get_default_dex()
+        pika = dex.create_pokemon("Pikachu", level=50)
         player.add_pokemon(pika)
         
-        rattata = Pokemon(species_name="Rattata", types=["Normal"], level=48, max_hp=120, attack=56, defense=35, speed=72)
-        rattata.moves = [Move(name="Quick Attack", type="Normal", category="Physical", power=40, accuracy=100, pp=30)]
+        rattata = dex.create_pokemon("Rattata", level=48)
         
         # Create and run the battle
         battle = Battle(player, rattata)
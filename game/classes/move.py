@@ -1,8 +1,20 @@
 #implement the move class
+import sys
+from game.types import TYPES
+
+# Move categories, interned to small integers for the damage pipeline
+PHYSICAL = 0
+SPECIAL = 1
+STATUS = 2
+CATEGORY_IDS = {"Physical": PHYSICAL, "Special": SPECIAL, "Status": STATUS}
+
 class Move:
     """Represents a move a Pokemon can use."""
+
+    __slots__ = ("name", "_type", "type_id", "_category", "category_id", "power", "accuracy", "pp")
+
     def __init__(self, name: str, type: str, category: str, power: int, accuracy: int, pp: int):
-        self.name: str = name
+        self.name: str = sys.intern(name)
         self.type: str = type        # e.g., "Normal", "Fire", "Water"
         self.category: str = category  # e.g., "Physical", "Special", "Status"
         self.power: int = power      # Base power (0 for Status moves)
@@ -10,10 +22,54 @@ class Move:
         self.pp: int = pp          # Maximum Power Points (uses)
         # Note: Current PP needs to be tracked separately, perhaps when assigned to a Pokemon
 
+    # `type` and `category` keep their integer ids (type_id / category_id) in sync,
+    # so the battle engine never has to compare strings.
+    @property
+    def type(self) -> str:
+        return self._type
+
+    @type.setter
+    def type(self, value: str):
+        self._type = sys.intern(value)
+        self.type_id: int = TYPES.type_id(value)
+
+    @property
+    def category(self) -> str:
+        return self._category
+
+    @category.setter
+    def category(self, value: str):
+        if value not in CATEGORY_IDS:
+            raise ValueError(f"Unknown move category '{value}'. Expected one of {list(CATEGORY_IDS)}.")
+        self._category = sys.intern(value)
+        self.category_id: int = CATEGORY_IDS[value]
+
     def __str__(self) -> str:
         """Return a user-friendly string representation."""
         return f"{self.name} ({self.type}) Cat:{self.category} Pow:{self.power} Acc:{self.accuracy} PP:{self.pp}"
 
+class SharedMove(Move):
+    """A Move shared between many Pokémon (dex and save flyweights); read-only once built.
+
+    Changing a shared move would change it for every Pokémon holding it, so
+    any per-Pokémon state (such as PP left) has to live outside the Move.
+    """
+
+    __slots__ = ("_frozen",)
+
+    def __init__(self, name: str, type: str, category: str, power: int, accuracy: int, pp: int):
+        super().__init__(name, type, category, power, accuracy, pp)
+        self._frozen: bool = True
+
+    def __setattr__(self, name: str, value):
+        if getattr(self, "_frozen", False):
+            raise AttributeError(f"{self.name} is shared between Pokémon and cannot be changed.")
+        super().__setattr__(name, value)
+
+    def __reduce__(self):
+        # Rebuild through __init__ so copies and pickles come back frozen too
+        return SharedMove, (self.name, self.type, self.category, self.power, self.accuracy, self.pp)
+
 # Example Usage (for testing, can be removed later)
 if __name__ == "__main__":
     tackle = Move(name="Tackle", type="Normal", category="Physical", power=40, accuracy=100, pp=35)
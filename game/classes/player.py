@@ -6,12 +6,86 @@ except ImportError:
     print("Player Class: Could not import Pokemon class.")
     class Pokemon: pass # Dummy class
 
+class Team(list):
+    """A list of Pokemon that keeps a bitmask of its members that can still battle.
+
+    Bit i of `alive_mask` is set while team[i] has HP left. Members report
+    fainting and reviving themselves (through Pokemon.owner), so finding the
+    first usable Pokémon or counting the ones left never rescans the team.
+    Changing the list itself (append, del, ...) rebuilds the mask.
+    """
+
+    def __init__(self, members=()):
+        super().__init__(members)
+        self.alive_mask: int = 0
+        # id(pokemon) -> its positions; not `uid`, which copies of a Pokemon share
+        self._slots: dict[int, list[int]] = {}
+        self._reindex()
+
+    def _reindex(self):
+        self._slots = {}
+        mask = 0
+        for slot, pokemon in enumerate(self):
+            pokemon.owner = self
+            self._slots.setdefault(id(pokemon), []).append(slot)
+            if not pokemon.is_fainted():
+                mask |= 1 << slot
+        self.alive_mask = mask
+
+    def _alive_changed(self, pokemon: Pokemon, alive: bool):
+        for slot in self._slots.get(id(pokemon), ()):
+            if self[slot] is not pokemon:
+                return # No longer a member of this team
+            if alive:
+                self.alive_mask |= 1 << slot
+            else:
+                self.alive_mask &= ~(1 << slot)
+
+    @property
+    def alive_count(self) -> int:
+        return self.alive_mask.bit_count()
+
+    def is_alive(self, slot: int) -> bool:
+        return bool(self.alive_mask >> slot & 1)
+
+    def first_alive(self) -> int | None:
+        """Slot of the first member that can battle, or None."""
+        mask = self.alive_mask
+        return (mask & -mask).bit_length() - 1 if mask else None
+
+    def alive_slots(self) -> list[int]:
+        return [slot for slot in range(self.alive_mask.bit_length()) if self.alive_mask >> slot & 1]
+
+    # Structural changes are rare (catching, depositing), so they just rebuild the index
+    def _changed(method):
+        def wrapper(self, *args):
+            result = method(self, *args)
+            self._reindex()
+            return result
+        wrapper.__name__ = method.__name__
+        return wrapper
+
+    append = _changed(list.append)
+    extend = _changed(list.extend)
+    insert = _changed(list.insert)
+    remove = _changed(list.remove)
+    pop = _changed(list.pop)
+    clear = _changed(list.clear)
+    sort = _changed(list.sort)
+    reverse = _changed(list.reverse)
+    __setitem__ = _changed(list.__setitem__)
+    __delitem__ = _changed(list.__delitem__)
+    __iadd__ = _changed(list.__iadd__)
+    del _changed
+
+
 class Player:
     """Represents the human player."""
     
     def __init__(self, name: str):
         self.name: str = name
-        self.team: List[Pokemon] = [] # List of Pokemon objects
+        self.team: Team = Team() # List of Pokemon objects
+        self.pc = None # Optional game.storage.PCStorage; receives new Pokemon when the team is full
         # TODO: Add inventory, money, badges etc. later
 
     def add_pokemon(self, pokemon: Pokemon):
@@ -23,16 +97,27 @@ class Player:
                 print(f"{pokemon.nickname or pokemon.species_name} added to {self.name}'s team.")
             else:
                 print("Error: Only Pokemon objects can be added to the team.")
+        elif self.pc is not None:
+            self.pc.deposit(pokemon)
+            print(f"{self.name}'s team is full. {pokemon.nickname or pokemon.species_name} was sent to the PC.")
         else:
             print(f"{self.name}'s team is full! Cannot add {pokemon.nickname or pokemon.species_name}.")
-            # TODO: Implement sending to a PC/storage system
+
+    @property
+    def team(self) -> Team:
+        return self._team
+
+    @team.setter
+    def team(self, members: List[Pokemon]):
+        self._team = members if isinstance(members, Team) else Team(members)
 
     def get_active_pokemon(self) -> Pokemon | None:
         """Returns the first non-fainted Pokemon from the team."""
-        for pokemon in self.team:
-            if not pokemon.is_fainted():
-                return pokemon
-        return None # No usable Pokemon left
+        slot = self._team.first_alive()
+        return self._team[slot] if slot is not None else None # None: no usable Pokemon left
+
+    def has_usable_pokemon(self) -> bool:
+        return self._team.alive_mask != 0
 
     def __str__(self) -> str:
         team_str = ", ".join([(p.nickname or p.species_name) for p in self.team]) or "No Pokemon"
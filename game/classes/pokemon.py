@@ -1,45 +1,125 @@
+import itertools
+import sys
 import uuid
 import random
+from game.types import TYPES
+from game.events import EventBus, XpGained, LevelledUp
+from game.experience import ExperienceCurve, MAX_LEVEL, flat_curve
+
+# Cheap per-process instance ids; a UUID is only generated if someone asks for one
+_next_uid = itertools.count(1).__next__
 
 class Pokemon:
     """Represents a Pokémon in the game."""
     XP_PER_LEVEL = 100 # XP needed to gain a level (can be adjusted later)
 
+    # Fixed attribute layout: no per-instance __dict__, which keeps large rosters small
+    __slots__ = ("uid", "_uuid", "species_id", "species_name", "nickname", "_types", "type_key", "level", "xp",
+                 "max_hp", "_current_hp", "attack", "defense", "speed", "moves", "status", "_xp_per_level",
+                 "curve", "owner")
+
     def __init__(self, species_name: str, types: list[str], level: int, max_hp: int, attack: int, defense: int, speed: int):
-        self.id: uuid.UUID = uuid.uuid4() # Unique ID for this specific instance
-        self.species_name: str = species_name
+        self.uid: int = _next_uid() # Unique (per process) ID for this specific instance
+        self._uuid: uuid.UUID | None = None # Created lazily by the `id` property
+        self.species_id: int | None = None # Dex entry this Pokemon was created from, if any
+        self.species_name: str = sys.intern(species_name)
         self.nickname: str | None = None # Can be set later
         self.types: list[str] = types # e.g., ['Fire'], ['Water', 'Flying']
         self.level: int = level
-        # Store initial stats potentially as base stats for recalculation
-        self._base_max_hp: int = max_hp
-        self._base_attack: int = attack
-        self._base_defense: int = defense
-        self._base_speed: int = speed
+        self._xp_per_level: int | None = None # Per-instance override of XP_PER_LEVEL
+        self.curve: ExperienceCurve | None = None # Growth curve; None means a flat XP_PER_LEVEL per level
+        self.owner = None # game.classes.player.Team this Pokemon is in; told when it faints or revives
 
         self.xp: int = 0
         self.max_hp: int = max_hp
-        self.current_hp: int = max_hp # Start with full health
+        self._current_hp: int = max_hp # Start with full health
         self.attack: int = attack
         self.defense: int = defense
         self.speed: int = speed
         self.moves: list = [] # Will hold Move objects later (type hint needs Move class)
         self.status: str | None = None # e.g., 'Poisoned', 'Paralyzed' (optional for later)
 
+    @property
+    def id(self) -> uuid.UUID:
+        """Globally unique ID, generated on first access (use `uid` for cheap in-process identity)."""
+        if self._uuid is None:
+            self._uuid = uuid.uuid4()
+        return self._uuid
+
+    @id.setter
+    def id(self, value: uuid.UUID):
+        self._uuid = value # e.g. when restoring a saved Pokemon
+
+    def __getstate__(self):
+        # Pin the UUID before copying/pickling so every copy reports the same `id`
+        self.id
+        state = {name: getattr(self, name) for name in self.__slots__}
+        state["owner"] = None # A copy is not a member of the original's team
+        return None, state
+
+    @property
+    def current_hp(self) -> int:
+        return self._current_hp
+
+    @current_hp.setter
+    def current_hp(self, value: int):
+        was_alive = self._current_hp > 0
+        self._current_hp = value
+        if self.owner is not None and was_alive != (value > 0):
+            self.owner._alive_changed(self, value > 0) # Only on faint/revive, not every HP change
+
+    @property
+    def xp_per_level(self) -> int:
+        """XP needed to gain a level: this Pokémon's override, or the class-wide XP_PER_LEVEL."""
+        return self._xp_per_level if self._xp_per_level is not None else self.XP_PER_LEVEL
+
+    @xp_per_level.setter
+    def xp_per_level(self, value: int | None):
+        self._xp_per_level = value # None goes back to following XP_PER_LEVEL
+
+    @property
+    def experience_curve(self) -> ExperienceCurve:
+        """The curve used for level ups (`curve`, or a flat XP_PER_LEVEL curve)."""
+        return self.curve if self.curve is not None else flat_curve(self.xp_per_level)
+
+    @property
+    def types(self) -> list[str]:
+        return self._types
+
+    @types.setter
+    def types(self, value: list[str]):
+        # Keep the packed type key (used for effectiveness/STAB lookups) in sync
+        self.type_key: int = TYPES.defender_key(value)
+        self._types = [sys.intern(name) for name in value]
+
     def __str__(self) -> str:
         display_name = self.nickname if self.nickname else self.species_name
         return f"{display_name} (Lv.{self.level} Type: {', '.join(self.types)}, HP: {self.current_hp}/{self.max_hp})"
 
     def is_fainted(self) -> bool:
         """Check if the Pokémon has fainted."""
-        return self.current_hp <= 0
+        return self._current_hp <= 0
     
-    def _recalculate_stats(self):
-        """Recalculates stats upon level up. Simple placeholder version."""
-        # Placeholder: Increase stats by a small fixed amount + tiny random bonus
+    def _recalculate_stats(self, rng: random.Random | None = None):
+        """Recalculates stats upon level up. Simple placeholder version.
+
+        `rng` is the random stream to draw from (the global `random` module if omitted).
+        """
         print(f"{self.nickname or self.species_name}'s stats are increasing! (Level {self.level})")
-        hp_increase = random.randint(1, 2) + 2 # e.g., +3 or +4 HP
-        stat_increase = random.randint(0, 1) + 1 # e.g., +1 or +2 for others
+        self._apply_growth(1, rng)
+        print(f"New Stats -> MaxHP: {self.max_hp}, Atk: {self.attack}, Def: {self.defense}, Spd: {self.speed}")
+
+    def _apply_growth(self, levels: int, rng: random.Random | None = None):
+        """Apply the stat growth for `levels` level ups at once."""
+        rng = rng or random
+        if levels == 1:
+            # Placeholder: Increase stats by a small fixed amount + tiny random bonus
+            hp_increase = rng.randint(1, 2) + 2 # e.g., +3 or +4 HP
+            stat_increase = rng.randint(0, 1) + 1 # e.g., +1 or +2 for others
+        else:
+            # Same distribution as `levels` single steps: each coin flip is one random bit
+            hp_increase = 3 * levels + rng.getrandbits(levels).bit_count()
+            stat_increase = levels + rng.getrandbits(levels).bit_count()
         self.max_hp += hp_increase
         self.attack += stat_increase
         self.defense += stat_increase
@@ -49,40 +129,61 @@ class Pokemon:
         # Ensure current_hp doesn't exceed new max_hp (e.g., if healed by item before level up)
         if self.current_hp > self.max_hp:
              self.current_hp = self.max_hp
-        print(f"New Stats -> MaxHP: {self.max_hp}, Atk: {self.attack}, Def: {self.defense}, Spd: {self.speed}")
 
-    def level_up(self):
+    def level_up(self, rng: random.Random | None = None, events: EventBus | None = None):
         """Handles the process of leveling up."""
         self.level += 1
         print(f"\n*** {self.nickname or self.species_name} grew to Level {self.level}! ***")
-        self._recalculate_stats() # Recalculate and increase stats
+        if events is not None and events.active:
+            events.publish(LevelledUp(self.nickname or self.species_name, self.level))
+        self._recalculate_stats(rng) # Recalculate and increase stats
         # Fully heal is common, but let's just heal the HP gained for now
         # self.current_hp = self.max_hp
         # self.status = None # Clear status conditions
         print(f"{self.nickname or self.species_name} feels stronger!")
         # We can add move learning logic here later
 
-    def gain_xp(self, amount: int):
-        """Gains XP and checks for level up."""
-        if self.is_fainted() or self.level >= 100: # Fainted or max level Pokemon shouldn't gain XP
-            return
+    def xp_to_next_level(self) -> int:
+        """XP still needed to reach the next level (0 at max level)."""
+        return max(0, self.experience_curve.xp_to_next(self.level) - self.xp)
+
+    def gain_xp(self, amount: int, rng: random.Random | None = None, events: EventBus | None = None,
+                verbose: bool = True) -> int:
+        """Gains XP and applies any level ups; returns the number of levels gained.
+
+        The new level is looked up on the Pokémon's experience curve and the
+        stat growth for all levels gained is applied in one step. Pass a seeded
+        `rng` (e.g. a Battle's `rng`) to make stat gains reproducible, an
+        EventBus (e.g. a Battle's `events`) to publish XP and level-up events,
+        and `verbose=False` to skip the printed messages.
+        """
+        if self.is_fainted() or self.level >= MAX_LEVEL: # Fainted or max level Pokemon shouldn't gain XP
+            return 0
         if amount <= 0:
-            return
-
-        print(f"{self.nickname or self.species_name} gained {amount} XP.")
-        self.xp += amount
-        xp_needed = self.XP_PER_LEVEL # In future, this could depend on level
-
-        # Check for level up (potentially multiple times)
-        while self.xp >= xp_needed and self.level < 100:
-            level_up_xp = xp_needed
-            self.xp -= level_up_xp
-            self.level_up()
-            # Update xp_needed for the *next* potential level up in the same gain_xp call
-            xp_needed = self.XP_PER_LEVEL # Stays constant for now
-
-        if self.level < 100:
-             print(f"Current XP: {self.xp}/{xp_needed}")
-        else:
-             print(f"{self.nickname or self.species_name} reached Max Level!")
-             self.xp = 0 # Reset XP at max level
\ No newline at end of file
+            return 0
+
+        name = self.nickname or self.species_name
+        if verbose:
+            print(f"{name} gained {amount} XP.")
+        publish = events is not None and events.active
+        if publish:
+            events.publish(XpGained(name, amount))
+
+        old_level = self.level
+        self.level, self.xp = self.experience_curve.advance(self.level, self.xp, amount)
+        levels = self.level - old_level
+        if levels:
+            self._apply_growth(levels, rng)
+            if publish:
+                for level in range(old_level + 1, self.level + 1):
+                    events.publish(LevelledUp(name, level))
+            if verbose:
+                print(f"\n*** {name} grew to Level {self.level}! ***")
+                print(f"New Stats -> MaxHP: {self.max_hp}, Atk: {self.attack}, Def: {self.defense}, Spd: {self.speed}")
+
+        if verbose:
+            if self.level < MAX_LEVEL:
+                print(f"Current XP: {self.xp}/{self.experience_curve.xp_to_next(self.level)}")
+            else:
+                print(f"{name} reached Max Level!")
+        return levels
@@ -0,0 +1,187 @@
+# game/damage_calc.py
+
+"""Exact damage distributions and KO probabilities.
+
+Battle._calculate_damage draws its variance uniformly from
+[DAMAGE_VARIANCE_MIN, DAMAGE_VARIANCE_MAX] and truncates `base * variance`
+to an int, so the chance of each damage value is just the width of the
+variance interval that truncates to it. Combined with the accuracy roll
+(and an optional critical-hit chance, for when the engine gains crits),
+that gives the full distribution of one use of a move without sampling.
+N-hit KO chances follow by convolving that distribution with itself.
+
+Results are memoised in bounded LRU caches keyed only by the numbers that
+affect them (levels, stats, type keys, move fields), so repeated queries
+for the same matchup are dictionary lookups.
+"""
+
+from dataclasses import dataclass
+from functools import lru_cache
+import math
+
+from game.battle import calculate_base_damage, DAMAGE_VARIANCE_MIN, DAMAGE_VARIANCE_MAX
+from game.classes.move import Move
+from game.classes.pokemon import Pokemon
+
+CRIT_MULTIPLIER = 1.5
+
+
+@dataclass(frozen=True)
+class DamageDistribution:
+    """Probability of each damage value for one use of a move (misses count as 0)."""
+    outcomes: tuple[tuple[int, float], ...] # (damage, probability), sorted by damage
+    hit_chance: float
+
+    @property
+    def mean(self) -> float:
+        return sum(damage * chance for damage, chance in self.outcomes)
+
+    @property
+    def min_damage(self) -> int:
+        """Smallest damage on a hit."""
+        return min((damage for damage, _ in self.outcomes if damage > 0), default=0)
+
+    @property
+    def max_damage(self) -> int:
+        return self.outcomes[-1][0] if self.outcomes else 0
+
+    def chance_at_least(self, amount: int) -> float:
+        return sum(chance for damage, chance in self.outcomes if damage >= amount)
+
+
+def _variance_outcomes(base: float) -> dict[int, float]:
+    """Exact distribution of max(1, int(base * v)) for v uniform over the variance band."""
+    low, high = DAMAGE_VARIANCE_MIN, DAMAGE_VARIANCE_MAX
+    width = high - low
+    outcomes: dict[int, float] = {}
+    first, last = math.floor(base * low), math.floor(base * high)
+    for raw in range(first, last + 1):
+        # v values with raw <= base * v < raw + 1, clipped to the band
+        start, end = max(low, raw / base), min(high, (raw + 1) / base)
+        if end > start:
+            damage = max(1, raw)
+            outcomes[damage] = outcomes.get(damage, 0.0) + (end - start) / width
+    return outcomes
+
+
+class DamageCalculator:
+    """Memoising calculator; `cache_size` bounds each of its LRU caches."""
+
+    def __init__(self, cache_size: int = 4096, crit_chance: float = 0.0, crit_multiplier: float = CRIT_MULTIPLIER):
+        self.crit_chance: float = crit_chance
+        self.crit_multiplier: float = crit_multiplier
+        self._distribution_for_key = lru_cache(maxsize=cache_size)(self._compute_distribution)
+        self._ko_for_key = lru_cache(maxsize=cache_size)(self._compute_ko)
+
+    @staticmethod
+    def key(attacker: Pokemon, defender: Pokemon, move: Move) -> tuple:
+        """Everything the damage of `move` depends on."""
+        return (attacker.level, attacker.attack, attacker.type_key, defender.defense, defender.type_key,
+                move.type_id, move.category_id, move.power, move.accuracy)
+
+    def distribution(self, attacker: Pokemon, defender: Pokemon, move: Move) -> DamageDistribution:
+        """Exact damage distribution of one use of `move` by `attacker` on `defender`."""
+        return self._distribution_for_key(self.key(attacker, defender, move))
+
+    def ko_chances(self, attacker: Pokemon, defender: Pokemon, move: Move, hp: int | None = None,
+                   max_hits: int = 5) -> tuple[float, ...]:
+        """Chance that `defender` (at `hp`, default its current HP) is KO'd within 1..max_hits uses.
+
+        Entry n - 1 is the chance of a KO within n uses; differences between
+        entries give the chance of needing exactly n.
+        """
+        hp = defender.current_hp if hp is None else hp
+        return self._ko_for_key(self.key(attacker, defender, move), hp, max_hits)
+
+    def expected_hits_to_ko(self, attacker: Pokemon, defender: Pokemon, move: Move, hp: int | None = None,
+                            max_hits: int = 20) -> float | None:
+        """Mean number of uses needed for a KO, or None if it may not happen within max_hits."""
+        chances = self.ko_chances(attacker, defender, move, hp, max_hits)
+        if chances[-1] < 1.0 - 1e-12:
+            return None
+        previous, expected = 0.0, 0.0
+        for hits, chance in enumerate(chances, start=1):
+            expected += hits * (chance - previous)
+            previous = chance
+        return expected
+
+    def cache_info(self) -> dict:
+        return {"distribution": self._distribution_for_key.cache_info(), "ko": self._ko_for_key.cache_info()}
+
+    def clear(self):
+        self._distribution_for_key.cache_clear()
+        self._ko_for_key.cache_clear()
+
+    # --- Internals ---
+
+    def _compute_distribution(self, key: tuple) -> DamageDistribution:
+        level, attack, attacker_types, defense, defender_types, type_id, category_id, power, accuracy = key
+        # Stand-ins carrying just the fields calculate_base_damage reads
+        attacker = _Stats(level, attack, 0, attacker_types)
+        defender = _Stats(0, 0, defense, defender_types)
+        move = _MoveStats(type_id, category_id, power)
+        base = calculate_base_damage(attacker, defender, move)
+        hit_chance = 1.0 if accuracy > 100 else accuracy / 100
+        if base <= 0:
+            return DamageDistribution(((0, 1.0),), hit_chance)
+
+        outcomes: dict[int, float] = {}
+        branches = [(base, hit_chance * (1 - self.crit_chance))]
+        if self.crit_chance > 0:
+            branches.append((base * self.crit_multiplier, hit_chance * self.crit_chance))
+        for branch_base, branch_chance in branches:
+            for damage, chance in _variance_outcomes(branch_base).items():
+                outcomes[damage] = outcomes.get(damage, 0.0) + branch_chance * chance
+        if hit_chance < 1.0:
+            outcomes[0] = outcomes.get(0, 0.0) + 1.0 - hit_chance
+        return DamageDistribution(tuple(sorted(outcomes.items())), hit_chance)
+
+    def _compute_ko(self, key: tuple, hp: int, max_hits: int) -> tuple[float, ...]:
+        if hp <= 0:
+            return (1.0,) * max_hits
+        outcomes = self._distribution_for_key(key).outcomes
+        # Probability of each amount of damage taken so far, for amounts below hp
+        alive = {0: 1.0}
+        knocked_out = 0.0
+        chances = []
+        for _ in range(max_hits):
+            next_alive: dict[int, float] = {}
+            for taken, chance in alive.items():
+                for damage, damage_chance in outcomes:
+                    total = taken + damage
+                    if total >= hp:
+                        knocked_out += chance * damage_chance
+                    else:
+                        next_alive[total] = next_alive.get(total, 0.0) + chance * damage_chance
+            alive = next_alive
+            chances.append(min(1.0, knocked_out))
+        return tuple(chances)
+
+
+class _Stats:
+    """Minimal Pokémon stand-in for calculate_base_damage."""
+    __slots__ = ("level", "attack", "defense", "type_key")
+
+    def __init__(self, level: int, attack: int, defense: int, type_key: int):
+        self.level, self.attack, self.defense, self.type_key = level, attack, defense, type_key
+
+
+class _MoveStats:
+    """Minimal Move stand-in for calculate_base_damage."""
+    __slots__ = ("type_id", "category_id", "power")
+
+    def __init__(self, type_id: int, category_id: int, power: int):
+        self.type_id, self.category_id, self.power = type_id, category_id, power
+
+
+_default_calculator = DamageCalculator()
+
+def damage_distribution(attacker: Pokemon, defender: Pokemon, move: Move) -> DamageDistribution:
+    """Exact damage distribution using the shared calculator."""
+    return _default_calculator.distribution(attacker, defender, move)
+
+
+def ko_chances(attacker: Pokemon, defender: Pokemon, move: Move, hp: int | None = None,
+               max_hits: int = 5) -> tuple[float, ...]:
+    """Cumulative KO chances within 1..max_hits uses, using the shared calculator."""
+    return _default_calculator.ko_chances(attacker, defender, move, hp, max_hits)
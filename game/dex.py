@@ -0,0 +1,313 @@
+# game/dex.py
+
+"""Species and move database ("dex") loaded from a data file.
+
+The human-editable source is a JSON file (game/data/dex.json by default).
+On first use it is compiled into a compact binary table next to it (same
+name, `.dexc` extension) and memory-mapped. The compiled table is reused for
+as long as the source file's size and modification time match, so startup
+only pays for parsing JSON after the data actually changes.
+
+Entries are resolved lazily: looking a species or move up by id is a single
+struct unpack from the mapped table, looking one up by name is a binary
+search over a sorted name index, and nothing is decoded until it is asked
+for. Moves are flyweights (one shared, read-only SharedMove per dex entry)
+and Pokemon created from the dex keep a `species_id` pointing back at the
+table.
+"""
+
+import json
+import mmap
+import os
+import struct
+
+from game.classes.move import Move, SharedMove
+from game.classes.pokemon import Pokemon
+
+DEFAULT_DEX_PATH = os.path.join(os.path.dirname(__file__), "data", "dex.json")
+
+_MAGIC = b"PKDX"
+_VERSION = 1
+# magic, version, source mtime_ns, source size, #types, #moves, #species, #species-move refs, strings size
+_HEADER = struct.Struct("<4sHQQIIIII")
+_NAME_REF = struct.Struct("<IH")          # string offset, length
+_MOVE_REC = struct.Struct("<IHBBHHH")     # name ref, type, category, power, accuracy, pp
+_SPECIES_REC = struct.Struct("<IHBBHHHHIB")  # name ref, type1, type2, hp, atk, def, spd, first move ref, #moves
+_INDEX = struct.Struct("<H")
+_NO_TYPE = 255
+_CATEGORIES = ["Physical", "Special", "Status"]
+
+
+class Species:
+    """Read-only view of one species entry in the dex."""
+
+    __slots__ = ("id", "name", "types", "max_hp", "attack", "defense", "speed", "move_ids")
+
+    def __init__(self, id: int, name: str, types: list[str], max_hp: int, attack: int, defense: int,
+                 speed: int, move_ids: tuple[int, ...]):
+        self.id: int = id
+        self.name: str = name
+        self.types: list[str] = types
+        self.max_hp: int = max_hp
+        self.attack: int = attack
+        self.defense: int = defense
+        self.speed: int = speed
+        self.move_ids: tuple[int, ...] = move_ids # Default moveset, as dex move ids
+
+    def __repr__(self) -> str:
+        return f"Species({self.id}, {self.name!r})"
+
+
+def compile_dex(data: dict, source_mtime_ns: int = 0, source_size: int = 0) -> bytes:
+    """Compile parsed dex JSON into the binary table format."""
+    moves = data.get("moves", [])
+    species = data.get("species", [])
+    if len(moves) > 0xFFFF or len(species) > 0xFFFF:
+        raise ValueError("The dex is limited to 65535 moves and 65535 species.")
+
+    strings = bytearray()
+    string_refs: dict[str, tuple[int, int]] = {}
+
+    def name_ref(name: str) -> tuple[int, int]:
+        if name not in string_refs:
+            encoded = name.encode("utf-8")
+            string_refs[name] = (len(strings), len(encoded))
+            strings.extend(encoded)
+        return string_refs[name]
+
+    type_names: list[str] = []
+    type_ids: dict[str, int] = {}
+
+    def type_index(name: str) -> int:
+        if name not in type_ids:
+            if len(type_names) >= _NO_TYPE:
+                raise ValueError("Too many distinct types in the dex.")
+            type_ids[name] = len(type_names)
+            type_names.append(name)
+        return type_ids[name]
+
+    move_ids: dict[str, int] = {}
+    move_records = bytearray()
+    for index, move in enumerate(moves):
+        if move["name"] in move_ids:
+            raise ValueError(f"Duplicate move '{move['name']}' in the dex.")
+        if move["category"] not in _CATEGORIES:
+            raise ValueError(f"Move '{move['name']}' has unknown category '{move['category']}'.")
+        move_ids[move["name"]] = index
+        move_records += _MOVE_REC.pack(*name_ref(move["name"]), type_index(move["type"]),
+                                       _CATEGORIES.index(move["category"]), move["power"],
+                                       move["accuracy"], move["pp"])
+
+    species_names: set[str] = set()
+    species_records = bytearray()
+    move_refs = bytearray()
+    ref_count = 0
+    for entry in species:
+        if entry["name"] in species_names:
+            raise ValueError(f"Duplicate species '{entry['name']}' in the dex.")
+        species_names.add(entry["name"])
+        types = entry["types"]
+        if not 1 <= len(types) <= 2:
+            raise ValueError(f"Species '{entry['name']}' must have one or two types.")
+        learnset = entry.get("moves", [])
+        if len(learnset) > 255:
+            raise ValueError(f"Species '{entry['name']}' has too many moves.")
+        for move_name in learnset:
+            if move_name not in move_ids:
+                raise ValueError(f"Species '{entry['name']}' uses unknown move '{move_name}'.")
+            move_refs += _INDEX.pack(move_ids[move_name])
+        species_records += _SPECIES_REC.pack(
+            *name_ref(entry["name"]), type_index(types[0]),
+            type_index(types[1]) if len(types) == 2 else _NO_TYPE,
+            entry["max_hp"], entry["attack"], entry["defense"], entry["speed"], ref_count, len(learnset))
+        ref_count += len(learnset)
+
+    type_records = b"".join(_NAME_REF.pack(*name_ref(name)) for name in type_names)
+    by_name = lambda items: sorted(range(len(items)), key=lambda i: items[i]["name"].encode("utf-8"))
+    move_index = b"".join(_INDEX.pack(i) for i in by_name(moves))
+    species_index = b"".join(_INDEX.pack(i) for i in by_name(species))
+
+    header = _HEADER.pack(_MAGIC, _VERSION, source_mtime_ns, source_size, len(type_names), len(moves),
+                          len(species), ref_count, len(strings))
+    return b"".join([header, type_records, bytes(move_records), bytes(species_records),
+                     move_index, species_index, bytes(move_refs), bytes(strings)])
+
+
+class Dex:
+    """Lazily loaded, cached species/move database."""
+
+    def __init__(self, source_path: str = DEFAULT_DEX_PATH, cache_path: str | None = None):
+        self.source_path: str = source_path
+        self.cache_path: str = cache_path or os.path.splitext(source_path)[0] + ".dexc"
+        self._buffer: mmap.mmap | bytes | None = None # Compiled table, loaded on first use
+        self._move_cache: dict[int, Move] = {}
+        self._species_cache: dict[int, Species] = {}
+
+    # --- Loading ---
+
+    def _table(self) -> mmap.mmap | bytes:
+        if self._buffer is None:
+            self._load()
+        return self._buffer
+
+    def _load(self):
+        stat = os.stat(self.source_path)
+        buffer = self._open_cache(stat)
+        if buffer is None:
+            buffer = self._rebuild_cache(stat)
+        self._buffer = buffer
+        (_, _, _, _, self._n_types, self._n_moves, self._n_species,
+         n_refs, n_strings) = _HEADER.unpack_from(buffer)
+        # Section offsets, in the order compile_dex writes them
+        self._types_at = _HEADER.size
+        self._moves_at = self._types_at + self._n_types * _NAME_REF.size
+        self._species_at = self._moves_at + self._n_moves * _MOVE_REC.size
+        self._move_index_at = self._species_at + self._n_species * _SPECIES_REC.size
+        self._species_index_at = self._move_index_at + self._n_moves * _INDEX.size
+        self._refs_at = self._species_index_at + self._n_species * _INDEX.size
+        self._strings_at = self._refs_at + n_refs * _INDEX.size
+        self._type_names = [self._string(*_NAME_REF.unpack_from(buffer, self._types_at + i * _NAME_REF.size))
+                            for i in range(self._n_types)]
+
+    def _open_cache(self, stat: os.stat_result) -> mmap.mmap | None:
+        """Map the compiled cache if it exists and matches the source file."""
+        try:
+            with open(self.cache_path, "rb") as f:
+                buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError): # Missing, unreadable or empty
+            return None
+        if len(buffer) >= _HEADER.size:
+            magic, version, mtime_ns, size = _HEADER.unpack_from(buffer)[:4]
+            if (magic, version, mtime_ns, size) == (_MAGIC, _VERSION, stat.st_mtime_ns, stat.st_size):
+                return buffer
+        buffer.close()
+        return None
+
+    def _rebuild_cache(self, stat: os.stat_result) -> mmap.mmap | bytes:
+        """Compile the source file and write the cache atomically (kept in memory if that fails)."""
+        with open(self.source_path, encoding="utf-8") as f:
+            compiled = compile_dex(json.load(f), stat.st_mtime_ns, stat.st_size)
+        temp_path = f"{self.cache_path}.{os.getpid()}.tmp"
+        try:
+            with open(temp_path, "wb") as f:
+                f.write(compiled)
+            os.replace(temp_path, self.cache_path)
+        except OSError:
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+            return compiled # Read-only install: just use the table from memory
+        return self._open_cache(stat) or compiled
+
+    def close(self):
+        """Unmap the compiled table (it is mapped again on next use)."""
+        if isinstance(self._buffer, mmap.mmap):
+            self._buffer.close()
+        self._buffer = None
+
+    # --- Low-level decoding ---
+
+    def _string(self, offset: int, length: int) -> str:
+        start = self._strings_at + offset
+        return bytes(self._buffer[start:start + length]).decode("utf-8")
+
+    def _record_name(self, record: struct.Struct, section_at: int, index: int) -> bytes:
+        offset, length = _NAME_REF.unpack_from(self._buffer, section_at + index * record.size)
+        start = self._strings_at + offset
+        return self._buffer[start:start + length]
+
+    def _find(self, name: str, count: int, index_at: int, record: struct.Struct, section_at: int) -> int:
+        """Binary search a sorted name index; return the entry id."""
+        target = name.encode("utf-8")
+        low, high = 0, count
+        while low < high:
+            mid = (low + high) // 2
+            entry = _INDEX.unpack_from(self._buffer, index_at + mid * _INDEX.size)[0]
+            current = self._record_name(record, section_at, entry)
+            if current == target:
+                return entry
+            if current < target:
+                low = mid + 1
+            else:
+                high = mid
+        raise KeyError(name)
+
+    # --- Public lookups ---
+
+    @property
+    def species_count(self) -> int:
+        self._table()
+        return self._n_species
+
+    @property
+    def move_count(self) -> int:
+        self._table()
+        return self._n_moves
+
+    def species_id(self, name: str) -> int:
+        """Return the dex id for a species name (KeyError if unknown)."""
+        self._table()
+        return self._find(name, self._n_species, self._species_index_at, _SPECIES_REC, self._species_at)
+
+    def move_id(self, name: str) -> int:
+        """Return the dex id for a move name (KeyError if unknown)."""
+        self._table()
+        return self._find(name, self._n_moves, self._move_index_at, _MOVE_REC, self._moves_at)
+
+    def move(self, key: str | int) -> Move:
+        """Return the shared, read-only Move object for a move name or id."""
+        move_id = self.move_id(key) if isinstance(key, str) else key
+        move = self._move_cache.get(move_id)
+        if move is None:
+            buffer = self._table()
+            if not 0 <= move_id < self._n_moves:
+                raise KeyError(key)
+            name_off, name_len, type_index, category, power, accuracy, pp = _MOVE_REC.unpack_from(
+                buffer, self._moves_at + move_id * _MOVE_REC.size)
+            move = SharedMove(name=self._string(name_off, name_len), type=self._type_names[type_index],
+                        category=_CATEGORIES[category], power=power, accuracy=accuracy, pp=pp)
+            self._move_cache[move_id] = move
+        return move
+
+    def species(self, key: str | int) -> Species:
+        """Return the Species entry for a species name or id."""
+        species_id = self.species_id(key) if isinstance(key, str) else key
+        species = self._species_cache.get(species_id)
+        if species is None:
+            buffer = self._table()
+            if not 0 <= species_id < self._n_species:
+                raise KeyError(key)
+            (name_off, name_len, type1, type2, max_hp, attack, defense, speed,
+             first_ref, n_moves) = _SPECIES_REC.unpack_from(buffer, self._species_at + species_id * _SPECIES_REC.size)
+            types = [self._type_names[type1]] + ([self._type_names[type2]] if type2 != _NO_TYPE else [])
+            move_ids = tuple(_INDEX.unpack_from(buffer, self._refs_at + (first_ref + i) * _INDEX.size)[0]
+                             for i in range(n_moves))
+            species = Species(species_id, self._string(name_off, name_len), types, max_hp, attack,
+                              defense, speed, move_ids)
+            self._species_cache[species_id] = species
+        return species
+
+    def species_names(self) -> list[str]:
+        """All species names, in dex id order."""
+        return [self.species(i).name for i in range(self.species_count)]
+
+    def create_pokemon(self, species: str | int, level: int = 5, nickname: str | None = None) -> Pokemon:
+        """Create a new Pokemon of the given species with its default moveset."""
+        entry = self.species(species)
+        pokemon = Pokemon(species_name=entry.name, types=entry.types, level=level, max_hp=entry.max_hp,
+                          attack=entry.attack, defense=entry.defense, speed=entry.speed)
+        pokemon.species_id = entry.id
+        pokemon.nickname = nickname
+        pokemon.moves = [self.move(move_id) for move_id in entry.move_ids[:4]] # Shared flyweights
+        return pokemon
+
+
+_default_dex: Dex | None = None
+
+def get_default_dex() -> Dex:
+    """Return the shared Dex for game/data/dex.json (created on first call)."""
+    global _default_dex
+    if _default_dex is None:
+        _default_dex = Dex()
+    return _default_dex
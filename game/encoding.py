@@ -0,0 +1,206 @@
+# game/encoding.py
+
+"""Fixed-layout numeric encoding of Pokémon and battle state for agents.
+
+Everything is written as int32 values at fixed offsets into caller-owned
+buffers (NumPy arrays, or anything exposing a writable int32 memoryview,
+such as a multiprocessing.shared_memory block), so agents read numbers
+instead of parsing `Pokemon.__str__` and nothing is allocated or serialized
+per turn.
+
+Pokémon record (POKEMON_SIZE values, offsets in POKEMON_FIELD):
+    present, species_id, type1, type2, level, current_hp, max_hp, attack,
+    defense, speed, status, then per move slot:
+    move_id, move_type, move_category, move_power, move_accuracy, move_pp
+
+Battle record (BATTLE_SIZE values): a header (offsets in HEADER_FIELD)
+followed by TEAM_SIZE Pokémon records per side, player side first.
+Unknown ids (no dex entry, no second type, empty slots) are -1.
+
+The header's `sequence` counter works as a seqlock: it is odd while a write
+is in progress and even once the record is consistent, so readers in other
+processes can use read_consistent() to take a torn-free copy.
+"""
+
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from game.classes.move import Move
+from game.classes.pokemon import Pokemon
+from game.state import PLAYER, OPPONENT
+from game.types import MAX_TYPES
+
+MAX_MOVES = 4
+TEAM_SIZE = 6
+DTYPE = np.int32
+
+_POKEMON_BASE = ("present", "species_id", "type1", "type2", "level", "current_hp", "max_hp",
+                 "attack", "defense", "speed", "status")
+_MOVE_FIELDS = ("id", "type", "category", "power", "accuracy", "pp")
+POKEMON_FIELD: dict[str, int] = {name: i for i, name in enumerate(_POKEMON_BASE)}
+for _slot in range(MAX_MOVES):
+    for _name in _MOVE_FIELDS:
+        POKEMON_FIELD[f"move{_slot}_{_name}"] = len(POKEMON_FIELD)
+POKEMON_SIZE = len(POKEMON_FIELD)
+_MOVES_START = len(_POKEMON_BASE)
+
+HEADER_FIELD: dict[str, int] = {name: i for i, name in enumerate(
+    ("sequence", "turn", "active_player", "active_opponent", "player_count", "opponent_count", "winner"))}
+HEADER_SIZE = len(HEADER_FIELD)
+BATTLE_SIZE = HEADER_SIZE + 2 * TEAM_SIZE * POKEMON_SIZE
+
+# Status conditions as small integers; anything unrecognised is STATUS_OTHER
+STATUS_CODES: dict[str | None, int] = {None: 0, "Poisoned": 1, "Paralyzed": 2, "Burned": 3, "Asleep": 4, "Frozen": 5}
+STATUS_OTHER = len(STATUS_CODES)
+
+_SEQUENCE = HEADER_FIELD["sequence"]
+_CURRENT_HP = POKEMON_FIELD["current_hp"]
+
+
+def _move_id(move: Move, dex) -> int:
+    if dex is None:
+        return -1
+    try:
+        return dex.move_id(move.name)
+    except KeyError:
+        return -1
+
+
+def encode_pokemon(pokemon: Pokemon | None, out, dex=None):
+    """Write one Pokémon record into the int32 array `out`; None marks the slot as empty.
+
+    Move ids come from `dex` (a game.dex.Dex) when given, otherwise they are -1.
+    """
+    if pokemon is None:
+        out[:POKEMON_SIZE] = -1
+        out[0] = 0 # Not present
+        return
+    primary, secondary = divmod(pokemon.type_key, MAX_TYPES)
+    # Offsets follow _POKEMON_BASE
+    out[0] = 1
+    out[1] = pokemon.species_id if pokemon.species_id is not None else -1
+    out[2] = primary
+    out[3] = secondary if secondary != primary else -1
+    out[4] = pokemon.level
+    out[5] = pokemon.current_hp
+    out[6] = pokemon.max_hp
+    out[7] = pokemon.attack
+    out[8] = pokemon.defense
+    out[9] = pokemon.speed
+    out[10] = STATUS_CODES.get(pokemon.status, STATUS_OTHER)
+    offset = _MOVES_START
+    for slot in range(MAX_MOVES):
+        if slot < len(pokemon.moves):
+            move = pokemon.moves[slot]
+            out[offset:offset + 6] = (_move_id(move, dex), move.type_id, move.category_id,
+                                      move.power, move.accuracy, move.pp)
+        else:
+            out[offset:offset + 6] = (-1, -1, -1, 0, 0, 0)
+        offset += 6
+
+
+class BattleEncoder:
+    """Keeps one battle record up to date in a preallocated buffer.
+
+    `buffer` is any writable buffer of at least BATTLE_SIZE int32 values (a
+    NumPy array, a memoryview, a row of a SharedBattleBuffer); a private
+    array is allocated when omitted. The static part of a record (species,
+    stats, moves) is written once per battle; after that encode() only
+    rewrites the HP, active slots, turn and winner.
+    """
+
+    def __init__(self, buffer=None, dex=None):
+        if buffer is None:
+            buffer = np.zeros(BATTLE_SIZE, dtype=DTYPE)
+        if not isinstance(buffer, np.ndarray):
+            buffer = np.frombuffer(buffer, dtype=DTYPE, count=BATTLE_SIZE) # Shares memory, no copy
+        self.array: np.ndarray = buffer[:BATTLE_SIZE]
+        if self.array.dtype != DTYPE:
+            raise TypeError(f"Encoding buffers must hold {np.dtype(DTYPE).name} values.")
+        self.header: np.ndarray = self.array[:HEADER_SIZE]
+        self.teams: np.ndarray = self.array[HEADER_SIZE:].reshape(2, TEAM_SIZE, POKEMON_SIZE)
+        self.dex = dex
+        self._battle = None # Battle whose static data is currently encoded
+
+    def encode(self, battle) -> np.ndarray:
+        """Bring the record up to date with `battle` and return the array view."""
+        header = self.header
+        header[_SEQUENCE] += 1 # Odd: write in progress
+        if battle is not self._battle:
+            self._encode_static(battle)
+        state = battle.state
+        for side in (PLAYER, OPPONENT):
+            rows = self.teams[side]
+            for slot, hp in zip(range(TEAM_SIZE), state.hp[side]):
+                rows[slot, _CURRENT_HP] = hp
+        # Offsets follow HEADER_FIELD
+        header[1] = state.turn_count
+        header[2] = state.active[PLAYER]
+        header[3] = state.active[OPPONENT]
+        winner = state.winner
+        header[6] = winner if winner is not None else -1
+        header[_SEQUENCE] += 1 # Even: consistent again
+        return self.array
+
+    def _encode_static(self, battle):
+        for side in (PLAYER, OPPONENT):
+            team = battle.combatants[side]
+            rows = self.teams[side]
+            for slot in range(TEAM_SIZE):
+                encode_pokemon(team[slot] if slot < len(team) else None, rows[slot], self.dex)
+            self.header[4 + side] = min(len(team), TEAM_SIZE)
+        self._battle = battle
+
+
+def read_consistent(source: np.ndarray, out: np.ndarray, max_attempts: int = 1000) -> np.ndarray:
+    """Copy a battle record written by another process without catching it half-written."""
+    for _ in range(max_attempts):
+        before = int(source[_SEQUENCE])
+        if before & 1:
+            continue # Writer is mid-update
+        out[:] = source[:BATTLE_SIZE]
+        if int(source[_SEQUENCE]) == before:
+            return out
+    raise TimeoutError("The battle record kept changing while it was being read.")
+
+
+class SharedBattleBuffer:
+    """Battle records for `n_battles` battles in a named shared memory block.
+
+    The creating process passes no name; agent processes attach with
+    SharedBattleBuffer(n_battles, name=owner.name). `arrays[i]` is battle
+    i's record and can be handed to a BattleEncoder. Call close() in every
+    process and unlink() once in the creator (or use it as a context manager).
+    """
+
+    def __init__(self, n_battles: int, name: str | None = None):
+        size = n_battles * BATTLE_SIZE * np.dtype(DTYPE).itemsize
+        self._owner: bool = name is None
+        self._shm = shared_memory.SharedMemory(name=name, create=self._owner, size=size)
+        self.n_battles: int = n_battles
+        self.arrays: np.ndarray = np.ndarray((n_battles, BATTLE_SIZE), dtype=DTYPE, buffer=self._shm.buf)
+        if self._owner:
+            self.arrays[:] = 0
+
+    @property
+    def name(self) -> str:
+        return self._shm.name
+
+    def encoder(self, index: int, dex=None) -> BattleEncoder:
+        return BattleEncoder(self.arrays[index], dex)
+
+    def close(self):
+        self.arrays = None # Drop our view first, or the mapping cannot be released
+        self._shm.close()
+
+    def unlink(self):
+        self._shm.unlink()
+
+    def __enter__(self) -> "SharedBattleBuffer":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        if self._owner:
+            self.unlink()
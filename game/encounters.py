@@ -0,0 +1,160 @@
+# game/encounters.py
+
+"""Wild encounters drawn from per-zone weighted species/level tables.
+
+Each zone (game/data/encounters.json by default) lists species with a
+weight and a level range. Species are picked with Vose's alias method:
+building the table is O(n) once per zone, and every draw afterwards costs
+one uniform index plus one biased coin flip, whatever the table size.
+
+EncounterGenerator.sample_batch() draws many encounters at once into
+compact arrays (species id, level), and create_batch() turns them into
+Pokemon for simulation workloads.
+"""
+
+import json
+import os
+import random
+from array import array
+from dataclasses import dataclass
+
+from game.classes.pokemon import Pokemon
+from game.dex import Dex, get_default_dex
+
+DEFAULT_ENCOUNTERS_PATH = os.path.join(os.path.dirname(__file__), "data", "encounters.json")
+
+
+class AliasTable:
+    """O(1) sampling from a fixed discrete distribution (Vose's alias method)."""
+
+    def __init__(self, weights: list[float]):
+        n = len(weights)
+        total = float(sum(weights))
+        if n == 0 or total <= 0 or any(w < 0 for w in weights):
+            raise ValueError("An alias table needs at least one positive weight and no negative ones.")
+        self.size: int = n
+        self.prob = array("d", [0.0] * n)  # Chance of keeping column i rather than taking its alias
+        self.alias = array("I", range(n))
+        scaled = [w * n / total for w in weights]
+        small = [i for i, p in enumerate(scaled) if p < 1.0]
+        large = [i for i, p in enumerate(scaled) if p >= 1.0]
+        while small and large:
+            less, more = small.pop(), large.pop()
+            self.prob[less] = scaled[less]
+            self.alias[less] = more
+            scaled[more] -= 1.0 - scaled[less]
+            (small if scaled[more] < 1.0 else large).append(more)
+        for i in small + large: # Leftovers are 1 up to rounding error
+            self.prob[i] = 1.0
+
+    def sample(self, rng: random.Random) -> int:
+        column = rng.randrange(self.size)
+        return column if rng.random() < self.prob[column] else self.alias[column]
+
+
+@dataclass(frozen=True)
+class EncounterSlot:
+    """One row of a zone table."""
+    species_id: int
+    weight: float
+    min_level: int
+    max_level: int
+
+
+class EncounterTable:
+    """The encounter rows of one zone plus their alias table."""
+
+    def __init__(self, zone: str, slots: list[EncounterSlot]):
+        self.zone: str = zone
+        self.slots: list[EncounterSlot] = slots
+        self.alias: AliasTable = AliasTable([slot.weight for slot in slots])
+
+    def sample(self, rng: random.Random) -> tuple[int, int]:
+        """Draw one (species id, level)."""
+        slot = self.slots[self.alias.sample(rng)]
+        return slot.species_id, rng.randint(slot.min_level, slot.max_level)
+
+
+@dataclass
+class EncounterBatch:
+    """Many encounters from one zone as parallel compact arrays."""
+    zone: str
+    species_ids: array # 'H', one dex species id per encounter
+    levels: array      # 'B'
+
+    def __len__(self) -> int:
+        return len(self.species_ids)
+
+
+class EncounterGenerator:
+    """Generates wild Pokémon for named zones.
+
+    `tables` maps zone names to lists of {"species", "weight", "min_level",
+    "max_level"} rows; by default they are read from `path`. Species names
+    are resolved against `dex`. Pass `seed` (or an `rng`) for reproducible
+    encounters.
+    """
+
+    def __init__(self, dex: Dex | None = None, tables: dict | None = None, path: str = DEFAULT_ENCOUNTERS_PATH,
+                 seed: int | None = None, rng: random.Random | None = None):
+        self.dex: Dex = dex or get_default_dex()
+        if tables is None:
+            with open(path, "r", encoding="utf-8") as f:
+                tables = json.load(f)
+        self._tables: dict[str, EncounterTable] = {}
+        for zone, rows in tables.items():
+            slots = []
+            for row in rows:
+                if not 1 <= row["min_level"] <= row["max_level"] <= 100:
+                    raise ValueError(f"Bad level range for {row['species']} in zone '{zone}'.")
+                slots.append(EncounterSlot(self.dex.species_id(row["species"]), float(row["weight"]),
+                                           row["min_level"], row["max_level"]))
+            self._tables[zone] = EncounterTable(zone, slots)
+        self.rng: random.Random = rng or random.Random(seed)
+
+    @property
+    def zones(self) -> list[str]:
+        return list(self._tables)
+
+    def table(self, zone: str) -> EncounterTable:
+        try:
+            return self._tables[zone]
+        except KeyError:
+            raise KeyError(f"No encounter table for zone '{zone}'.") from None
+
+    def sample(self, zone: str) -> tuple[int, int]:
+        """Draw one (species id, level) for `zone`."""
+        return self.table(zone).sample(self.rng)
+
+    def encounter(self, zone: str) -> Pokemon:
+        """Create one wild Pokémon for `zone`."""
+        species_id, level = self.sample(zone)
+        return self.dex.create_pokemon(species_id, level=level)
+
+    def sample_batch(self, zone: str, count: int) -> EncounterBatch:
+        """Draw `count` encounters into compact arrays without creating any Pokemon."""
+        table = self.table(zone)
+        slots, alias, rng = table.slots, table.alias, self.rng
+        species_ids = array("H", bytes(2 * count))
+        levels = array("B", bytes(count))
+        for i in range(count):
+            slot = slots[alias.sample(rng)]
+            species_ids[i] = slot.species_id
+            levels[i] = rng.randint(slot.min_level, slot.max_level)
+        return EncounterBatch(zone, species_ids, levels)
+
+    def create_batch(self, zone: str, count: int) -> list[Pokemon]:
+        """Create `count` wild Pokémon; they share Move objects through the dex."""
+        batch = self.sample_batch(zone, count)
+        create = self.dex.create_pokemon
+        return [create(species_id, level=level) for species_id, level in zip(batch.species_ids, batch.levels)]
+
+    def encounter_at(self, world, x: int, y: int, rate: float = 0.1) -> Pokemon | None:
+        """Roll for a wild Pokémon when stepping on (x, y) of a game.world.World.
+
+        Only tall grass has encounters; the zone is the chunk's zone.
+        """
+        from game.world import GRASS
+        if world.tile(x, y) != GRASS or self.rng.random() >= rate:
+            return None
+        return self.encounter(world.zone_at(x, y))
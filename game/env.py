@@ -0,0 +1,231 @@
+# game/env.py
+
+"""Gym-style environments over the battle engine, for training and evaluating agents.
+
+BattleEnv drives one headless Battle turn by turn: the agent plays the
+player's side, an opponent policy (any opponent chooser, e.g. SearchOpponent)
+plays the other. `reset()` returns `(observation, info)` and `step(action)`
+returns `(observation, reward, terminated, truncated, info)` like Gymnasium.
+An action is an index into the player's move slots; `action_mask()` says
+which slots are currently usable.
+
+VectorBattleEnv steps K of them in lockstep and returns batched NumPy
+arrays, writing every observation straight into preallocated buffers instead
+of allocating and stacking K arrays per step. Only the batching of inputs and
+outputs is shared: each environment still plays its turn through its own
+Battle, one after another, so a step costs about K single steps.
+
+Observation layout (float32, OBS_SIZE values):
+
+- [0] own HP fraction, [1] opponent HP fraction, [2] turn / max_turns
+- per own move slot: expected damage as a fraction of the opponent's max HP, hit chance
+- per opponent move slot: the same against us
+"""
+
+import random
+from typing import Callable
+
+import numpy as np
+
+from game.battle import Battle, calculate_base_damage, DAMAGE_VARIANCE_MIN, DAMAGE_VARIANCE_MAX
+from game.classes.move import Move
+from game.classes.player import Player
+from game.classes.pokemon import Pokemon
+from game.state import PLAYER, OPPONENT
+
+MAX_MOVES = 4 # Action space size: one action per move slot
+OBS_HEADER = 3
+OBS_SIZE = OBS_HEADER + 4 * MAX_MOVES
+
+# Rewards at the end of an episode (every other step gives 0)
+WIN_REWARD = 1.0
+LOSS_REWARD = -1.0
+
+_MEAN_VARIANCE = (DAMAGE_VARIANCE_MIN + DAMAGE_VARIANCE_MAX) / 2
+
+
+def matchup_factory(player_pokemon: Pokemon, opponent_pokemon: Pokemon) -> Callable[[int], Battle]:
+    """Battle factory replaying the same matchup every episode (both sides start at full HP)."""
+    player = Player("Agent")
+    player.team.append(player_pokemon) # Skip add_pokemon's announcement
+
+    def make_battle(seed: int) -> Battle:
+        player_pokemon.current_hp = player_pokemon.max_hp
+        opponent_pokemon.current_hp = opponent_pokemon.max_hp
+        return Battle(player, opponent_pokemon, headless=True, seed=seed)
+
+    return make_battle
+
+
+def _move_features(attacker: Pokemon, defender: Pokemon, out: np.ndarray):
+    """Write (expected damage fraction, hit chance) for each of the attacker's move slots."""
+    out[:] = 0.0
+    for slot, move in enumerate(attacker.moves[:MAX_MOVES]):
+        hit_chance = 1.0 if move.accuracy > 100 else move.accuracy / 100
+        damage = calculate_base_damage(attacker, defender, move) * _MEAN_VARIANCE
+        out[2 * slot] = min(1.0, damage / defender.max_hp) if defender.max_hp > 0 else 0.0
+        out[2 * slot + 1] = hit_chance
+
+
+class BattleEnv:
+    """Single-battle environment: the agent plays the player's side.
+
+    `battle_factory(seed)` builds a fresh headless Battle for each episode
+    (see matchup_factory). `opponent_policy` chooses the opponent's moves;
+    by default the Battle's own opponent AI is used. Episodes are truncated
+    after `max_turns` turns. `seed` makes the sequence of episodes reproducible.
+    """
+
+    def __init__(self, battle_factory: Callable[[int], Battle],
+                 opponent_policy: Callable[[Battle], Move | None] | None = None,
+                 max_turns: int = 200, seed: int | None = None):
+        self.battle_factory = battle_factory
+        self.opponent_policy = opponent_policy
+        self.max_turns: int = max_turns
+        self.battle: Battle | None = None
+        self._seeds: random.Random = random.Random(seed)
+        # Move features only change when an active Pokemon does, so they are cached per pair of active slots
+        self._move_block: np.ndarray = np.zeros(4 * MAX_MOVES, dtype=np.float32)
+        self._block_active: tuple[int, int] | None = None
+
+    @classmethod
+    def for_matchup(cls, player_pokemon: Pokemon, opponent_pokemon: Pokemon, **kwargs) -> "BattleEnv":
+        return cls(matchup_factory(player_pokemon, opponent_pokemon), **kwargs)
+
+    # --- Gym interface ---
+
+    def reset(self, seed: int | None = None) -> tuple[np.ndarray, dict]:
+        """Start a new episode and return (observation, info)."""
+        if seed is not None:
+            self._seeds.seed(seed)
+        self.battle = self.battle_factory(self._seeds.getrandbits(64))
+        self._block_active = None
+        return self.observation(), self._info()
+
+    def step(self, action: int) -> tuple[np.ndarray, float, bool, bool, dict]:
+        """Play one turn with the player's move in slot `action`."""
+        battle = self._require_battle()
+        if battle.is_over or battle.turn_count >= self.max_turns:
+            raise ValueError("The episode is over; call reset().")
+        moves = battle.player_active_pokemon.moves
+        if not 0 <= action < MAX_MOVES or not self.action_mask()[action]:
+            raise ValueError(f"Action {action} is not legal (the Pokémon has {len(moves)} moves).")
+        opponent_move = (self.opponent_policy(battle) if self.opponent_policy is not None
+                         else battle._get_opponent_move_choice())
+        battle.apply_turn(moves[action], opponent_move)
+        terminated = battle.is_over
+        truncated = not terminated and battle.turn_count >= self.max_turns
+        return self.observation(), self.reward(), terminated, truncated, self._info()
+
+    def action_mask(self) -> np.ndarray:
+        """Boolean mask over move slots: True where the move exists and has PP left."""
+        mask = np.zeros(MAX_MOVES, dtype=bool)
+        for slot, move in enumerate(self._require_battle().player_active_pokemon.moves[:MAX_MOVES]):
+            mask[slot] = move.pp > 0
+        return mask
+
+    def observation(self, out: np.ndarray | None = None) -> np.ndarray:
+        """Current observation, written into `out` if given (a float32 array of OBS_SIZE)."""
+        battle = self._require_battle()
+        if out is None:
+            out = np.empty(OBS_SIZE, dtype=np.float32)
+        player_poke, opponent_poke = battle.player_active_pokemon, battle.opponent
+        state = battle.state
+        if state.active != self._block_active:
+            # Stats and moves do not change during a battle, so this only reruns after a switch
+            _move_features(player_poke, opponent_poke, self._move_block[:2 * MAX_MOVES])
+            _move_features(opponent_poke, player_poke, self._move_block[2 * MAX_MOVES:])
+            self._block_active = state.active
+        out[0] = state.active_hp(PLAYER) / player_poke.max_hp
+        out[1] = state.active_hp(OPPONENT) / opponent_poke.max_hp
+        out[2] = state.turn_count / self.max_turns
+        out[OBS_HEADER:] = self._move_block
+        return out
+
+    def reward(self) -> float:
+        """+1 for a win, -1 for a loss, 0 otherwise."""
+        winner = self._require_battle().state.winner
+        if winner == PLAYER:
+            return WIN_REWARD
+        if winner == OPPONENT:
+            return LOSS_REWARD
+        return 0.0
+
+    def _info(self) -> dict:
+        return {"turn": self.battle.turn_count, "seed": self.battle.seed}
+
+    def _require_battle(self) -> Battle:
+        if self.battle is None:
+            raise ValueError("Call reset() before using the environment.")
+        return self.battle
+
+
+class VectorBattleEnv:
+    """K BattleEnvs stepped in lockstep, with batched NumPy inputs and outputs.
+
+    The turns themselves are not vectorised: step() is a Python loop over
+    BattleEnv.step, so it saves the per-env array allocation and stacking but
+    not the battle engine's per-turn cost.
+
+    Finished episodes are reset automatically within the same step: the
+    observation returned for them is the first one of the new episode, and the
+    last one of the finished episode is in `infos[i]["final_observation"]`.
+    """
+
+    def __init__(self, envs: list[BattleEnv]):
+        if not envs:
+            raise ValueError("VectorBattleEnv needs at least one environment.")
+        self.envs: list[BattleEnv] = envs
+        self.num_envs: int = len(envs)
+        self._obs: np.ndarray = np.zeros((self.num_envs, OBS_SIZE), dtype=np.float32)
+        self._rewards: np.ndarray = np.zeros(self.num_envs, dtype=np.float32)
+        self._terminated: np.ndarray = np.zeros(self.num_envs, dtype=bool)
+        self._truncated: np.ndarray = np.zeros(self.num_envs, dtype=bool)
+        self._masks: np.ndarray = np.zeros((self.num_envs, MAX_MOVES), dtype=bool)
+
+    @classmethod
+    def for_matchups(cls, matchups: list[tuple[Pokemon, Pokemon]], seed: int | None = None,
+                     **kwargs) -> "VectorBattleEnv":
+        """One environment per (player, opponent) pair; the Pokémon must not be shared between pairs."""
+        seeds = random.Random(seed)
+        return cls([BattleEnv.for_matchup(a, b, seed=seeds.getrandbits(64), **kwargs) for a, b in matchups])
+
+    def reset(self, seed: int | None = None) -> tuple[np.ndarray, list[dict]]:
+        """Reset every environment; returns (observations, infos)."""
+        seeds = random.Random(seed) if seed is not None else None
+        infos = []
+        for i, env in enumerate(self.envs):
+            _, info = env.reset(seeds.getrandbits(64) if seeds else None)
+            env.observation(self._obs[i])
+            infos.append(info)
+        return self._obs.copy(), infos
+
+    def step(self, actions) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, list[dict]]:
+        """Step every environment with one action each.
+
+        Returns (observations, rewards, terminated, truncated, infos); the
+        arrays have one row per environment and are fresh copies.
+        """
+        actions = np.asarray(actions)
+        if actions.shape != (self.num_envs,):
+            raise ValueError(f"Expected {self.num_envs} actions, got shape {actions.shape}.")
+        infos = []
+        for i, env in enumerate(self.envs):
+            _, reward, terminated, truncated, info = env.step(int(actions[i]))
+            self._rewards[i] = reward
+            self._terminated[i] = terminated
+            self._truncated[i] = truncated
+            if terminated or truncated:
+                info["final_info"] = dict(info)
+                info["final_observation"] = env.observation()
+                _, reset_info = env.reset()
+                info.update(reset_info)
+            env.observation(self._obs[i])
+            infos.append(info)
+        return self._obs.copy(), self._rewards.copy(), self._terminated.copy(), self._truncated.copy(), infos
+
+    def action_masks(self) -> np.ndarray:
+        """(num_envs, MAX_MOVES) boolean mask of legal actions."""
+        for i, env in enumerate(self.envs):
+            self._masks[i] = env.action_mask()
+        return self._masks.copy()
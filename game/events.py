@@ -0,0 +1,277 @@
+# game/events.py
+
+"""Typed battle events, an event bus, and a buffered JSONL event log.
+
+Alongside its text output, a Battle publishes what happens as small
+immutable event objects (turn start, move used, hit/miss, damage, faint,
+switch, battle end; Pokemon.gain_xp adds XP and level-up events) on an
+EventBus. Analytics subscribe to the bus instead of parsing printed text.
+Events are only built when the bus has subscribers, so battles without
+listeners pay almost nothing.
+
+EventLogWriter is a subscriber that batches events into large writes and
+rotates files by size, so millions of episodes can be logged without a
+syscall per line.
+"""
+
+import json
+import os
+import re
+from dataclasses import dataclass
+from typing import Callable, ClassVar
+
+
+# --- Events ---
+
+@dataclass(frozen=True, slots=True)
+class BattleEvent:
+    """Base class for events. `kind` names the event in logs."""
+    kind: ClassVar[str] = "event"
+
+    def to_dict(self) -> dict:
+        record = {"event": self.kind}
+        for name in self.__slots__:
+            record[name] = getattr(self, name)
+        return record
+
+
+@dataclass(frozen=True, slots=True)
+class BattleStarted(BattleEvent):
+    kind: ClassVar[str] = "battle_start"
+    seed: int
+    player: str
+    opponent: str
+
+
+@dataclass(frozen=True, slots=True)
+class TurnStarted(BattleEvent):
+    kind: ClassVar[str] = "turn_start"
+    turn: int
+    player_hp: int
+    opponent_hp: int
+
+
+@dataclass(frozen=True, slots=True)
+class MoveUsed(BattleEvent):
+    kind: ClassVar[str] = "move"
+    turn: int
+    side: int # PLAYER or OPPONENT (game.state)
+    pokemon: str
+    move: str
+
+
+@dataclass(frozen=True, slots=True)
+class MoveHit(BattleEvent):
+    kind: ClassVar[str] = "hit"
+    turn: int
+    side: int
+    move: str
+
+
+@dataclass(frozen=True, slots=True)
+class MoveMissed(BattleEvent):
+    kind: ClassVar[str] = "miss"
+    turn: int
+    side: int
+    move: str
+
+
+@dataclass(frozen=True, slots=True)
+class DamageDealt(BattleEvent):
+    kind: ClassVar[str] = "damage"
+    turn: int
+    side: int # Side that took the damage
+    amount: int
+    hp_left: int
+    effectiveness: float
+
+
+@dataclass(frozen=True, slots=True)
+class Fainted(BattleEvent):
+    kind: ClassVar[str] = "faint"
+    turn: int
+    side: int
+    pokemon: str
+
+
+@dataclass(frozen=True, slots=True)
+class Switched(BattleEvent):
+    kind: ClassVar[str] = "switch"
+    turn: int
+    side: int
+    pokemon: str # The Pokémon sent out
+    forced: bool # Replacing a fainted Pokémon rather than a chosen switch
+
+
+@dataclass(frozen=True, slots=True)
+class BattleEnded(BattleEvent):
+    kind: ClassVar[str] = "battle_end"
+    turn: int
+    winner: int | None # PLAYER, OPPONENT, or None for no winner
+
+
+@dataclass(frozen=True, slots=True)
+class XpGained(BattleEvent):
+    kind: ClassVar[str] = "xp"
+    pokemon: str
+    amount: int
+
+
+@dataclass(frozen=True, slots=True)
+class LevelledUp(BattleEvent):
+    kind: ClassVar[str] = "level_up"
+    pokemon: str
+    level: int
+
+
+# --- Bus ---
+
+class EventBus:
+    """Delivers published events to every subscriber, in subscription order."""
+
+    def __init__(self):
+        self._subscribers: list[Callable[[BattleEvent], None]] = []
+
+    @property
+    def active(self) -> bool:
+        """Whether anyone is listening (publishers skip building events otherwise)."""
+        return bool(self._subscribers)
+
+    def subscribe(self, callback: Callable[[BattleEvent], None]) -> Callable[[BattleEvent], None]:
+        """Register `callback`; returns it so it can be passed to unsubscribe() later."""
+        self._subscribers.append(callback)
+        return callback
+
+    def unsubscribe(self, callback: Callable[[BattleEvent], None]):
+        self._subscribers.remove(callback)
+
+    def publish(self, event: BattleEvent):
+        for callback in self._subscribers:
+            callback(event)
+
+
+class EventRecorder:
+    """Subscriber that keeps every event in a list (handy for tests and notebooks)."""
+
+    def __init__(self):
+        self.events: list[BattleEvent] = []
+
+    def __call__(self, event: BattleEvent):
+        self.events.append(event)
+
+    def of_kind(self, kind: str) -> list[BattleEvent]:
+        return [event for event in self.events if event.kind == kind]
+
+
+# --- Log writer ---
+
+def _last_record(path: str, block_size: int = 64 * 1024) -> dict | None:
+    """The last readable record of a JSONL log, reading backwards from the end; None if there is none."""
+    with open(path, "rb") as f:
+        end = f.seek(0, os.SEEK_END)
+        tail = b""
+        while end > 0:
+            start = max(0, end - block_size)
+            f.seek(start)
+            tail = f.read(end - start) + tail
+            end = start
+            lines = tail.split(b"\n")
+            if end > 0:
+                tail = lines.pop(0) # May be the end of a line from an earlier block
+            for line in reversed(lines):
+                if line:
+                    try:
+                        return json.loads(line)
+                    except ValueError:
+                        pass # Cut off mid-record
+    return None
+
+
+class EventLogWriter:
+    """Buffered, size-rotated JSONL log of events; subscribe it to an EventBus.
+
+    Records are encoded as they arrive but only written to disk once
+    `batch_size` of them have accumulated, as a single write. When the current
+    file reaches `max_bytes`, logging continues in the next numbered file
+    (`<prefix>-000000.jsonl`, `<prefix>-000001.jsonl`, ...). A writer on a
+    directory that already holds logs continues after the highest numbered
+    file instead of overwriting it, and its episode numbers carry on from
+    the last record there. Each record gets an `episode` number that
+    increases with every BattleStarted event.
+    """
+
+    def __init__(self, directory: str, prefix: str = "events", max_bytes: int = 64 * 1024 * 1024,
+                 batch_size: int = 4096):
+        self.directory: str = directory
+        self.prefix: str = prefix
+        self.max_bytes: int = max_bytes
+        self.batch_size: int = batch_size
+        self.episode: int = -1
+        self.file_index: int = 0 # Set to the first unused number below
+        self.paths: list[str] = []
+        self._pending: list[str] = []
+        self._file = None
+        self._file_bytes: int = 0
+        self._encode = json.JSONEncoder(separators=(",", ":"), ensure_ascii=False).encode
+        os.makedirs(directory, exist_ok=True)
+        pattern = re.compile(re.escape(prefix) + r"-(\d+)\.jsonl")
+        existing = [int(match.group(1)) for match in map(pattern.fullmatch, os.listdir(directory)) if match]
+        self.file_index = max(existing) + 1 if existing else 0
+        for index in sorted(existing, reverse=True):
+            last = _last_record(os.path.join(directory, f"{prefix}-{index:06d}.jsonl"))
+            if last is not None:
+                self.episode = last.get("episode", -1)
+                break
+
+    def __call__(self, event: BattleEvent):
+        self.write(event)
+
+    def write(self, event: BattleEvent):
+        if isinstance(event, BattleStarted):
+            self.episode += 1
+        record = event.to_dict()
+        record["episode"] = self.episode
+        self._pending.append(self._encode(record))
+        if len(self._pending) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        """Write every buffered record to disk."""
+        if not self._pending:
+            return
+        data = ("\n".join(self._pending) + "\n").encode("utf-8")
+        self._pending.clear()
+        if self._file is None or self._file_bytes >= self.max_bytes:
+            self._open_next()
+        self._file.write(data)
+        self._file.flush()
+        self._file_bytes += len(data)
+
+    def _open_next(self):
+        if self._file is not None:
+            self._file.close()
+            self.file_index += 1
+        path = os.path.join(self.directory, f"{self.prefix}-{self.file_index:06d}.jsonl")
+        self._file = open(path, "xb") # Never truncate an earlier log
+        self._file_bytes = 0
+        self.paths.append(path)
+
+    def close(self):
+        self.flush()
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def __enter__(self) -> "EventLogWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def read_event_log(path: str):
+    """Yield the records (dicts) of one JSONL event log file."""
+    with open(path, "r", encoding="utf-8") as log:
+        for line in log:
+            if line.strip():
+                yield json.loads(line)
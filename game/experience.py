@@ -0,0 +1,91 @@
+# game/experience.py
+
+"""Experience curves and batch XP awards.
+
+An ExperienceCurve precomputes the cumulative XP needed to reach every
+level, so applying any XP award is a bisection over that table instead of a
+level-by-level loop. Pokemon.gain_xp uses the Pokémon's curve (a flat
+XP_PER_LEVEL curve unless one is assigned) and applies the stat growth for
+all levels gained in one step.
+"""
+
+import bisect
+from functools import lru_cache
+from typing import Callable, Iterable, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import random
+    from game.classes.pokemon import Pokemon
+    from game.events import EventBus
+
+MAX_LEVEL = 100
+
+
+class ExperienceCurve:
+    """Cumulative XP table for levels 1..MAX_LEVEL.
+
+    `total_for_level(n)` gives the total XP a Pokémon has earned on reaching
+    level n (0 at level 1). Pokémon store only the XP earned towards their
+    next level, so conversions go through this table.
+    """
+
+    def __init__(self, name: str, total_for_level: Callable[[int], int]):
+        self.name: str = name
+        self.totals: list[int] = [0, 0] # Index = level; levels start at 1
+        for level in range(2, MAX_LEVEL + 1):
+            # Clamp so every level costs at least 1 XP, even where a formula dips
+            self.totals.append(max(self.totals[-1] + 1, int(total_for_level(level))))
+
+    def xp_to_next(self, level: int) -> int:
+        """XP needed to go from `level` to `level + 1` (0 at the level cap)."""
+        if level >= MAX_LEVEL:
+            return 0
+        return self.totals[level + 1] - self.totals[level]
+
+    def level_for_total(self, total_xp: int) -> int:
+        """Level reached with `total_xp` XP in total (bisection over the table)."""
+        return min(MAX_LEVEL, bisect.bisect_right(self.totals, total_xp, 1) - 1)
+
+    def advance(self, level: int, xp: int, amount: int) -> tuple[int, int]:
+        """Return (new level, XP towards the next level) after gaining `amount` XP."""
+        total = self.totals[level] + xp + amount
+        new_level = self.level_for_total(total)
+        if new_level >= MAX_LEVEL:
+            return MAX_LEVEL, 0
+        return new_level, total - self.totals[new_level]
+
+    def __repr__(self) -> str:
+        return f"ExperienceCurve({self.name!r})"
+
+
+@lru_cache(maxsize=None)
+def flat_curve(xp_per_level: int) -> ExperienceCurve:
+    """Every level costs the same amount of XP (the game's original rule)."""
+    return ExperienceCurve(f"flat-{xp_per_level}", lambda level: (level - 1) * xp_per_level)
+
+
+# The classic growth rates
+FAST = ExperienceCurve("fast", lambda n: 4 * n ** 3 // 5)
+MEDIUM_FAST = ExperienceCurve("medium_fast", lambda n: n ** 3)
+MEDIUM_SLOW = ExperienceCurve("medium_slow", lambda n: 6 * n ** 3 // 5 - 15 * n ** 2 + 100 * n - 140)
+SLOW = ExperienceCurve("slow", lambda n: 5 * n ** 3 // 4)
+
+CURVES: dict[str, ExperienceCurve] = {curve.name: curve for curve in (FAST, MEDIUM_FAST, MEDIUM_SLOW, SLOW)}
+
+
+def award_xp(pokemon: "Iterable[Pokemon]", amount: "int | Iterable[int]", rng: "random.Random | None" = None,
+             events: "EventBus | None" = None, verbose: bool = False) -> int:
+    """Give XP to a whole team or roster at once; returns the total number of levels gained.
+
+    `amount` is either one value for everyone or one value per Pokémon.
+    Fainted and max-level Pokémon are skipped, as with gain_xp. Output is
+    off by default so large rosters are processed without any printing.
+    """
+    members = list(pokemon)
+    amounts = [amount] * len(members) if isinstance(amount, int) else list(amount)
+    if len(amounts) != len(members):
+        raise ValueError(f"Got {len(amounts)} XP amounts for {len(members)} Pokémon.")
+    gained = 0
+    for member, value in zip(members, amounts):
+        gained += member.gain_xp(value, rng, events, verbose=verbose)
+    return gained
@@ -0,0 +1,209 @@
+# game/instrumentation.py
+
+"""Opt-in instrumentation and profiling for battles.
+
+BattleStats collects per-phase timings (turn order, move selection, move
+execution), hit/miss counts, a damage histogram and decision latency per
+side. Pass one to Battle(stats=...); sharing a single BattleStats between
+many battles aggregates a whole batch. Nothing is wrapped or subscribed
+unless a BattleStats is attached, so uninstrumented battles run the
+unchanged code paths at full speed.
+
+profiled() wraps a block (one battle or a batch) in cProfile and/or
+tracemalloc and dumps the results to files.
+"""
+
+import cProfile
+import functools
+import io
+import os
+import pstats
+import time
+import tracemalloc
+import weakref
+from contextlib import contextmanager
+
+from game.events import BattleEvent, MoveHit, MoveMissed, DamageDealt
+from game.state import PLAYER, OPPONENT
+
+PHASES = ("turn_order", "move_selection", "execution")
+DAMAGE_BUCKET = 10 # Width of each damage histogram bucket
+
+
+class BattleStats:
+    """Timers and counters for one or more instrumented battles."""
+
+    def __init__(self):
+        self.phase_seconds: dict[str, float] = {phase: 0.0 for phase in PHASES}
+        self.phase_calls: dict[str, int] = {phase: 0 for phase in PHASES}
+        self.hits: int = 0
+        self.misses: int = 0
+        self.damage_histogram: dict[int, int] = {} # Bucket start -> number of hits dealing that much
+        self.decision_seconds: list[float] = [0.0, 0.0] # Per side (PLAYER, OPPONENT)
+        self.decisions: list[int] = [0, 0]
+        self.max_decision_seconds: list[float] = [0.0, 0.0]
+        self.battles: int = 0
+        self._buses: weakref.WeakSet = weakref.WeakSet() # Buses on_event is subscribed to
+
+    # --- Wiring ---
+
+    def attach(self, battle):
+        """Instrument `battle` by wrapping its phase methods on the instance."""
+        battle._get_turn_order = self._timed("turn_order", battle._get_turn_order)
+        battle._finish_turn = self._timed("execution", battle._finish_turn)
+        battle._get_move_choice = self._timed_decision(battle, battle._get_move_choice)
+        battle._get_move_choice_async = self._timed_decision_async(battle, battle._get_move_choice_async)
+        if battle.events not in self._buses: # Battles may share a bus; count each event once
+            battle.events.subscribe(self.on_event)
+            self._buses.add(battle.events)
+        self.battles += 1
+
+    def _timed(self, phase: str, method):
+        @functools.wraps(method)
+        def wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                self.phase_seconds[phase] += time.perf_counter() - started
+                self.phase_calls[phase] += 1
+        return wrapper
+
+    def _record_decision(self, side: int, elapsed: float):
+        self.phase_seconds["move_selection"] += elapsed
+        self.phase_calls["move_selection"] += 1
+        self.decision_seconds[side] += elapsed
+        self.decisions[side] += 1
+        if elapsed > self.max_decision_seconds[side]:
+            self.max_decision_seconds[side] = elapsed
+
+    def _timed_decision(self, battle, method):
+        @functools.wraps(method)
+        def wrapper(pokemon, *args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return method(pokemon, *args, **kwargs)
+            finally:
+                self._record_decision(battle._side_of(pokemon), time.perf_counter() - started)
+        return wrapper
+
+    def _timed_decision_async(self, battle, method):
+        @functools.wraps(method)
+        async def wrapper(pokemon, provider, *args, **kwargs):
+            if provider is None: # Falls through to the sync chooser, which is timed already
+                return await method(pokemon, provider, *args, **kwargs)
+            started = time.perf_counter()
+            try:
+                return await method(pokemon, provider, *args, **kwargs)
+            finally:
+                self._record_decision(battle._side_of(pokemon), time.perf_counter() - started)
+        return wrapper
+
+    def on_event(self, event: BattleEvent):
+        """EventBus subscriber that keeps the hit/miss/damage counters."""
+        if isinstance(event, DamageDealt):
+            bucket = event.amount - event.amount % DAMAGE_BUCKET
+            self.damage_histogram[bucket] = self.damage_histogram.get(bucket, 0) + 1
+        elif isinstance(event, MoveHit):
+            self.hits += 1
+        elif isinstance(event, MoveMissed):
+            self.misses += 1
+
+    # --- Reporting ---
+
+    def mean_decision_seconds(self, side: int) -> float:
+        return self.decision_seconds[side] / self.decisions[side] if self.decisions[side] else 0.0
+
+    def to_dict(self) -> dict:
+        return {
+            "battles": self.battles,
+            "phase_seconds": dict(self.phase_seconds),
+            "phase_calls": dict(self.phase_calls),
+            "hits": self.hits,
+            "misses": self.misses,
+            "damage_histogram": dict(sorted(self.damage_histogram.items())),
+            "decision_seconds": {"player": self.decision_seconds[PLAYER], "opponent": self.decision_seconds[OPPONENT]},
+            "decisions": {"player": self.decisions[PLAYER], "opponent": self.decisions[OPPONENT]},
+            "max_decision_seconds": {"player": self.max_decision_seconds[PLAYER],
+                                     "opponent": self.max_decision_seconds[OPPONENT]},
+        }
+
+    def summary(self) -> str:
+        """Human-readable multi-line summary."""
+        lines = [f"Battles: {self.battles}"]
+        for phase in PHASES:
+            calls = self.phase_calls[phase]
+            per_call = self.phase_seconds[phase] / calls * 1e6 if calls else 0.0
+            lines.append(f"  {phase:<15} {self.phase_seconds[phase]:9.4f} s  {calls:8d} calls  {per_call:9.2f} us/call")
+        lines.append(f"Hits: {self.hits}  Misses: {self.misses}")
+        for side, label in ((PLAYER, "player"), (OPPONENT, "opponent")):
+            lines.append(f"Decision latency ({label}): mean {self.mean_decision_seconds(side) * 1e3:.3f} ms, "
+                         f"max {self.max_decision_seconds[side] * 1e3:.3f} ms")
+        for bucket, count in sorted(self.damage_histogram.items()):
+            lines.append(f"  damage {bucket:4d}-{bucket + DAMAGE_BUCKET - 1:<4d} {count}")
+        return "\n".join(lines)
+
+
+class ProfileReport:
+    """Results of a profiled() block."""
+
+    def __init__(self):
+        self.cpu: pstats.Stats | None = None
+        self.memory: list[tracemalloc.Statistic] = []
+        self.peak_memory: int = 0
+        self.paths: list[str] = []
+
+
+@contextmanager
+def profiled(output_dir: str | None = None, name: str = "battle", cpu: bool = True, memory: bool = False,
+             top: int = 25):
+    """Profile the enclosed block with cProfile (`cpu`) and/or tracemalloc (`memory`).
+
+    Yields a ProfileReport that is filled in when the block exits. With
+    `output_dir`, the results are also written there: `<name>.prof` (load it
+    with pstats or snakeviz), `<name>.cpu.txt` (top functions by cumulative
+    time) and `<name>.memory.txt` (top allocation sites).
+    """
+    report = ProfileReport()
+    profiler = cProfile.Profile() if cpu else None
+    started_tracing = memory and not tracemalloc.is_tracing()
+    if started_tracing:
+        tracemalloc.start()
+    if memory:
+        tracemalloc.reset_peak()
+    if profiler is not None:
+        profiler.enable()
+    try:
+        yield report
+    finally:
+        if profiler is not None:
+            profiler.disable()
+            report.cpu = pstats.Stats(profiler)
+        if memory:
+            snapshot = tracemalloc.take_snapshot()
+            report.peak_memory = tracemalloc.get_traced_memory()[1]
+            report.memory = snapshot.statistics("lineno")[:top]
+            if started_tracing:
+                tracemalloc.stop()
+        if output_dir is not None:
+            _dump_report(report, output_dir, name, top)
+
+
+def _dump_report(report: ProfileReport, output_dir: str, name: str, top: int):
+    os.makedirs(output_dir, exist_ok=True)
+    if report.cpu is not None:
+        prof_path = os.path.join(output_dir, f"{name}.prof")
+        report.cpu.dump_stats(prof_path)
+        text = io.StringIO()
+        pstats.Stats(prof_path, stream=text).sort_stats("cumulative").print_stats(top)
+        cpu_path = os.path.join(output_dir, f"{name}.cpu.txt")
+        with open(cpu_path, "w", encoding="utf-8") as f:
+            f.write(text.getvalue())
+        report.paths += [prof_path, cpu_path]
+    if report.memory:
+        memory_path = os.path.join(output_dir, f"{name}.memory.txt")
+        with open(memory_path, "w", encoding="utf-8") as f:
+            f.write(f"Peak traced memory: {report.peak_memory} bytes\n")
+            for stat in report.memory:
+                f.write(f"{stat}\n")
+        report.paths.append(memory_path)
@@ -0,0 +1,192 @@
+# game/opponent_ai.py
+
+"""Search-based opponent AI.
+
+SearchOpponent picks the opponent's move with depth-limited expectiminimax
+over the battle's BattleState:
+
+- max nodes: the opponent chooses a move,
+- min nodes: the player answers with whichever of its moves is worst for the
+  opponent (a cautious assumption, since real choices are simultaneous),
+- chance nodes: turn order (speed ties are a coin flip), accuracy, and
+  damage variance discretised into a few equally likely rolls.
+
+Positions are cached in a transposition table keyed on the active
+Pokémon's HP (the part of BattleState.hp the search changes) and remaining
+depth. The table belongs to one matchup, identified by everything the
+search derives from both Pokémon's stats and moves, and is cleared when
+that changes, so it can be reused across battles but never goes stale. Search deepens one turn at a time until it
+reaches `max_depth` or runs out of its node/time budget, and then plays the
+best move from the deepest fully searched depth, so strength can be scaled
+without risking turn latency.
+
+Use it as an opponent chooser: Battle(player, wild, opponent_move_chooser=SearchOpponent()).
+"""
+
+import time
+
+from game.battle import calculate_base_damage, DAMAGE_VARIANCE_MIN, DAMAGE_VARIANCE_MAX
+from game.classes.move import Move
+from game.classes.pokemon import Pokemon
+from game.state import PLAYER, OPPONENT
+
+
+class _BudgetExceeded(Exception):
+    """Raised inside the search when the node or time budget runs out."""
+    pass
+
+
+def damage_outcomes(attacker: Pokemon, defender: Pokemon, move: Move, rolls: int = 4) -> list[tuple[int, float]]:
+    """Discretised (damage, probability) outcomes of one move, misses included as 0 damage."""
+    base = calculate_base_damage(attacker, defender, move)
+    if base <= 0:
+        return [(0, 1.0)]
+    hit_chance = 1.0 if move.accuracy > 100 else move.accuracy / 100
+    outcomes: dict[int, float] = {}
+    width = DAMAGE_VARIANCE_MAX - DAMAGE_VARIANCE_MIN
+    for roll in range(rolls):
+        variance = DAMAGE_VARIANCE_MIN + width * (roll + 0.5) / rolls # Middle of each slice of the band
+        damage = max(1, int(base * variance))
+        outcomes[damage] = outcomes.get(damage, 0.0) + hit_chance / rolls
+    if hit_chance < 1.0:
+        outcomes[0] = 1.0 - hit_chance
+    return sorted(outcomes.items())
+
+
+class SearchOpponent:
+    """Expectiminimax opponent with a transposition table and per-decision budgets."""
+
+    def __init__(self, max_depth: int = 3, node_budget: int | None = 50_000,
+                 time_budget: float | None = None, rolls: int = 3, table_size: int = 200_000):
+        self.max_depth: int = max_depth
+        self.node_budget: int | None = node_budget    # Max nodes expanded per decision (beyond depth 1)
+        self.time_budget: float | None = time_budget  # Max seconds per decision (beyond depth 1)
+        self.rolls: int = rolls
+        self.table_size: int = table_size
+        self.last_stats: dict = {}
+        self._table: dict[tuple, float] = {}
+        self._table_owner: tuple | None = None  # The matchup the cached values belong to
+        self._nodes: int = 0
+        self._deadline: float | None = None
+        self._enforce_budget: bool = False
+
+    def __call__(self, battle) -> Move | None:
+        """Opponent chooser hook for Battle."""
+        return self.choose_move(battle)
+
+    def choose_move(self, battle) -> Move | None:
+        """Search from the battle's current state and return the opponent's move."""
+        state = battle.snapshot()
+        player_poke = battle.combatants[PLAYER][state.active[PLAYER]]
+        opponent_poke = battle.combatants[OPPONENT][state.active[OPPONENT]]
+        if not opponent_poke.moves:
+            return None
+        if len(opponent_poke.moves) == 1 or not player_poke.moves:
+            return opponent_poke.moves[0]
+        self._prepare(player_poke, opponent_poke)
+
+        owner = self._matchup()
+        if owner != self._table_owner or len(self._table) > self.table_size:
+            self._table.clear() # Cached values only hold for this matchup
+            self._table_owner = owner
+
+        started = time.perf_counter()
+        self._nodes = 0
+        self._deadline = started + self.time_budget if self.time_budget is not None else None
+        best_index, depth_reached = 0, 0
+        for depth in range(1, self.max_depth + 1):
+            self._enforce_budget = depth > 1 # Depth 1 always completes so there is a sensible answer
+            try:
+                best_index = self._best_opponent_move(state.active_hp(PLAYER), state.active_hp(OPPONENT), depth)
+            except _BudgetExceeded:
+                break
+            depth_reached = depth
+        self.last_stats = {"depth": depth_reached, "nodes": self._nodes, "table_entries": len(self._table),
+                           "seconds": time.perf_counter() - started}
+        return opponent_poke.moves[best_index]
+
+    # --- Search internals ---
+
+    def _prepare(self, player_poke: Pokemon, opponent_poke: Pokemon):
+        """Precompute per-move damage distributions; stats do not change during a search."""
+        self._player_max = player_poke.max_hp
+        self._opponent_max = opponent_poke.max_hp
+        self._player_outcomes = [damage_outcomes(player_poke, opponent_poke, m, self.rolls) for m in player_poke.moves]
+        self._opponent_outcomes = [damage_outcomes(opponent_poke, player_poke, m, self.rolls) for m in opponent_poke.moves]
+        if player_poke.speed > opponent_poke.speed:
+            self._orders = [(1.0, PLAYER)]
+        elif opponent_poke.speed > player_poke.speed:
+            self._orders = [(1.0, OPPONENT)]
+        else:
+            self._orders = [(0.5, PLAYER), (0.5, OPPONENT)]
+
+    def _matchup(self) -> tuple:
+        """Everything cached values depend on besides the HP pair, as prepared by _prepare()."""
+        return (self._player_max, self._opponent_max, tuple(map(tuple, self._player_outcomes)),
+                tuple(map(tuple, self._opponent_outcomes)), tuple(self._orders))
+
+    def _tick(self):
+        self._nodes += 1
+        if not self._enforce_budget:
+            return
+        if self.node_budget is not None and self._nodes > self.node_budget:
+            raise _BudgetExceeded()
+        if self._deadline is not None and (self._nodes & 63) == 0 and time.perf_counter() > self._deadline:
+            raise _BudgetExceeded()
+
+    def _evaluate(self, player_hp: int, opponent_hp: int) -> float:
+        """Heuristic from the opponent's point of view: HP fraction lead, in [-1, 1]."""
+        return opponent_hp / self._opponent_max - player_hp / self._player_max
+
+    def _best_opponent_move(self, player_hp: int, opponent_hp: int, depth: int) -> int:
+        values = [self._opponent_move_value(player_hp, opponent_hp, index, depth)
+                  for index in range(len(self._opponent_outcomes))]
+        return max(range(len(values)), key=values.__getitem__)
+
+    def _opponent_move_value(self, player_hp: int, opponent_hp: int, opponent_index: int, depth: int) -> float:
+        """Value of an opponent move, assuming the player's most damaging reply."""
+        return min(self._turn_value(player_hp, opponent_hp, opponent_index, player_index, depth)
+                   for player_index in range(len(self._player_outcomes)))
+
+    def _value(self, player_hp: int, opponent_hp: int, depth: int) -> float:
+        """Value of the position at the start of a turn with `depth` turns left to search."""
+        if player_hp <= 0:
+            return 1.0
+        if opponent_hp <= 0:
+            return -1.0
+        if depth == 0:
+            return self._evaluate(player_hp, opponent_hp)
+        # Keyed like BattleState.hp (active slots only), plus the remaining depth
+        key = (player_hp, opponent_hp, depth)
+        cached = self._table.get(key)
+        if cached is not None:
+            return cached
+        self._tick()
+        value = max(self._opponent_move_value(player_hp, opponent_hp, index, depth)
+                    for index in range(len(self._opponent_outcomes)))
+        self._table[key] = value
+        return value
+
+    def _turn_value(self, player_hp: int, opponent_hp: int, opponent_index: int, player_index: int,
+                    depth: int) -> float:
+        """Expected value over turn order, hits and damage rolls of one pair of moves."""
+        self._tick()
+        total = 0.0
+        for order_chance, first in self._orders:
+            if first == OPPONENT:
+                for damage, chance in self._opponent_outcomes[opponent_index]:
+                    hp_after = player_hp - damage
+                    if hp_after <= 0:
+                        total += order_chance * chance * 1.0
+                        continue
+                    for reply, reply_chance in self._player_outcomes[player_index]:
+                        total += order_chance * chance * reply_chance * self._value(hp_after, opponent_hp - reply, depth - 1)
+            else:
+                for damage, chance in self._player_outcomes[player_index]:
+                    hp_after = opponent_hp - damage
+                    if hp_after <= 0:
+                        total += order_chance * chance * -1.0
+                        continue
+                    for reply, reply_chance in self._opponent_outcomes[opponent_index]:
+                        total += order_chance * chance * reply_chance * self._value(player_hp - reply, hp_after, depth - 1)
+        return total
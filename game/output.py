@@ -0,0 +1,152 @@
+# game/output.py
+
+"""Output sinks and pacers used by the battle engine.
+
+A sink receives every line of text the engine would normally print, and a
+pacer handles the small pauses the CLI uses for readability. Swapping these
+out lets the same battle code run at human pace in a terminal or at full
+speed (and silently) for automated evaluation.
+"""
+
+import asyncio
+import sys
+import time
+from typing import TextIO
+
+
+# --- Output sinks ---
+
+class OutputSink:
+    """Base class for anything that receives battle text."""
+
+    draws_status: bool = False # True if the sink shows HP itself, so the battle need not print it each turn
+
+    def write(self, text: str = "", end: str = "\n"):
+        """Write a piece of text followed by `end` (mirrors print())."""
+        raise NotImplementedError
+
+    def flush(self):
+        """Flush any buffered output. No-op by default."""
+        pass
+
+    def frame(self, battle):
+        """Called at each frame boundary (every pause and before prompting) with the Battle.
+
+        Sinks that draw a status screen (see game.render) redraw here. No-op by default.
+        """
+        pass
+
+    def close(self):
+        """Release any resources held by the sink. No-op by default."""
+        pass
+
+
+class StdoutSink(OutputSink):
+    """Writes text to standard output, exactly like print()."""
+
+    def write(self, text: str = "", end: str = "\n"):
+        print(text, end=end)
+
+    def flush(self):
+        sys.stdout.flush()
+
+
+class NullSink(OutputSink):
+    """Discards all output. Used for headless runs."""
+
+    def write(self, text: str = "", end: str = "\n"):
+        pass
+
+
+class BufferedSink(OutputSink):
+    """Collects output in memory as a list of complete lines."""
+
+    def __init__(self):
+        self.lines: list[str] = []
+        self._partial: list[str] = [] # Text written with end="" waiting for a newline
+
+    def write(self, text: str = "", end: str = "\n"):
+        chunk = text + end
+        if "\n" not in chunk:
+            self._partial.append(chunk)
+            return
+        pieces = ("".join(self._partial) + chunk).split("\n")
+        tail = pieces.pop() # Whatever follows the last newline
+        self._partial = [tail] if tail else []
+        self.lines.extend(pieces)
+
+    def getvalue(self) -> str:
+        """Return everything written so far as a single string."""
+        text = "\n".join(self.lines)
+        if self.lines:
+            text += "\n"
+        return text + "".join(self._partial)
+
+    def clear(self):
+        """Forget everything written so far."""
+        self.lines.clear()
+        self._partial.clear()
+
+
+class FileSink(OutputSink):
+    """Writes output to a file path or an already-open text stream."""
+
+    def __init__(self, target: str | TextIO, mode: str = "a", encoding: str = "utf-8"):
+        if isinstance(target, str):
+            self._stream: TextIO = open(target, mode, encoding=encoding)
+            self._owns_stream = True
+        else:
+            self._stream = target
+            self._owns_stream = False
+
+    def write(self, text: str = "", end: str = "\n"):
+        self._stream.write(text + end)
+
+    def flush(self):
+        self._stream.flush()
+
+    def close(self):
+        if self._owns_stream and not self._stream.closed:
+            self._stream.close()
+
+
+# --- Pacers ---
+
+class Pacer:
+    """Base class for controlling the pauses between battle messages."""
+
+    def pause(self, seconds: float):
+        """Wait (or not) for roughly `seconds` seconds."""
+        raise NotImplementedError
+
+    async def pause_async(self, seconds: float):
+        """Async version of pause(); must not block the event loop. Sleeps for `seconds` unless overridden."""
+        await asyncio.sleep(seconds)
+
+
+class SleepPacer(Pacer):
+    """Pauses with a real clock. `scale` speeds up or slows down every pause."""
+
+    def __init__(self, scale: float = 1.0, sleep=time.sleep):
+        self.scale: float = scale
+        self._sleep = sleep # Injectable so tests can use a fake clock
+
+    def pause(self, seconds: float):
+        delay = seconds * self.scale
+        if delay > 0:
+            self._sleep(delay)
+
+    async def pause_async(self, seconds: float):
+        delay = seconds * self.scale
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+class NoPacer(Pacer):
+    """Never pauses. Used for headless runs."""
+
+    def pause(self, seconds: float):
+        pass
+
+    async def pause_async(self, seconds: float):
+        pass
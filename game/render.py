@@ -0,0 +1,121 @@
+# game/render.py
+
+"""Buffered terminal renderer for interactive battles.
+
+TerminalRenderer is an OutputSink that keeps a small screen model: a fixed
+status panel at the top (both Pokémon with HP bars, and the player's move
+menu with PP) above a scrolling log of battle text. Battle text is buffered
+and nothing reaches the terminal until the battle hits a frame boundary
+(OutputSink.frame, called at every pause and before prompting), when the new
+log text and only the panel rows that changed since the last frame are
+written with cursor-addressing escapes in a single write and flush. This
+keeps redraws cheap over slow SSH/tmux links.
+
+On a stream that is not a TTY (pipes, log files, CI) there is no panel and
+the text comes out exactly as StdoutSink would print it, still one write
+per frame.
+"""
+
+import shutil
+import sys
+from typing import TextIO
+
+from game.output import OutputSink
+
+HP_BAR_WIDTH = 20
+_PANEL_ROWS = 4 # Player, opponent, move menu, separator
+
+# VT100 escapes
+_ESC = "\x1b["
+_SAVE_CURSOR = "\x1b7"
+_RESTORE_CURSOR = "\x1b8"
+_CLEAR_SCREEN = _ESC + "2J"
+_CLEAR_LINE = _ESC + "K"
+_RESET_SCROLL_REGION = _ESC + "r"
+
+
+def hp_bar(current_hp: int, max_hp: int, width: int = HP_BAR_WIDTH) -> str:
+    """An ASCII HP bar, e.g. "[#####-----]" (any HP left shows at least one #)."""
+    filled = 0
+    if max_hp > 0 and current_hp > 0:
+        filled = max(1, current_hp * width // max_hp)
+    return "[" + "#" * filled + "-" * (width - filled) + "]"
+
+
+def status_rows(battle) -> list[str]:
+    """The status panel rows for the current state of a Battle."""
+    player_poke, opponent = battle.player_active_pokemon, battle.opponent
+    opponent_label = f"{battle.opponent_trainer.name}'s" if battle.opponent_trainer else "Wild"
+    rows = []
+    for label, pokemon in ((f"{battle.player.name}'s", player_poke), (opponent_label, opponent)):
+        name = f"{label} {pokemon.nickname or pokemon.species_name}"
+        rows.append(f"{name:<24} Lv.{pokemon.level:<3} {hp_bar(pokemon.current_hp, pokemon.max_hp)} "
+                    f"{pokemon.current_hp:>3}/{pokemon.max_hp} HP")
+    # Only maximum PP exists so far (moves do not track uses yet)
+    rows.append("  ".join(f"{i + 1}:{move.name} PP {move.pp}" for i, move in enumerate(player_poke.moves)))
+    rows.append(f"--- Turn {battle.turn_count} ".ljust(40, "-"))
+    return rows
+
+
+class TerminalRenderer(OutputSink):
+    """Draws battles with a diffed status panel on TTYs and plain text elsewhere."""
+
+    def __init__(self, stream: TextIO | None = None, tty: bool | None = None,
+                 size: tuple[int, int] | None = None):
+        """`tty` overrides the stream's isatty() and `size` the (columns, lines) of the terminal."""
+        self._stream: TextIO = stream or sys.stdout
+        self.tty: bool = self._stream.isatty() if tty is None else tty
+        self.draws_status: bool = self.tty # The panel replaces the per-turn HP lines
+        self._size: tuple[int, int] | None = size
+        self._pending: list[str] = [] # Log text written since the last frame
+        self._screen: list[str] | None = None # Panel rows as last drawn; None until the first frame
+        self.frames_written: int = 0
+
+    def write(self, text: str = "", end: str = "\n"):
+        self._pending.append(text + end)
+
+    def _layout(self) -> tuple[int, int]:
+        return self._size or tuple(shutil.get_terminal_size())
+
+    def _compose(self, battle) -> str:
+        """Everything the next frame needs to send, as one string."""
+        log = "".join(self._pending)
+        self._pending.clear()
+        if not self.tty or battle is None or battle.player_active_pokemon is None:
+            return log
+        columns, lines = self._layout()
+        rows = [row[:columns] for row in status_rows(battle)]
+        out = []
+        if self._screen is None:
+            # First frame: clear, confine scrolling to the log region below the panel,
+            # and park the cursor on the last line where the log grows from
+            out += [_CLEAR_SCREEN, f"{_ESC}{_PANEL_ROWS + 1};{lines}r", f"{_ESC}{lines};1H"]
+            self._screen = [""] * _PANEL_ROWS
+        out.append(log)
+        changed = [(i, row) for i, row in enumerate(rows) if row != self._screen[i]]
+        if changed:
+            out.append(_SAVE_CURSOR)
+            for i, row in changed:
+                out.append(f"{_ESC}{i + 1};1H{row}{_CLEAR_LINE}")
+                self._screen[i] = row
+            out.append(_RESTORE_CURSOR)
+        return "".join(out)
+
+    def frame(self, battle):
+        """Send the buffered log and any changed panel rows in one write."""
+        data = self._compose(battle)
+        if data:
+            self._stream.write(data)
+            self._stream.flush()
+            self.frames_written += 1
+
+    def flush(self):
+        self.frame(None) # Log text only; the panel is redrawn on the next real frame
+
+    def close(self):
+        """Flush, and give the terminal its normal scrolling back."""
+        self.flush()
+        if self.tty and self._screen is not None:
+            self._stream.write(_RESET_SCROLL_REGION + f"{_ESC}{self._layout()[1]};1H\n")
+            self._stream.flush()
+            self._screen = None
@@ -0,0 +1,161 @@
+# game/replay.py
+
+"""Compact battle replays and a headless replay engine.
+
+Every Battle owns a seeded random.Random stream, so a battle is fully
+determined by its seed, its starting Pokémon and the move each side picked
+on each turn. A BattleReplay stores exactly that: the seed plus one byte per
+side per turn (the index of the chosen move, or SWITCH_FLAG | team slot for
+a switch), plus the team slot sent out whenever a fainted Pokémon had to be
+replaced. Replaying re-runs the battle headlessly at full speed, which
+reproduces an episode (or stops at a given turn to bisect agent behaviour)
+without keeping full text transcripts.
+"""
+
+import struct
+from array import array
+
+# Header: magic, format version, seed (u64), number of turns (u32)
+_HEADER = struct.Struct("<4sBQI")
+_MAGIC = b"PKRP"
+_VERSION = 2 # 2 added switches and forced replacements
+_COUNT = struct.Struct("<I")
+MAX_SEED = 2**64 - 1
+SWITCH_FLAG = 0x80 # Set in a turn's action byte when the side switched instead of moving
+
+
+class ReplayMismatchError(Exception):
+    """Raised when a replay cannot be applied to the given Pokémon."""
+    pass
+
+
+class BattleReplay:
+    """Seed plus the action chosen by each side on every turn."""
+
+    def __init__(self, seed: int, moves: array | None = None, replacements: array | None = None):
+        if not 0 <= seed <= MAX_SEED:
+            raise ValueError(f"Replay seeds must fit in 64 bits, got {seed}.")
+        self.seed: int = seed
+        # Flat byte array: player move index, opponent move index, player, opponent, ...
+        self.moves: array = moves if moves is not None else array("B")
+        # Flat (turn, side, slot) triples, one per forced replacement
+        self.replacements: array = replacements if replacements is not None else array("I")
+
+    def record_turn(self, player_move_index: int, opponent_move_index: int):
+        """Append the move indices chosen on one turn."""
+        self.moves.append(player_move_index)
+        self.moves.append(opponent_move_index)
+
+    def record_replacement(self, turn_number: int, side: int, slot: int):
+        """Record the team slot `side` sent out after a faint at the end of `turn_number`."""
+        self.replacements.extend((turn_number, side, slot))
+
+    def replacement(self, turn_number: int, side: int) -> int | None:
+        """The slot `side` sent out after `turn_number`, or None if it did not have to replace."""
+        entries = self.replacements
+        for i in range(0, len(entries), 3):
+            if entries[i] == turn_number and entries[i + 1] == side:
+                return entries[i + 2]
+        return None
+
+    def truncate(self, turn_count: int):
+        """Forget everything recorded after `turn_count` turns (used when a turn is undone)."""
+        del self.moves[turn_count * 2:]
+        entries = self.replacements
+        while entries and entries[-3] > turn_count:
+            del entries[-3:]
+
+    @property
+    def turn_count(self) -> int:
+        return len(self.moves) // 2
+
+    def turn(self, turn_number: int) -> tuple[int, int]:
+        """Return (player move index, opponent move index) for a 1-based turn number."""
+        offset = (turn_number - 1) * 2
+        return self.moves[offset], self.moves[offset + 1]
+
+    def to_bytes(self) -> bytes:
+        """Serialize to the compact binary form (17-byte header, 2 bytes per turn, then the replacements).
+
+        All multi-byte fields are little-endian, so replays move between machines.
+        """
+        entries = self.replacements
+        # Packed explicitly as little-endian u32s: array's native layout differs between machines
+        return (_HEADER.pack(_MAGIC, _VERSION, self.seed, self.turn_count) + self.moves.tobytes()
+                + _COUNT.pack(len(entries) // 3) + struct.pack(f"<{len(entries)}I", *entries))
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "BattleReplay":
+        """Parse the output of to_bytes()."""
+        magic, version, seed, turns = _HEADER.unpack_from(data)
+        if magic != _MAGIC:
+            raise ValueError("Not a battle replay.")
+        if version not in (1, _VERSION):
+            raise ValueError(f"Unsupported replay version {version}.")
+        offset = _HEADER.size + turns * 2
+        moves = array("B", data[_HEADER.size:offset])
+        if len(moves) != turns * 2:
+            raise ValueError("Truncated battle replay.")
+        replacements = array("I")
+        if version >= 2: # Version 1 replays are 1v1 only, so have none
+            try:
+                (count,) = _COUNT.unpack_from(data, offset)
+            except struct.error:
+                raise ValueError("Truncated battle replay.") from None
+            try:
+                replacements.extend(struct.unpack_from(f"<{count * 3}I", data, offset + _COUNT.size))
+            except struct.error:
+                raise ValueError("Truncated battle replay.") from None
+        return cls(seed, moves, replacements)
+
+    def __eq__(self, other) -> bool:
+        return (isinstance(other, BattleReplay) and self.seed == other.seed and self.moves == other.moves
+                and self.replacements == other.replacements)
+
+    def __repr__(self) -> str:
+        return f"BattleReplay(seed={self.seed}, turns={self.turn_count})"
+
+
+def move_from_replay(replay: BattleReplay, pokemon, turn_number: int, side: int):
+    """The action `side` took on `turn_number`: a Move of `pokemon`, a Switch, or None past the end."""
+    if turn_number > replay.turn_count:
+        return None # Recording ended here (e.g. the player cancelled)
+    index = replay.turn(turn_number)[side]
+    if index & SWITCH_FLAG:
+        from game.battle import Switch
+        return Switch(index & ~SWITCH_FLAG)
+    if index >= len(pokemon.moves):
+        raise ReplayMismatchError(
+            f"Turn {turn_number} uses move #{index}, but {pokemon.nickname or pokemon.species_name} "
+            f"only has {len(pokemon.moves)} moves.")
+    return pokemon.moves[index]
+
+
+def _replacement_from_replay(replay: BattleReplay, battle, side: int) -> int:
+    slot = replay.replacement(battle.turn_count, side)
+    if slot is None:
+        raise ReplayMismatchError(f"Turn {battle.turn_count} needs a replacement the replay did not record.")
+    return slot
+
+
+def replay_battle(replay: BattleReplay, player, opponent_pokemon, stop_after_turn: int | None = None, **battle_kwargs):
+    """Re-run a recorded battle headlessly and return the finished Battle.
+
+    `player` and `opponent_pokemon` (a wild Pokemon or a trainer's Player)
+    must be in the same state as when the battle was recorded (they are
+    modified, exactly like a live battle).
+    With `stop_after_turn` the battle is fast-forwarded only that far, which
+    is useful for bisecting where an agent's behaviour diverged.
+    Extra keyword arguments are passed on to Battle (e.g. output=BufferedSink()).
+    """
+    from game.battle import Battle # Imported here: game.battle imports this module
+
+    battle_kwargs.setdefault("headless", True)
+    battle = Battle(player, opponent_pokemon, seed=replay.seed,
+                    player_move_chooser=lambda b: move_from_replay(replay, b.player_active_pokemon, b.turn_count, 0),
+                    opponent_move_chooser=lambda b: move_from_replay(replay, b.opponent, b.turn_count, 1),
+                    player_switch_chooser=lambda b: _replacement_from_replay(replay, b, 0),
+                    opponent_switch_chooser=lambda b: _replacement_from_replay(replay, b, 1),
+                    max_turns=stop_after_turn, **battle_kwargs)
+    battle.run_battle()
+    return battle
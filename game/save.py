@@ -0,0 +1,387 @@
+# game/save.py
+
+"""Saving and loading players in a compact, versioned binary format.
+
+A save holds the player's name, team order and one record per Pokémon.
+SaveManager keeps a directory with a full snapshot plus numbered delta
+files: each autosave writes only the Pokémon whose record changed since the
+previous save, and every file is written atomically (temp file + rename), so
+a crash mid-save never leaves a corrupt checkpoint behind. Deltas are folded
+back into a fresh snapshot every `compact_every` saves.
+
+export_json() produces a human-readable dump for debugging.
+"""
+
+import glob
+import json
+import os
+import struct
+import uuid
+
+from game.classes.move import Move, SharedMove
+from game.classes.player import Player
+from game.classes.pokemon import Pokemon
+from game.experience import CURVES, ExperienceCurve, flat_curve
+
+SAVE_VERSION = 2 # 2 added experience curves; version 1 files are still read
+_MAGIC = b"PKSV"
+_FILE_HEADER = struct.Struct("<4sHBI")  # magic, version, kind, sequence number
+_KIND_SNAPSHOT = 0
+_KIND_DELTA = 1
+
+# uuid, species id, level, xp, xp per level, max hp, current hp, attack, defense, speed, flags
+_POKEMON_FIXED = struct.Struct("<16siHIIHHHHHB")
+_MOVE_FIXED = struct.Struct("<BHHH")  # category, power, accuracy, pp
+_U8 = struct.Struct("<B")
+_U16 = struct.Struct("<H")
+_U32 = struct.Struct("<I")
+_HAS_NICKNAME = 1
+_HAS_STATUS = 2
+_HAS_CURVE = 4
+_CATEGORIES = ["Physical", "Special", "Status"]
+
+SNAPSHOT_FILE = "snapshot.sav"
+DELTA_PATTERN = "delta-{:08d}.sav"
+
+
+class SaveError(Exception):
+    """Raised when save data is missing, corrupt or from an unsupported version."""
+    pass
+
+
+# --- Low-level encoding ---
+
+def _pack_str(text: str) -> bytes:
+    encoded = text.encode("utf-8")
+    return _U16.pack(len(encoded)) + encoded
+
+
+def _unpack_str(data: bytes, offset: int) -> tuple[str, int]:
+    (length,) = _U16.unpack_from(data, offset)
+    offset += _U16.size
+    return data[offset:offset + length].decode("utf-8"), offset + length
+
+
+def _curve_name(curve: ExperienceCurve) -> str:
+    """Name a curve is saved under; only curves that can be looked up again on load are allowed."""
+    if CURVES.get(curve.name) is curve:
+        return curve.name
+    prefix, _, amount = curve.name.partition("-")
+    if prefix == "flat" and amount.isdigit() and flat_curve(int(amount)) is curve:
+        return curve.name
+    raise SaveError(f"Cannot save experience curve {curve.name!r}: add it to game.experience.CURVES first.")
+
+
+def _curve_from_name(name: str) -> ExperienceCurve:
+    if name in CURVES:
+        return CURVES[name]
+    prefix, _, amount = name.partition("-")
+    if prefix == "flat" and amount.isdigit():
+        return flat_curve(int(amount))
+    raise SaveError(f"Save uses unknown experience curve {name!r}.")
+
+
+def encode_pokemon(pokemon: Pokemon) -> bytes:
+    """Encode one Pokemon (stats, XP, HP, status, experience curve and moves) as a binary record."""
+    flags = (_HAS_NICKNAME if pokemon.nickname is not None else 0) | (_HAS_STATUS if pokemon.status is not None else 0)
+    if pokemon.curve is not None:
+        flags |= _HAS_CURVE
+    species_id = pokemon.species_id if pokemon.species_id is not None else -1
+    parts = [_POKEMON_FIXED.pack(pokemon.id.bytes, species_id, pokemon.level, pokemon.xp, pokemon.xp_per_level,
+                                 pokemon.max_hp, max(0, pokemon.current_hp), pokemon.attack, pokemon.defense,
+                                 pokemon.speed, flags),
+             _pack_str(pokemon.species_name)]
+    if pokemon.nickname is not None:
+        parts.append(_pack_str(pokemon.nickname))
+    if pokemon.status is not None:
+        parts.append(_pack_str(pokemon.status))
+    if pokemon.curve is not None:
+        parts.append(_pack_str(_curve_name(pokemon.curve)))
+    parts.append(_U8.pack(len(pokemon.types)))
+    parts.extend(_pack_str(name) for name in pokemon.types)
+    parts.append(_U8.pack(len(pokemon.moves)))
+    for move in pokemon.moves:
+        parts.append(_pack_str(move.name))
+        parts.append(_pack_str(move.type))
+        parts.append(_MOVE_FIXED.pack(_CATEGORIES.index(move.category), move.power, move.accuracy, move.pp))
+    return b"".join(parts)
+
+
+def decode_pokemon(data: bytes, offset: int = 0, move_cache: dict | None = None) -> tuple[Pokemon, int]:
+    """Decode a record written by encode_pokemon; return (pokemon, offset after the record).
+
+    Identical moves are shared (as read-only SharedMoves) through `move_cache` when one is passed.
+    """
+    (raw_id, species_id, level, xp, xp_per_level, max_hp, current_hp, attack, defense, speed,
+     flags) = _POKEMON_FIXED.unpack_from(data, offset)
+    offset += _POKEMON_FIXED.size
+    species_name, offset = _unpack_str(data, offset)
+    nickname = status = curve = None
+    if flags & _HAS_NICKNAME:
+        nickname, offset = _unpack_str(data, offset)
+    if flags & _HAS_STATUS:
+        status, offset = _unpack_str(data, offset)
+    if flags & _HAS_CURVE:
+        curve_name, offset = _unpack_str(data, offset)
+        curve = _curve_from_name(curve_name)
+    types = []
+    type_count = data[offset]
+    offset += 1
+    for _ in range(type_count):
+        name, offset = _unpack_str(data, offset)
+        types.append(name)
+    moves = []
+    move_count = data[offset]
+    offset += 1
+    for _ in range(move_count):
+        name, offset = _unpack_str(data, offset)
+        move_type, offset = _unpack_str(data, offset)
+        category, power, accuracy, pp = _MOVE_FIXED.unpack_from(data, offset)
+        offset += _MOVE_FIXED.size
+        key = (name, move_type, category, power, accuracy, pp)
+        move = move_cache.get(key) if move_cache is not None else None
+        if move is None:
+            move_class = SharedMove if move_cache is not None else Move # Shared moves are read-only
+            move = move_class(name=name, type=move_type, category=_CATEGORIES[category], power=power,
+                              accuracy=accuracy, pp=pp)
+            if move_cache is not None:
+                move_cache[key] = move
+        moves.append(move)
+
+    pokemon = Pokemon(species_name=species_name, types=types, level=level, max_hp=max_hp,
+                      attack=attack, defense=defense, speed=speed)
+    pokemon.id = uuid.UUID(bytes=raw_id)
+    pokemon.species_id = species_id if species_id >= 0 else None
+    pokemon.nickname = nickname
+    pokemon.status = status
+    pokemon.xp = xp
+    pokemon.xp_per_level = xp_per_level
+    pokemon.curve = curve
+    pokemon.current_hp = current_hp
+    pokemon.moves = moves
+    return pokemon, offset
+
+
+def _encode_file(kind: int, sequence: int, name: str, team_ids: list[bytes], records: list[bytes]) -> bytes:
+    parts = [_FILE_HEADER.pack(_MAGIC, SAVE_VERSION, kind, sequence), _pack_str(name),
+             _U8.pack(len(team_ids)), *team_ids, _U32.pack(len(records))]
+    for record in records:
+        parts.append(_U32.pack(len(record)))
+        parts.append(record)
+    return b"".join(parts)
+
+
+def _decode_file(data: bytes) -> tuple[int, int, str, list[bytes], list[bytes]]:
+    """Split a save file into (kind, sequence, player name, team ids, pokemon records)."""
+    try:
+        magic, version, kind, sequence = _FILE_HEADER.unpack_from(data)
+        if magic != _MAGIC:
+            raise SaveError("Not a save file.")
+        if version not in (1, SAVE_VERSION): # Version 1 records never set the curve flag
+            raise SaveError(f"Unsupported save version {version} (expected {SAVE_VERSION}).")
+        offset = _FILE_HEADER.size
+        name, offset = _unpack_str(data, offset)
+        team_size = data[offset]
+        offset += 1
+        team_ids = [data[offset + i * 16:offset + (i + 1) * 16] for i in range(team_size)]
+        offset += team_size * 16
+        (record_count,) = _U32.unpack_from(data, offset)
+        offset += _U32.size
+        records = []
+        for _ in range(record_count):
+            (length,) = _U32.unpack_from(data, offset)
+            offset += _U32.size
+            records.append(data[offset:offset + length])
+            offset += length
+        if offset != len(data):
+            raise SaveError("Save file has trailing or missing data.")
+    except (struct.error, IndexError, UnicodeDecodeError) as e:
+        raise SaveError(f"Corrupt save file: {e}") from e
+    return kind, sequence, name, team_ids, records
+
+
+def _build_player(name: str, team_ids: list[bytes], pokemon_by_id: dict[bytes, Pokemon]) -> Player:
+    player = Player(name)
+    try:
+        player.team.extend(pokemon_by_id[raw_id] for raw_id in team_ids) # Direct extend skips add_pokemon's printing
+    except KeyError as e:
+        raise SaveError("Save data references a Pokemon that was never written.") from e
+    return player
+
+
+def atomic_write(path: str, data: bytes):
+    """Write `data` to `path` so readers only ever see the old or the new file."""
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    with open(temp_path, "wb") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temp_path, path)
+
+
+# --- Whole-player helpers ---
+
+def dump_player(player: Player) -> bytes:
+    """Serialize a Player to a standalone binary save."""
+    return _encode_file(_KIND_SNAPSHOT, 0, player.name, [p.id.bytes for p in player.team],
+                        [encode_pokemon(p) for p in player.team])
+
+
+def load_player(data: bytes) -> Player:
+    """Rebuild a Player from dump_player() output."""
+    kind, _, name, team_ids, records = _decode_file(data)
+    if kind != _KIND_SNAPSHOT:
+        raise SaveError("Expected a full save, got a delta.")
+    move_cache = {}
+    pokemon_by_id = {}
+    for record in records:
+        pokemon, _ = decode_pokemon(record, move_cache=move_cache)
+        pokemon_by_id[pokemon.id.bytes] = pokemon
+    return _build_player(name, team_ids, pokemon_by_id)
+
+
+def save_player(path: str, player: Player):
+    """Atomically write a full binary save to `path`."""
+    atomic_write(path, dump_player(player))
+
+
+def load_player_file(path: str) -> Player:
+    """Load a Player from a file written by save_player()."""
+    with open(path, "rb") as f:
+        return load_player(f.read())
+
+
+def pokemon_to_dict(pokemon: Pokemon) -> dict:
+    """Plain-dict view of a Pokemon (used for JSON export)."""
+    return {
+        "id": str(pokemon.id),
+        "species_id": pokemon.species_id,
+        "species_name": pokemon.species_name,
+        "nickname": pokemon.nickname,
+        "types": list(pokemon.types),
+        "level": pokemon.level,
+        "xp": pokemon.xp,
+        "curve": pokemon.curve.name if pokemon.curve is not None else None,
+        "max_hp": pokemon.max_hp,
+        "current_hp": pokemon.current_hp,
+        "attack": pokemon.attack,
+        "defense": pokemon.defense,
+        "speed": pokemon.speed,
+        "status": pokemon.status,
+        "moves": [{"name": m.name, "type": m.type, "category": m.category, "power": m.power,
+                   "accuracy": m.accuracy, "pp": m.pp} for m in pokemon.moves],
+    }
+
+
+def export_json(player: Player, indent: int | None = 2) -> str:
+    """Human-readable JSON dump of a Player, for debugging (not loadable)."""
+    return json.dumps({"version": SAVE_VERSION, "name": player.name,
+                       "team": [pokemon_to_dict(p) for p in player.team]}, indent=indent, ensure_ascii=False)
+
+
+# --- Incremental autosaves ---
+
+class SaveManager:
+    """Autosaves a Player into a directory as a snapshot plus incremental deltas."""
+
+    def __init__(self, directory: str, compact_every: int = 50):
+        self.directory: str = directory
+        self.compact_every: int = compact_every
+        self._sequence: int = 0             # Sequence number of the last file written
+        self._deltas_since_snapshot: int = 0
+        self._has_snapshot: bool = False
+        self._last_name: str | None = None
+        self._last_team: list[bytes] = []
+        self._last_records: dict[bytes, bytes] = {} # Pokemon id -> record as last written
+        os.makedirs(directory, exist_ok=True)
+        self._sequence = self._latest_sequence_on_disk() # Never reuse numbers of files already there
+
+    def _path(self, filename: str) -> str:
+        return os.path.join(self.directory, filename)
+
+    def _delta_paths(self) -> list[tuple[int, str]]:
+        paths = []
+        for path in glob.glob(self._path("delta-*.sav")):
+            try:
+                paths.append((int(os.path.basename(path)[6:14]), path))
+            except ValueError:
+                continue
+        return sorted(paths)
+
+    def _latest_sequence_on_disk(self) -> int:
+        latest = max((sequence for sequence, _ in self._delta_paths()), default=0)
+        try:
+            with open(self._path(SNAPSHOT_FILE), "rb") as f:
+                latest = max(latest, _FILE_HEADER.unpack(f.read(_FILE_HEADER.size))[3])
+        except (OSError, struct.error):
+            pass
+        return latest
+
+    def save(self, player: Player, force_snapshot: bool = False) -> str | None:
+        """Checkpoint `player`; returns the file written, or None if nothing changed."""
+        team_ids = [p.id.bytes for p in player.team]
+        records = {p.id.bytes: encode_pokemon(p) for p in player.team}
+
+        if force_snapshot or not self._has_snapshot or self._deltas_since_snapshot >= self.compact_every:
+            path = self._write_snapshot(player.name, team_ids, records)
+        else:
+            changed = [record for raw_id, record in records.items() if self._last_records.get(raw_id) != record]
+            if not changed and team_ids == self._last_team and player.name == self._last_name:
+                return None
+            self._sequence += 1
+            path = self._path(DELTA_PATTERN.format(self._sequence))
+            atomic_write(path, _encode_file(_KIND_DELTA, self._sequence, player.name, team_ids, changed))
+            self._deltas_since_snapshot += 1
+
+        self._last_name = player.name
+        self._last_team = team_ids
+        self._last_records = records
+        return path
+
+    def _write_snapshot(self, name: str, team_ids: list[bytes], records: dict[bytes, bytes]) -> str:
+        self._sequence += 1
+        path = self._path(SNAPSHOT_FILE)
+        atomic_write(path, _encode_file(_KIND_SNAPSHOT, self._sequence, name, team_ids, list(records.values())))
+        # Older deltas are now folded into the snapshot; a crash before this
+        # cleanup is harmless because load() ignores deltas older than the snapshot.
+        for _, delta_path in self._delta_paths():
+            os.remove(delta_path)
+        self._has_snapshot = True
+        self._deltas_since_snapshot = 0
+        return path
+
+    def load(self) -> Player:
+        """Load the latest checkpoint (snapshot plus any newer deltas)."""
+        snapshot_path = self._path(SNAPSHOT_FILE)
+        if not os.path.exists(snapshot_path):
+            raise SaveError(f"No save found in {self.directory}.")
+        with open(snapshot_path, "rb") as f:
+            _, sequence, name, team_ids, records = _decode_file(f.read())
+        move_cache = {}
+        pokemon_by_id = {}
+        latest_records = {}
+        for record in records:
+            pokemon, _ = decode_pokemon(record, move_cache=move_cache)
+            pokemon_by_id[pokemon.id.bytes] = pokemon
+            latest_records[pokemon.id.bytes] = record
+        deltas = 0
+        for delta_sequence, delta_path in self._delta_paths():
+            if delta_sequence <= sequence:
+                continue # Already part of the snapshot
+            with open(delta_path, "rb") as f:
+                _, sequence, name, team_ids, records = _decode_file(f.read())
+            for record in records:
+                pokemon, _ = decode_pokemon(record, move_cache=move_cache)
+                pokemon_by_id[pokemon.id.bytes] = pokemon
+                latest_records[pokemon.id.bytes] = record
+            deltas += 1
+
+        player = _build_player(name, team_ids, pokemon_by_id)
+        # Continue the sequence from where the files left off
+        self._sequence = sequence
+        self._has_snapshot = True
+        self._deltas_since_snapshot = deltas
+        self._last_name = name
+        self._last_team = team_ids
+        self._last_records = {raw_id: latest_records[raw_id] for raw_id in team_ids}
+        return player
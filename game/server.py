@@ -0,0 +1,528 @@
+# game/server.py
+
+"""Long-lived game server hosting many sessions behind a JSON line protocol.
+
+Starting an interpreter and importing the game for every short episode costs
+more than the episode itself. `python -m game.server` starts once and then
+serves requests over stdin/stdout or a Unix socket (`--socket PATH`). Each
+request is one JSON object per line, each response is one JSON line:
+
+    {"op": "new_session", "player": "Ash", "team": [{"species": "Pikachu", "level": 50}]}
+    {"op": "start_battle", "session": "...", "zone": "route", "seed": 7}
+    {"op": "act", "session": "...", "move": 0}        (or "switch": <team slot>)
+        optional "replace": <team slot> to send in if the active Pokemon faints
+    {"op": "state", "session": "..."}
+    {"op": "end_session", "session": "..."}
+    {"op": "ping"}, {"op": "stats"}, {"op": "shutdown"}
+
+Responses carry "ok" plus either the result or an "error" message.
+
+A session is a Player plus its current Battle. At most `max_resident`
+sessions stay in memory; the least recently used ones (and any idle for
+longer than `idle_seconds`) are written to `directory` and read back the
+next time they are used. An ongoing battle is stored as its starting teams
+plus its replay, and rehydrated by re-applying the recorded turns, which
+reproduces it exactly because battles are fully determined by their seed.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import re
+import struct
+import sys
+import time
+import uuid
+from collections import OrderedDict
+from typing import Callable
+
+from game.battle import Battle, Switch
+from game.classes.move import Move
+from game.classes.player import Player
+from game.classes.pokemon import Pokemon
+from game.dex import Dex, get_default_dex
+from game.encounters import EncounterGenerator
+from game.output import BufferedSink
+from game.replay import MAX_SEED, BattleReplay, ReplayMismatchError, move_from_replay
+from game.save import SaveError, dump_player, load_player, atomic_write
+from game.state import PLAYER, OPPONENT
+
+SESSION_VERSION = 1
+_SESSION_MAGIC = b"PKSV"
+_SESSION_HEADER = struct.Struct("<4sHB") # magic, version, flags
+_U32 = struct.Struct("<I")
+_IN_BATTLE = 1
+_WILD = 2
+_SESSION_ID = re.compile(r"[A-Za-z0-9_-]{1,64}")
+
+SESSION_PATTERN = "session-{}.pks"
+DEFAULT_MAX_TURNS = 200
+
+
+class ProtocolError(Exception):
+    """A request that cannot be served; reported back to the client as an error response."""
+    pass
+
+
+class Session:
+    """One client's Player and the battle it is in (if any)."""
+
+    def __init__(self, session_id: str, player: Player):
+        self.id: str = session_id
+        self.player: Player = player
+        self.battle: Battle | None = None
+        self.output: BufferedSink = BufferedSink()
+        # Starting teams of the current battle, to rebuild it from its replay
+        self.start_player: bytes | None = None
+        self.start_opponent: bytes | None = None
+        self.wild: bool = True
+        self.last_used: float = time.monotonic()
+
+
+class GameServer:
+    """Serves protocol requests for many sessions, keeping only the recently used ones in memory.
+
+    `opponent_move_chooser` is the opponent policy for every battle (e.g. a
+    game.opponent_ai.SearchOpponent); by default opponents use their first move.
+    """
+
+    def __init__(self, directory: str, max_resident: int = 256, idle_seconds: float | None = None,
+                 dex: Dex | None = None, opponent_move_chooser: Callable[[Battle], Move | None] | None = None,
+                 max_turns: int = DEFAULT_MAX_TURNS):
+        self.directory: str = directory
+        self.max_resident: int = max_resident
+        self.idle_seconds: float | None = idle_seconds
+        self.dex: Dex = dex or get_default_dex()
+        self.encounters: EncounterGenerator = EncounterGenerator(self.dex)
+        self.opponent_move_chooser = opponent_move_chooser
+        self.max_turns: int = max_turns
+        self.closed: bool = False
+        self._resident: OrderedDict[str, Session] = OrderedDict() # Least recently used first
+        self.counters: dict[str, int] = {"requests": 0, "sessions_created": 0, "evictions": 0, "rehydrations": 0}
+        self._ops: dict[str, Callable[[dict], dict]] = {
+            "ping": self._op_ping, "stats": self._op_stats, "shutdown": self._op_shutdown,
+            "new_session": self._op_new_session, "end_session": self._op_end_session,
+            "start_battle": self._op_start_battle, "act": self._op_act, "state": self._op_state,
+        }
+        os.makedirs(directory, exist_ok=True)
+
+    # --- Requests ---
+
+    def handle_line(self, line: str) -> str:
+        """Serve one protocol line and return the response line (without the newline)."""
+        try:
+            request = json.loads(line)
+        except json.JSONDecodeError as e:
+            return json.dumps({"ok": False, "error": f"Invalid JSON: {e.msg}"})
+        return json.dumps(self.handle(request), ensure_ascii=False)
+
+    def handle(self, request: dict) -> dict:
+        """Serve one decoded request. Errors are returned as {"ok": false, "error": ...}."""
+        self.counters["requests"] += 1
+        if self.idle_seconds is not None:
+            self.evict_idle()
+        try:
+            if not isinstance(request, dict):
+                raise ProtocolError("A request must be a JSON object.")
+            op = self._ops.get(request.get("op"))
+            if op is None:
+                raise ProtocolError(f"Unknown op {request.get('op')!r}.")
+            response = op(request)
+        except (ProtocolError, SaveError) as e:
+            response = {"ok": False, "error": str(e)}
+        except Exception as e: # A bug in one request must not take down a long-lived server
+            response = {"ok": False, "error": f"Internal error: {type(e).__name__}: {e}"}
+        if isinstance(request, dict) and "id" in request:
+            response["id"] = request["id"] # Echoed so clients can match pipelined requests
+        return response
+
+    def _op_ping(self, request: dict) -> dict:
+        return {"ok": True}
+
+    def _op_stats(self, request: dict) -> dict:
+        return {"ok": True, "resident": len(self._resident), **self.counters}
+
+    def _op_shutdown(self, request: dict) -> dict:
+        self.close()
+        return {"ok": True}
+
+    def _op_new_session(self, request: dict) -> dict:
+        session_id = request.get("session") or uuid.uuid4().hex
+        self._check_session_id(session_id)
+        if session_id in self._resident or os.path.exists(self._path(session_id)):
+            raise ProtocolError(f"Session {session_id} already exists.")
+        player = Player(str(request.get("player", "Player")))
+        team = request.get("team") or [{"species": "Pikachu", "level": 5}]
+        if not isinstance(team, list) or len(team) > 6:
+            raise ProtocolError("'team' must be a list of at most 6 Pokemon.")
+        player.team.extend(self._create_pokemon(spec) for spec in team) # Direct extend skips add_pokemon's printing
+        session = Session(session_id, player)
+        self._admit(session)
+        self.counters["sessions_created"] += 1
+        return {"ok": True, "session": session_id, **self._describe(session)}
+
+    def _op_end_session(self, request: dict) -> dict:
+        session_id = request.get("session")
+        self._check_session_id(session_id)
+        found = self._resident.pop(session_id, None) is not None
+        path = self._path(session_id)
+        if os.path.exists(path):
+            os.remove(path)
+            found = True
+        if not found:
+            raise ProtocolError(f"No session {session_id}.")
+        return {"ok": True}
+
+    def _op_start_battle(self, request: dict) -> dict:
+        session = self.session(request.get("session"))
+        if session.battle is not None:
+            raise ProtocolError("The session is already in a battle.")
+        if not session.player.has_usable_pokemon():
+            raise ProtocolError("The player has no Pokemon that can battle.")
+        if request.get("seed") is None:
+            seed = random.getrandbits(64)
+        else:
+            seed = self._int_field(request, "seed")
+            if not 0 <= seed <= MAX_SEED:
+                raise ProtocolError(f"'seed' must be between 0 and {MAX_SEED}.")
+        if "opponent" in request:
+            specs = request["opponent"]
+            if not isinstance(specs, list) or not 1 <= len(specs) <= 6:
+                raise ProtocolError("'opponent' must be a list of 1 to 6 Pokemon.")
+            opponent = Player(str(request.get("trainer", "Rival")))
+            opponent.team.extend(self._create_pokemon(spec) for spec in specs)
+            wild = len(specs) == 1 and "trainer" not in request
+        else:
+            zone = request.get("zone", "route")
+            try:
+                species_id, level = self.encounters.table(zone).sample(random.Random(seed))
+            except KeyError as e:
+                raise ProtocolError(str(e.args[0])) from None
+            opponent = Player("Wild")
+            opponent.team.append(self.dex.create_pokemon(species_id, level=level))
+            wild = True
+        session.start_player = dump_player(session.player)
+        session.start_opponent = dump_player(opponent)
+        session.wild = wild
+        session.battle = self._new_battle(session, session.player, opponent, seed)
+        return {"ok": True, **self._describe(session)}
+
+    def _op_act(self, request: dict) -> dict:
+        session = self.session(request.get("session"))
+        battle = session.battle
+        if battle is None:
+            raise ProtocolError("The session is not in a battle.")
+        if "switch" in request:
+            action = Switch(self._int_field(request, "switch"))
+        else:
+            index = self._int_field(request, "move")
+            moves = battle.player_active_pokemon.moves
+            if not 0 <= index < len(moves):
+                raise ProtocolError(f"Move {index} does not exist (the Pokemon has {len(moves)} moves).")
+            action = moves[index]
+        if "replace" in request:
+            replace = self._int_field(request, "replace")
+            team = session.player.team
+            # A slot that cannot go in when the time comes falls back to the first usable Pokemon
+            battle.player_switch_chooser = lambda b: (replace if 0 <= replace < len(team) and team.is_alive(replace)
+                                                      else team.first_alive())
+        opponent_action = battle._get_opponent_move_choice()
+        if opponent_action is None:
+            raise ProtocolError("The opponent could not choose a move.")
+        try:
+            battle.apply_turn(action, opponent_action)
+        except ValueError as e: # e.g. switching to a fainted Pokemon
+            raise ProtocolError(str(e)) from None
+        finally:
+            battle.player_switch_chooser = None
+        response = {"ok": True, **self._describe(session)}
+        if battle.is_over or battle.turn_count >= self.max_turns:
+            response["result"] = self._finish_battle(session)
+        return response
+
+    def _op_state(self, request: dict) -> dict:
+        return {"ok": True, **self._describe(self.session(request.get("session")))}
+
+    # --- Sessions ---
+
+    def session(self, session_id: str) -> Session:
+        """The session with this ID, read back from disk if it was evicted."""
+        self._check_session_id(session_id)
+        session = self._resident.get(session_id)
+        if session is not None:
+            self._resident.move_to_end(session_id)
+        else:
+            session = self._load(session_id)
+            self._admit(session)
+            self.counters["rehydrations"] += 1
+        session.last_used = time.monotonic()
+        return session
+
+    def evict(self, session_id: str):
+        """Write a resident session to disk and drop it from memory."""
+        session = self._resident[session_id]
+        atomic_write(self._path(session_id), self._encode(session))
+        del self._resident[session_id] # Only once it is safely on disk
+        self.counters["evictions"] += 1
+
+    def evict_idle(self, now: float | None = None):
+        """Evict every session that has not been used for `idle_seconds`."""
+        if self.idle_seconds is None:
+            return
+        cutoff = (now if now is not None else time.monotonic()) - self.idle_seconds
+        while self._resident:
+            session_id, session = next(iter(self._resident.items())) # Least recently used
+            if session.last_used > cutoff:
+                break
+            self.evict(session_id)
+
+    @property
+    def resident_sessions(self) -> list[str]:
+        return list(self._resident)
+
+    def close(self):
+        """Write every resident session to disk, so a restarted server can pick them up."""
+        while self._resident:
+            self.evict(next(iter(self._resident)))
+        self.closed = True
+
+    # --- Internals ---
+
+    def _path(self, session_id: str) -> str:
+        return os.path.join(self.directory, SESSION_PATTERN.format(session_id))
+
+    @staticmethod
+    def _check_session_id(session_id):
+        if not isinstance(session_id, str) or not _SESSION_ID.fullmatch(session_id):
+            raise ProtocolError(f"Invalid session ID {session_id!r}.")
+
+    @staticmethod
+    def _int_field(request: dict, name: str) -> int:
+        value = request.get(name)
+        if not isinstance(value, int) or isinstance(value, bool):
+            raise ProtocolError(f"'{name}' must be an integer.")
+        return value
+
+    def _create_pokemon(self, spec: dict) -> Pokemon:
+        if not isinstance(spec, dict) or "species" not in spec:
+            raise ProtocolError("Each Pokemon needs at least a 'species'.")
+        level = spec.get("level", 5)
+        if not isinstance(level, int) or isinstance(level, bool) or not 1 <= level <= 100:
+            raise ProtocolError(f"Bad level {level!r}.")
+        nickname = spec.get("nickname")
+        if nickname is not None and not isinstance(nickname, str):
+            raise ProtocolError(f"Bad nickname {nickname!r} (must be a string).")
+        try:
+            return self.dex.create_pokemon(spec["species"], level=level, nickname=nickname)
+        except KeyError:
+            raise ProtocolError(f"Unknown species {spec['species']!r}.") from None
+
+    def _admit(self, session: Session):
+        # Make room first, so a failed eviction leaves the pool as it was
+        while self._resident and len(self._resident) >= self.max_resident:
+            self.evict(next(iter(self._resident)))
+        self._resident[session.id] = session
+
+    def _new_battle(self, session: Session, player: Player, opponent: Player, seed: int, **choosers) -> Battle:
+        session.output.clear()
+        return Battle(player, opponent.team[0] if session.wild else opponent, output=session.output,
+                      headless=True, seed=seed, opponent_move_chooser=self.opponent_move_chooser, **choosers)
+
+    def _finish_battle(self, session: Session) -> dict:
+        """Wrap up a finished battle: award XP for a win and leave battle mode."""
+        battle = session.battle
+        winner = battle.state.winner if battle.is_over else None
+        result = {"winner": {PLAYER: "player", OPPONENT: "opponent"}.get(winner), "turns": battle.turn_count}
+        if winner == PLAYER:
+            xp = 50 * battle.opponent.level // 7 # Same award as the CLI
+            battle.player_active_pokemon.gain_xp(xp, battle.rng, verbose=False)
+            result["xp"] = xp
+        session.battle = None
+        session.start_player = session.start_opponent = None
+        return result
+
+    def _describe(self, session: Session) -> dict:
+        """Client view of a session; includes the battle text produced since the last response."""
+        description = {"player": session.player.name, "team": [_pokemon_view(p) for p in session.player.team]}
+        battle = session.battle
+        if battle is not None:
+            description["battle"] = {
+                "turn": battle.turn_count,
+                "over": battle.is_over,
+                "active": battle.state.active[PLAYER],
+                "moves": [move.name for move in battle.player_active_pokemon.moves],
+                "opponent": _pokemon_view(battle.opponent),
+                "opponent_remaining": battle.alive_count(OPPONENT),
+            }
+        description["log"] = session.output.lines[:]
+        session.output.clear()
+        return description
+
+    # --- Disk format ---
+
+    def _encode(self, session: Session) -> bytes:
+        in_battle = session.battle is not None
+        flags = (_IN_BATTLE if in_battle else 0) | (_WILD if session.wild else 0)
+        # During a battle the starting teams plus the replay stand in for the current state
+        sections = ([session.start_player, session.start_opponent, session.battle.replay.to_bytes()] if in_battle
+                    else [dump_player(session.player)])
+        encoded_id = session.id.encode("ascii")
+        parts = [_SESSION_HEADER.pack(_SESSION_MAGIC, SESSION_VERSION, flags), bytes([len(encoded_id)]), encoded_id]
+        for section in sections:
+            parts.append(_U32.pack(len(section)))
+            parts.append(section)
+        return b"".join(parts)
+
+    def _load(self, session_id: str) -> Session:
+        try:
+            with open(self._path(session_id), "rb") as f:
+                data = f.read()
+        except FileNotFoundError:
+            raise ProtocolError(f"No session {session_id}.") from None
+        try:
+            magic, version, flags = _SESSION_HEADER.unpack_from(data)
+            if magic != _SESSION_MAGIC or version != SESSION_VERSION:
+                raise SaveError("Not a session file, or an unsupported version.")
+            offset = _SESSION_HEADER.size
+            id_length = data[offset]
+            if data[offset + 1:offset + 1 + id_length].decode("ascii") != session_id:
+                raise SaveError(f"Session file for {session_id} holds another session.")
+            offset += 1 + id_length
+            sections = []
+            while offset < len(data):
+                (length,) = _U32.unpack_from(data, offset)
+                offset += _U32.size
+                if offset + length > len(data):
+                    raise SaveError(f"Session file {session_id} is truncated.")
+                sections.append(data[offset:offset + length])
+                offset += length
+            if len(sections) != (3 if flags & _IN_BATTLE else 1):
+                raise SaveError(f"Session file {session_id} has {len(sections)} sections.")
+        except (struct.error, IndexError, UnicodeDecodeError) as e:
+            raise SaveError(f"Corrupt session file {session_id}: {e}") from e
+
+        if not flags & _IN_BATTLE:
+            return Session(session_id, load_player(sections[0]))
+        start_player, start_opponent, replay_bytes = sections
+        player = load_player(start_player)
+        session = Session(session_id, player)
+        session.start_player, session.start_opponent = start_player, start_opponent
+        session.wild = bool(flags & _WILD)
+        try:
+            replay = BattleReplay.from_bytes(replay_bytes)
+            # Replacements come from the replay while catching up, then revert to the defaults
+            battle = self._new_battle(session, player, load_player(start_opponent), replay.seed,
+                                      player_switch_chooser=lambda b: replay.replacement(b.turn_count, PLAYER),
+                                      opponent_switch_chooser=lambda b: replay.replacement(b.turn_count, OPPONENT))
+            for turn in range(1, replay.turn_count + 1):
+                battle.apply_turn(move_from_replay(replay, battle.player_active_pokemon, turn, PLAYER),
+                                  move_from_replay(replay, battle.opponent, turn, OPPONENT))
+        except (ValueError, ReplayMismatchError) as e: # Also covers a replay that no longer fits the teams
+            raise SaveError(f"Corrupt session file {session_id}: {e}") from e
+        battle.player_switch_chooser = battle.opponent_switch_chooser = None
+        session.battle = battle
+        session.output.clear() # The client already saw this text
+        return session
+
+
+def _pokemon_view(pokemon: Pokemon) -> dict:
+    return {"name": pokemon.nickname or pokemon.species_name, "species": pokemon.species_name,
+            "level": pokemon.level, "hp": pokemon.current_hp, "max_hp": pokemon.max_hp}
+
+
+# --- Transports ---
+
+def serve_stdio(server: GameServer, stdin=None, stdout=None):
+    """Serve requests from stdin, one response line per request, until EOF or shutdown."""
+    stdin = stdin or sys.stdin
+    stdout = stdout or sys.stdout
+    try:
+        for line in stdin:
+            if not line.strip():
+                continue
+            stdout.write(server.handle_line(line) + "\n")
+            stdout.flush()
+            if server.closed:
+                break
+    finally:
+        if not server.closed:
+            server.close()
+
+
+async def serve_unix(server: GameServer, path: str, ready: asyncio.Event | None = None):
+    """Serve requests on a Unix socket at `path` until a client sends shutdown.
+
+    Every connection may pipeline any number of requests; all connections
+    share the one GameServer, and requests are handled one at a time on the
+    event loop, so no locking is needed.
+    """
+    stop = asyncio.Event()
+
+    async def handle_connection(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while not stop.is_set():
+                line = await reader.readline()
+                if not line:
+                    break
+                if not line.strip():
+                    continue
+                writer.write(server.handle_line(line.decode("utf-8", "replace")).encode("utf-8") + b"\n")
+                await writer.drain()
+                if server.closed:
+                    stop.set()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def sweep_idle():
+        while True:
+            await asyncio.sleep(server.idle_seconds / 2)
+            server.evict_idle()
+
+    if os.path.exists(path):
+        os.remove(path) # Left over from a previous run
+    unix_server = await asyncio.start_unix_server(handle_connection, path=path)
+    sweeper = asyncio.create_task(sweep_idle()) if server.idle_seconds else None
+    try:
+        async with unix_server:
+            if ready is not None:
+                ready.set()
+            await stop.wait()
+    finally:
+        if sweeper is not None:
+            sweeper.cancel()
+        if not server.closed:
+            server.close()
+        if os.path.exists(path):
+            os.remove(path)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m game.server", description="Persistent game server")
+    parser.add_argument("--socket", help="Listen on this Unix socket path (default: stdin/stdout)")
+    parser.add_argument("--directory", default=".sessions", help="Where evicted sessions are stored")
+    parser.add_argument("--max-resident", type=int, default=256, help="Sessions kept in memory")
+    parser.add_argument("--idle-seconds", type=float, help="Evict sessions idle for this long")
+    parser.add_argument("--max-turns", type=int, default=DEFAULT_MAX_TURNS, help="Turn limit per battle")
+    parser.add_argument("--search-depth", type=int, default=0,
+                        help="Opponent search depth (0: opponents use their first move)")
+    args = parser.parse_args(argv)
+
+    chooser = None
+    if args.search_depth > 0:
+        from game.opponent_ai import SearchOpponent
+        chooser = SearchOpponent(max_depth=args.search_depth)
+    server = GameServer(args.directory, max_resident=args.max_resident, idle_seconds=args.idle_seconds,
+                        opponent_move_chooser=chooser, max_turns=args.max_turns)
+    if args.socket:
+        asyncio.run(serve_unix(server, args.socket))
+    else:
+        serve_stdio(server)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,139 @@
+# game/simulator.py
+
+"""Vectorized Monte Carlo simulator for estimating 1v1 matchup win rates.
+
+Runs many independent battles at once as NumPy arrays instead of looping over
+Battle objects. Each simulated battle follows the same rules as
+Battle.run_battle: the faster Pokémon moves first (speed ties are a coin flip),
+each move rolls accuracy and then damage variance, and the battle ends as soon
+as one side faints. Both sides always use a single fixed move, like the
+headless Battle default and the simple opponent AI.
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+
+from game.battle import calculate_base_damage, DAMAGE_VARIANCE_MIN, DAMAGE_VARIANCE_MAX
+from game.classes.move import Move
+from game.classes.pokemon import Pokemon
+
+# Outcome codes stored in MatchupResult.winners
+WIN_A = 0
+WIN_B = 1
+DRAW = -1
+
+
+@dataclass
+class MatchupResult:
+    """Outcome of a batch of simulated battles between side A and side B."""
+    winners: np.ndarray # One of WIN_A / WIN_B / DRAW per battle
+    turns: np.ndarray   # Number of turns each battle lasted
+
+    @property
+    def n_battles(self) -> int:
+        return len(self.winners)
+
+    @property
+    def wins_a(self) -> int:
+        return int(np.count_nonzero(self.winners == WIN_A))
+
+    @property
+    def wins_b(self) -> int:
+        return int(np.count_nonzero(self.winners == WIN_B))
+
+    @property
+    def draws(self) -> int:
+        return int(np.count_nonzero(self.winners == DRAW))
+
+    @property
+    def win_rate_a(self) -> float:
+        return self.wins_a / self.n_battles if self.n_battles else 0.0
+
+    @property
+    def win_rate_b(self) -> float:
+        return self.wins_b / self.n_battles if self.n_battles else 0.0
+
+    def turn_histogram(self) -> dict[int, int]:
+        """Return {turn count: number of battles that lasted that long}."""
+        counts = np.bincount(self.turns)
+        return {turn: int(count) for turn, count in enumerate(counts) if count}
+
+
+def _pick_move(pokemon: Pokemon, move: Move | int | None) -> Move:
+    """Resolve a move argument (Move, index into pokemon.moves, or None for the first move)."""
+    if isinstance(move, Move):
+        return move
+    if not pokemon.moves:
+        raise ValueError(f"{pokemon.nickname or pokemon.species_name} has no moves to simulate with.")
+    return pokemon.moves[move or 0]
+
+
+def _roll_damage(rng: np.random.Generator, base_damage: float, accuracy: int, n: int) -> np.ndarray:
+    """Draw n damage values for one move: accuracy check, then variance."""
+    if base_damage <= 0:
+        return np.zeros(n, dtype=np.int64) # No direct damage, hit or miss
+    variance = rng.uniform(DAMAGE_VARIANCE_MIN, DAMAGE_VARIANCE_MAX, n)
+    damage = np.maximum(1, (base_damage * variance).astype(np.int64))
+    if accuracy <= 100:
+        hits = rng.integers(1, 101, n) <= accuracy
+        damage *= hits
+    return damage
+
+
+def simulate_matchup(pokemon_a: Pokemon, pokemon_b: Pokemon, n_battles: int,
+                     move_a: Move | int | None = None, move_b: Move | int | None = None,
+                     max_turns: int = 500, seed: int | np.random.Generator | None = None) -> MatchupResult:
+    """Simulate n_battles independent battles between pokemon_a and pokemon_b.
+
+    Both Pokémon start every battle from their current HP and are not modified.
+    Battles still running after max_turns (e.g. two Status moves) count as draws.
+    """
+    rng = seed if isinstance(seed, np.random.Generator) else np.random.default_rng(seed)
+    move_a = _pick_move(pokemon_a, move_a)
+    move_b = _pick_move(pokemon_b, move_b)
+    base_a = calculate_base_damage(pokemon_a, pokemon_b, move_a) # A attacking B
+    base_b = calculate_base_damage(pokemon_b, pokemon_a, move_b) # B attacking A
+
+    hp_a = np.full(n_battles, pokemon_a.current_hp, dtype=np.int64)
+    hp_b = np.full(n_battles, pokemon_b.current_hp, dtype=np.int64)
+    turns = np.zeros(n_battles, dtype=np.int64)
+    winners = np.full(n_battles, DRAW, dtype=np.int8)
+    winners[(hp_a <= 0) & (hp_b > 0)] = WIN_B
+    winners[(hp_b <= 0) & (hp_a > 0)] = WIN_A
+    active = np.flatnonzero((hp_a > 0) & (hp_b > 0)) # Indices of battles still running
+
+    for turn in range(1, max_turns + 1):
+        if active.size == 0:
+            break
+        m = active.size
+        turns[active] = turn
+
+        # Turn order: True where A moves first this turn
+        if pokemon_a.speed > pokemon_b.speed:
+            a_first = np.ones(m, dtype=bool)
+        elif pokemon_b.speed > pokemon_a.speed:
+            a_first = np.zeros(m, dtype=bool)
+        else:
+            a_first = rng.random(m) < 0.5 # Speed tie
+
+        dmg_a = _roll_damage(rng, base_a, move_a.accuracy, m)
+        dmg_b = _roll_damage(rng, base_b, move_b.accuracy, m)
+        cur_a = hp_a[active]
+        cur_b = hp_b[active]
+
+        # The first attacker always acts; the second only if it survived
+        cur_b = np.where(a_first, cur_b - dmg_a, cur_b)
+        cur_a = np.where(~a_first, cur_a - dmg_b, cur_a)
+        cur_a = np.where(a_first & (cur_b > 0), cur_a - dmg_b, cur_a)
+        cur_b = np.where(~a_first & (cur_a > 0), cur_b - dmg_a, cur_b)
+
+        hp_a[active] = np.maximum(cur_a, 0)
+        hp_b[active] = np.maximum(cur_b, 0)
+        a_fainted = cur_a <= 0
+        b_fainted = cur_b <= 0
+        winners[active[b_fainted]] = WIN_A
+        winners[active[a_fainted]] = WIN_B
+        active = active[~(a_fainted | b_fainted)]
+
+    return MatchupResult(winners=winners, turns=turns)
@@ -0,0 +1,106 @@
+# game/state.py
+
+"""Immutable battle state snapshots.
+
+BattleState holds everything that changes during a battle (HP of every
+Pokémon on both sides, which one is active, the turn counter) as plain
+tuples. Updating it returns a new state that shares every untouched tuple
+with the old one, so "cloning" a state is free (states are never mutated,
+so the same object can be handed out) and undoing a turn is just going back
+to the previous object. Search-based agents can fork thousands of states per
+decision without copying Pokemon, Player or Move objects.
+
+The static side of a battle (species, stats, moves) stays on the Pokemon
+objects; Battle writes HP changes through to them so the rest of the game
+keeps seeing up-to-date `current_hp` values.
+"""
+
+PLAYER = 0
+OPPONENT = 1
+
+
+class BattleState:
+    """Snapshot of the dynamic part of a battle. Never mutated after creation."""
+
+    __slots__ = ("hp", "active", "turn_count", "_hash")
+
+    def __init__(self, hp: tuple[tuple[int, ...], tuple[int, ...]], active: tuple[int, int] = (0, 0),
+                 turn_count: int = 0):
+        self.hp: tuple[tuple[int, ...], tuple[int, ...]] = hp # Per side, per team slot
+        self.active: tuple[int, int] = active                 # Team slot in battle for each side
+        self.turn_count: int = turn_count
+        self._hash: int | None = None
+
+    @classmethod
+    def from_teams(cls, player_team: list, opponent_team: list, active: tuple[int, int] = (0, 0)) -> "BattleState":
+        """Build the starting state from the Pokemon on each side."""
+        return cls((tuple(max(0, p.current_hp) for p in player_team),
+                    tuple(max(0, p.current_hp) for p in opponent_team)), active)
+
+    # --- Queries ---
+
+    def active_hp(self, side: int) -> int:
+        return self.hp[side][self.active[side]]
+
+    def is_fainted(self, side: int) -> bool:
+        """Whether the active Pokémon on `side` has fainted."""
+        return self.hp[side][self.active[side]] <= 0
+
+    def alive_count(self, side: int) -> int:
+        return sum(1 for hp in self.hp[side] if hp > 0)
+
+    @property
+    def is_over(self) -> bool:
+        """A side loses when its active Pokémon faints and it has nothing left to send out."""
+        return self.alive_count(PLAYER) == 0 or self.alive_count(OPPONENT) == 0
+
+    @property
+    def winner(self) -> int | None:
+        """PLAYER or OPPONENT once the battle is over, otherwise None."""
+        if self.alive_count(OPPONENT) == 0:
+            return PLAYER
+        if self.alive_count(PLAYER) == 0:
+            return OPPONENT
+        return None
+
+    # --- Transitions (each returns a new state) ---
+
+    def clone(self) -> "BattleState":
+        """States are immutable, so a clone is the state itself."""
+        return self
+
+    def with_hp(self, side: int, slot: int, hp: int) -> "BattleState":
+        """Return a copy with one Pokémon's HP replaced (clamped at 0)."""
+        side_hp = self.hp[side]
+        new_side = side_hp[:slot] + (max(0, hp),) + side_hp[slot + 1:]
+        hp_pair = (new_side, self.hp[OPPONENT]) if side == PLAYER else (self.hp[PLAYER], new_side)
+        return BattleState(hp_pair, self.active, self.turn_count)
+
+    def damage(self, side: int, amount: int) -> "BattleState":
+        """Return a copy where the active Pokémon on `side` took `amount` damage."""
+        slot = self.active[side]
+        return self.with_hp(side, slot, self.hp[side][slot] - amount)
+
+    def with_active(self, side: int, slot: int) -> "BattleState":
+        """Return a copy with a different active Pokémon on `side`."""
+        active = (slot, self.active[OPPONENT]) if side == PLAYER else (self.active[PLAYER], slot)
+        return BattleState(self.hp, active, self.turn_count)
+
+    def next_turn(self) -> "BattleState":
+        return BattleState(self.hp, self.active, self.turn_count + 1)
+
+    # --- Hashing (for transposition tables and deduplication) ---
+
+    def key(self) -> tuple:
+        return (self.hp, self.active, self.turn_count)
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, BattleState) and self.key() == other.key()
+
+    def __hash__(self) -> int:
+        if self._hash is None:
+            self._hash = hash(self.key())
+        return self._hash
+
+    def __repr__(self) -> str:
+        return f"BattleState(hp={self.hp}, active={self.active}, turn={self.turn_count})"
@@ -0,0 +1,313 @@
+# game/storage.py
+
+"""PC box storage for large Pokémon collections.
+
+PCStorage keeps Pokémon in numbered boxes of `box_size` slots on disk (one
+file per box, records in the game.save binary format) and only holds a
+small LRU cache of decoded boxes in memory. Queries never touch the boxes:
+a columnar index (species, level and type key per slot, packed in `array`s)
+plus per-species, per-type and per-ID lookup tables answer them, and only
+the Pokémon actually fetched are paged in. The lookup tables are ordinary
+sets and dicts rebuilt from the columns on load; they take more memory than
+the columns, but far less than the decoded Pokémon would.
+
+Pokémon returned by get() live in the box cache; after changing one, call
+update() so the index and the box file pick up the change. Box files and
+the index are written atomically, like saves.
+"""
+
+import heapq
+import os
+import struct
+import uuid
+from array import array
+from collections import OrderedDict
+
+from game.classes.pokemon import Pokemon
+from game.save import SaveError, decode_pokemon, encode_pokemon, atomic_write
+from game.types import MAX_TYPES, TYPES
+
+STORAGE_VERSION = 1
+_BOX_MAGIC = b"PKBX"
+_INDEX_MAGIC = b"PKPC"
+_BOX_HEADER = struct.Struct("<4sHII")    # magic, version, box number, slot count
+_INDEX_HEADER = struct.Struct("<4sHII")  # magic, version, box size, slot count
+_U16 = struct.Struct("<H")
+_U32 = struct.Struct("<I")
+_EMPTY = -1 # Species column value of an empty slot
+_NO_ID = bytes(16)
+
+INDEX_FILE = "index.pci"
+BOX_PATTERN = "box-{:05d}.pcb"
+
+
+class PCStorage:
+    """Indexed, lazily paged Pokémon storage in `directory`."""
+
+    def __init__(self, directory: str, box_size: int = 30, cache_boxes: int = 4):
+        self.directory: str = directory
+        self.box_size: int = box_size
+        self.cache_boxes: int = cache_boxes
+        # Columnar index, one entry per slot
+        self._species = array("i")   # Index into _species_names, or _EMPTY
+        self._levels = array("H")
+        self._type_keys = array("H")
+        self._ids: list[bytes] = []  # Raw UUID bytes per slot (_NO_ID when empty)
+        # Lookup tables built from the columns
+        self._species_names: list[str] = []
+        self._species_codes: dict[str, int] = {}
+        self._by_species: dict[int, set[int]] = {}
+        self._by_type: dict[int, set[int]] = {}
+        self._by_id: dict[bytes, int] = {}
+        self._free: list[int] = [] # Heap of empty slots below len(_species)
+        # Decoded boxes: box number -> slot list, least recently used first
+        self._cache: OrderedDict[int, list[Pokemon | None]] = OrderedDict()
+        self._dirty_boxes: set[int] = set()
+        self._index_dirty: bool = False
+        self._move_cache: dict = {}
+        os.makedirs(directory, exist_ok=True)
+        self._load_index()
+
+    # --- Queries (index only) ---
+
+    def __len__(self) -> int:
+        return len(self._by_id)
+
+    def __contains__(self, pokemon_id: uuid.UUID) -> bool:
+        return pokemon_id.bytes in self._by_id
+
+    def slot_of(self, pokemon_id: uuid.UUID) -> int | None:
+        """Slot holding the Pokémon with this ID, or None."""
+        return self._by_id.get(pokemon_id.bytes)
+
+    def find(self, species: str | None = None, type_name: str | None = None,
+             min_level: int | None = None, max_level: int | None = None) -> list[int]:
+        """Slots matching every given filter, in slot order. Use get() to load the Pokémon."""
+        candidates: set[int] | None = None
+        if species is not None:
+            code = self._species_codes.get(species)
+            candidates = set(self._by_species.get(code, ())) if code is not None else set()
+        if type_name is not None:
+            type_slots = self._by_type.get(TYPES.type_id(type_name), set()) if type_name in TYPES.names else set()
+            candidates = set(type_slots) if candidates is None else candidates & type_slots
+        if candidates is None:
+            candidates = self._by_id.values()
+        levels = self._levels
+        low = min_level if min_level is not None else 0
+        high = max_level if max_level is not None else 0xFFFF
+        return sorted(slot for slot in candidates if low <= levels[slot] <= high)
+
+    def species_counts(self) -> dict[str, int]:
+        return {self._species_names[code]: len(slots) for code, slots in self._by_species.items() if slots}
+
+    # --- Access (pages boxes in) ---
+
+    def get(self, slot: int) -> Pokemon | None:
+        """The Pokémon in `slot` (None if empty)."""
+        if not 0 <= slot < len(self._species) or self._species[slot] == _EMPTY:
+            return None
+        box, position = divmod(slot, self.box_size)
+        return self._box(box)[position]
+
+    def get_by_id(self, pokemon_id: uuid.UUID) -> Pokemon | None:
+        slot = self.slot_of(pokemon_id)
+        return self.get(slot) if slot is not None else None
+
+    def iter_pokemon(self, slots: list[int]):
+        """Yield the Pokémon in `slots`, loading each box once when slots are sorted."""
+        for slot in slots:
+            pokemon = self.get(slot)
+            if pokemon is not None:
+                yield pokemon
+
+    # --- Changes ---
+
+    def deposit(self, pokemon: Pokemon) -> int:
+        """Store `pokemon` in the first free slot and return the slot."""
+        raw_id = pokemon.id.bytes
+        if raw_id in self._by_id:
+            raise ValueError(f"{pokemon.nickname or pokemon.species_name} is already in the PC.")
+        if self._free:
+            slot = heapq.heappop(self._free)
+        else:
+            slot = len(self._species)
+            self._species.append(_EMPTY)
+            self._levels.append(0)
+            self._type_keys.append(0)
+            self._ids.append(_NO_ID)
+        box, position = divmod(slot, self.box_size)
+        self._box(box)[position] = pokemon
+        self._index_slot(slot, pokemon)
+        self._dirty_boxes.add(box)
+        return slot
+
+    def withdraw(self, slot: int) -> Pokemon:
+        """Remove and return the Pokémon in `slot`."""
+        pokemon = self.get(slot)
+        if pokemon is None:
+            raise KeyError(f"PC slot {slot} is empty.")
+        box, position = divmod(slot, self.box_size)
+        self._box(box)[position] = None
+        self._unindex_slot(slot)
+        heapq.heappush(self._free, slot)
+        self._dirty_boxes.add(box)
+        return pokemon
+
+    def update(self, pokemon: Pokemon):
+        """Record changes made to a stored Pokémon (level, species, types...)."""
+        slot = self.slot_of(pokemon.id)
+        if slot is None:
+            raise KeyError(f"{pokemon.nickname or pokemon.species_name} is not in the PC.")
+        box, position = divmod(slot, self.box_size)
+        self._box(box)[position] = pokemon
+        self._unindex_slot(slot)
+        self._index_slot(slot, pokemon)
+        self._dirty_boxes.add(box)
+
+    # --- Persistence ---
+
+    def flush(self):
+        """Write changed boxes and the index to disk."""
+        for box in sorted(self._dirty_boxes):
+            self._write_box(box, self._cache[box])
+        self._dirty_boxes.clear()
+        if self._index_dirty:
+            self._write_index()
+
+    def close(self):
+        self.flush()
+        self._cache.clear()
+
+    def __enter__(self) -> "PCStorage":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    # --- Internals ---
+
+    def _path(self, filename: str) -> str:
+        return os.path.join(self.directory, filename)
+
+    def _species_code(self, name: str) -> int:
+        code = self._species_codes.get(name)
+        if code is None:
+            code = self._species_codes[name] = len(self._species_names)
+            self._species_names.append(name)
+        return code
+
+    def _index_slot(self, slot: int, pokemon: Pokemon):
+        code = self._species_code(pokemon.species_name)
+        self._species[slot] = code
+        self._levels[slot] = pokemon.level
+        self._type_keys[slot] = pokemon.type_key
+        self._ids[slot] = pokemon.id.bytes
+        self._add_lookups(slot)
+        self._index_dirty = True
+
+    def _add_lookups(self, slot: int):
+        self._by_species.setdefault(self._species[slot], set()).add(slot)
+        for type_id in set(divmod(self._type_keys[slot], MAX_TYPES)):
+            self._by_type.setdefault(type_id, set()).add(slot)
+        self._by_id[self._ids[slot]] = slot
+
+    def _unindex_slot(self, slot: int):
+        self._by_species[self._species[slot]].discard(slot)
+        for type_id in set(divmod(self._type_keys[slot], MAX_TYPES)):
+            self._by_type[type_id].discard(slot)
+        del self._by_id[self._ids[slot]]
+        self._species[slot] = _EMPTY
+        self._ids[slot] = _NO_ID
+        self._index_dirty = True
+
+    def _box(self, box: int) -> list[Pokemon | None]:
+        """Decoded contents of `box`, paging it in (and evicting the oldest box) if needed."""
+        slots = self._cache.get(box)
+        if slots is not None:
+            self._cache.move_to_end(box)
+            return slots
+        slots = self._read_box(box)
+        self._cache[box] = slots
+        while len(self._cache) > self.cache_boxes:
+            old_box, old_slots = self._cache.popitem(last=False)
+            if old_box in self._dirty_boxes:
+                self._write_box(old_box, old_slots)
+                self._dirty_boxes.discard(old_box)
+        return slots
+
+    def _read_box(self, box: int) -> list[Pokemon | None]:
+        slots: list[Pokemon | None] = [None] * self.box_size
+        try:
+            with open(self._path(BOX_PATTERN.format(box)), "rb") as f:
+                data = f.read()
+        except FileNotFoundError:
+            return slots # Never written: empty
+        try:
+            magic, version, number, count = _BOX_HEADER.unpack_from(data)
+            if magic != _BOX_MAGIC or version != STORAGE_VERSION or number != box or count != self.box_size:
+                raise SaveError(f"Box file {box} does not match this PC.")
+            offset = _BOX_HEADER.size
+            for position in range(count):
+                (length,) = _U32.unpack_from(data, offset)
+                offset += _U32.size
+                if length:
+                    slots[position], _ = decode_pokemon(data[offset:offset + length], move_cache=self._move_cache)
+                    offset += length
+        except struct.error as e:
+            raise SaveError(f"Corrupt box file {box}: {e}") from e
+        return slots
+
+    def _write_box(self, box: int, slots: list[Pokemon | None]):
+        parts = [_BOX_HEADER.pack(_BOX_MAGIC, STORAGE_VERSION, box, self.box_size)]
+        for pokemon in slots:
+            record = encode_pokemon(pokemon) if pokemon is not None else b""
+            parts.append(_U32.pack(len(record)))
+            parts.append(record)
+        atomic_write(self._path(BOX_PATTERN.format(box)), b"".join(parts))
+
+    def _write_index(self):
+        parts = [_INDEX_HEADER.pack(_INDEX_MAGIC, STORAGE_VERSION, self.box_size, len(self._species)),
+                 _U32.pack(len(self._species_names))]
+        for name in self._species_names:
+            encoded = name.encode("utf-8")
+            parts.append(_U16.pack(len(encoded)) + encoded)
+        for column in (self._species, self._levels, self._type_keys):
+            parts.append(struct.pack(f"<{len(column)}{column.typecode}", *column)) # Little-endian like the header
+        parts.append(b"".join(self._ids))
+        atomic_write(self._path(INDEX_FILE), b"".join(parts))
+        self._index_dirty = False
+
+    def _load_index(self):
+        try:
+            with open(self._path(INDEX_FILE), "rb") as f:
+                data = f.read()
+        except FileNotFoundError:
+            return
+        try:
+            magic, version, box_size, count = _INDEX_HEADER.unpack_from(data)
+            if magic != _INDEX_MAGIC or version != STORAGE_VERSION:
+                raise SaveError("Not a PC index file, or an unsupported version.")
+            self.box_size = box_size # The boxes on disk decide the layout
+            offset = _INDEX_HEADER.size
+            (name_count,) = _U32.unpack_from(data, offset)
+            offset += _U32.size
+            for _ in range(name_count):
+                (length,) = _U16.unpack_from(data, offset)
+                offset += _U16.size
+                self._species_code(data[offset:offset + length].decode("utf-8"))
+                offset += length
+            for column in (self._species, self._levels, self._type_keys):
+                layout = struct.Struct(f"<{count}{column.typecode}")
+                column.extend(layout.unpack_from(data, offset))
+                offset += layout.size
+            self._ids = [data[offset + i * 16:offset + (i + 1) * 16] for i in range(count)]
+            if offset + count * 16 != len(data):
+                raise SaveError("PC index has trailing or missing data.")
+        except (struct.error, UnicodeDecodeError, ValueError) as e:
+            raise SaveError(f"Corrupt PC index: {e}") from e
+        for slot in range(count):
+            if self._species[slot] == _EMPTY:
+                self._free.append(slot)
+            else:
+                self._add_lookups(slot)
+        heapq.heapify(self._free)
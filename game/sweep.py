@@ -0,0 +1,331 @@
+# game/sweep.py
+
+"""Balance-tuning parameter sweeps with an on-disk result cache.
+
+A sweep takes a subject Pokémon, a set of opponents and a list of points, each
+point overriding some of the tuned fields: `max_hp`, `attack`, `defense`,
+`speed`, and `power`/`accuracy` of the first move (the one the simulator
+uses). Fields prefixed with "opponent." tune every opponent instead of the
+subject. Points come from grid_points() (every combination of some values) or
+random_points() (uniform integer draws from ranges).
+
+Each (point, opponent) configuration is simulated with the vectorized
+simulator on a concurrent.futures process pool. Results are cached as small
+JSON files keyed by a SHA-256 hash of everything that determines them (both
+Pokémon after overrides, battle count, turn limit and seed), so re-running or
+extending a sweep only simulates configurations it has not seen before.
+SweepResult.surface() turns the rows into a win-rate surface over two fields.
+"""
+
+import argparse
+import hashlib
+import itertools
+import json
+import os
+import random
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
+from typing import Iterator
+
+import numpy as np
+
+from game.classes.move import Move
+from game.classes.pokemon import Pokemon
+from game.save import atomic_write
+from game.simulator import simulate_matchup
+from game.tournament import build_pokemon, chunked, pokemon_spec
+
+POKEMON_FIELDS = ("max_hp", "attack", "defense", "speed")
+MOVE_FIELDS = ("power", "accuracy")
+FIELDS = POKEMON_FIELDS + MOVE_FIELDS
+OPPONENT_PREFIX = "opponent."
+_CACHE_VERSION = 1 # Bump when the simulator's rules change so old results are not reused
+
+# Positions of the tuned fields in a tournament.pokemon_spec tuple and its move tuples
+_SPEC_INDEX = {"max_hp": 4, "attack": 6, "defense": 7, "speed": 8}
+_MOVE_INDEX = {"power": 3, "accuracy": 4}
+
+
+def _parse_field(name: str) -> tuple[bool, str]:
+    """Split a field name into (applies to opponents, bare field); raise ValueError if unknown."""
+    opponent = name.startswith(OPPONENT_PREFIX)
+    field = name[len(OPPONENT_PREFIX):] if opponent else name
+    if field not in FIELDS:
+        raise ValueError(f"Unknown sweep field {name!r} (expected one of {', '.join(FIELDS)}, "
+                         f"optionally prefixed with {OPPONENT_PREFIX!r}).")
+    return opponent, field
+
+
+def grid_points(axes: dict[str, list[int]]) -> list[dict[str, int]]:
+    """Every combination of the given values, e.g. {"attack": [40, 50], "speed": [60, 90]}."""
+    for name in axes:
+        _parse_field(name)
+    names = list(axes)
+    return [dict(zip(names, values)) for values in itertools.product(*(axes[name] for name in names))]
+
+
+def random_points(ranges: dict[str, tuple[int, int]], samples: int, seed: int | None = None) -> list[dict[str, int]]:
+    """`samples` points with each field drawn uniformly from its inclusive (low, high) range."""
+    for name in ranges:
+        _parse_field(name)
+    rng = random.Random(seed)
+    return [{name: rng.randint(low, high) for name, (low, high) in ranges.items()} for _ in range(samples)]
+
+
+def apply_overrides(spec: tuple, overrides: dict[str, int], opponent: bool) -> tuple:
+    """Return a copy of a Pokemon spec with the overrides for one side applied."""
+    values = list(spec)
+    moves = [list(move) for move in spec[-1]]
+    for name, value in overrides.items():
+        is_opponent, field = _parse_field(name)
+        if is_opponent != opponent:
+            continue
+        if field in _SPEC_INDEX:
+            values[_SPEC_INDEX[field]] = value
+            if field == "max_hp":
+                values[5] = value # Sweeps always start at full health
+        elif moves:
+            moves[0][_MOVE_INDEX[field]] = value
+    values[-1] = tuple(tuple(move) for move in moves)
+    return tuple(values)
+
+
+def config_key(spec_a: tuple, spec_b: tuple, battles: int, max_turns: int, seed: int) -> str:
+    """Content hash of everything that determines a configuration's result."""
+    payload = json.dumps([_CACHE_VERSION, spec_a, spec_b, battles, max_turns, seed], separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class SweepCache:
+    """One small JSON file per configuration, sharded by the first two hex digits of its key."""
+
+    def __init__(self, directory: str):
+        self.directory: str = directory
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], f"{key}.json")
+
+    def get(self, key: str) -> dict | None:
+        """The cached result for `key`, or None if it has not been simulated (or the file is unreadable)."""
+        try:
+            with open(self._path(key), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def put(self, key: str, result: dict):
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        atomic_write(path, json.dumps(result, separators=(",", ":")).encode("utf-8"))
+
+    def __contains__(self, key: str) -> bool:
+        return os.path.exists(self._path(key))
+
+
+@dataclass(frozen=True, slots=True)
+class SweepRow:
+    """Result of one point against one opponent."""
+    params: dict
+    opponent: str
+    wins: int
+    losses: int
+    draws: int
+    mean_turns: float
+    cached: bool = False
+
+    @property
+    def battles(self) -> int:
+        return self.wins + self.losses + self.draws
+
+    @property
+    def win_rate(self) -> float:
+        """Fraction of battles won by the subject (draws count as half, like tournament.WinTable)."""
+        return (self.wins + 0.5 * self.draws) / self.battles if self.battles else 0.0
+
+
+class SweepResult:
+    """All rows of a sweep, plus views for the tuning team."""
+
+    def __init__(self, rows: list[SweepRow]):
+        self.rows: list[SweepRow] = rows
+
+    @property
+    def simulated(self) -> int:
+        """Configurations that had to be simulated (the rest came from the cache)."""
+        return sum(not row.cached for row in self.rows)
+
+    @property
+    def cached(self) -> int:
+        return sum(row.cached for row in self.rows)
+
+    def surface(self, x: str, y: str) -> tuple[list[int], list[int], np.ndarray]:
+        """Mean win rate over (y, x) values, averaged over opponents and every other field.
+
+        Returns (x values, y values, array of shape (len(y values), len(x values))).
+        Rows that did not sweep both fields are left out; cells no point landed
+        on (common with random search) are NaN.
+        """
+        rows = [row for row in self.rows if x in row.params and y in row.params]
+        xs = sorted({row.params[x] for row in rows})
+        ys = sorted({row.params[y] for row in rows})
+        x_index = {value: i for i, value in enumerate(xs)}
+        y_index = {value: i for i, value in enumerate(ys)}
+        totals = np.zeros((len(ys), len(xs)))
+        counts = np.zeros((len(ys), len(xs)))
+        for row in rows:
+            cell = y_index[row.params[y]], x_index[row.params[x]]
+            totals[cell] += row.win_rate
+            counts[cell] += 1
+        with np.errstate(invalid="ignore"):
+            return xs, ys, totals / counts
+
+    def surface_csv(self, x: str, y: str) -> str:
+        """The surface as CSV: a header row of x values, then one row per y value."""
+        xs, ys, rates = self.surface(x, y)
+        lines = [",".join([f"{y}\\{x}"] + [str(value) for value in xs])]
+        for y_value, row in zip(ys, rates):
+            lines.append(",".join([str(y_value)] + ["" if np.isnan(rate) else f"{rate:.4f}" for rate in row]))
+        return "\n".join(lines) + "\n"
+
+    def to_csv(self) -> str:
+        """Every row as CSV, one column per swept field."""
+        fields = sorted({name for row in self.rows for name in row.params})
+        lines = [",".join(fields + ["opponent", "wins", "losses", "draws", "win_rate", "mean_turns"])]
+        for row in self.rows:
+            values = [str(row.params.get(name, "")) for name in fields]
+            values += [row.opponent, str(row.wins), str(row.losses), str(row.draws),
+                       f"{row.win_rate:.4f}", f"{row.mean_turns:.2f}"]
+            lines.append(",".join(values))
+        return "\n".join(lines) + "\n"
+
+
+# --- Worker side ---
+
+def _simulate_chunk(jobs: list[tuple[str, tuple, tuple]], battles: int, max_turns: int) -> list[tuple[str, dict]]:
+    """Simulate each (key, subject spec, opponent spec) job; return (key, result) pairs."""
+    results = []
+    for key, spec_a, spec_b in jobs:
+        pokemon_a = build_pokemon(spec_a, [Move(*move) for move in spec_a[-1]])
+        pokemon_b = build_pokemon(spec_b, [Move(*move) for move in spec_b[-1]])
+        # Seeded from the key, so a configuration's result does not depend on which sweep ran it
+        outcome = simulate_matchup(pokemon_a, pokemon_b, battles, max_turns=max_turns, seed=int(key[:16], 16))
+        results.append((key, {"wins": outcome.wins_a, "losses": outcome.wins_b, "draws": outcome.draws,
+                              "mean_turns": float(outcome.turns.mean()) if battles else 0.0}))
+    return results
+
+
+# --- Driver side ---
+
+class Sweep:
+    """Runs sweeps for one subject against a set of opponents on a process pool."""
+
+    def __init__(self, subject: Pokemon, opponents: list[Pokemon], cache_dir: str | None = None,
+                 battles: int = 1000, max_turns: int = 500, max_workers: int | None = None,
+                 chunk_size: int = 16, seed: int = 0):
+        if not opponents:
+            raise ValueError("A sweep needs at least one opponent.")
+        if any(not pokemon.moves for pokemon in [subject, *opponents]):
+            raise ValueError("The subject and every opponent must have moves.")
+        self.subject_spec: tuple = pokemon_spec(subject)
+        self.opponent_specs: list[tuple] = [pokemon_spec(pokemon) for pokemon in opponents]
+        self.opponent_names: list[str] = [pokemon.nickname or pokemon.species_name for pokemon in opponents]
+        self.cache: SweepCache | None = SweepCache(cache_dir) if cache_dir is not None else None
+        self.battles: int = battles
+        self.max_turns: int = max_turns
+        self.max_workers: int | None = max_workers
+        self.chunk_size: int = max(1, chunk_size)
+        self.seed: int = seed
+        self._executor: ProcessPoolExecutor | None = None
+
+    def __enter__(self) -> "Sweep":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """Shut down the worker pool."""
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def _pool(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+        return self._executor
+
+    def iter_run(self, points: list[dict[str, int]]) -> Iterator[SweepRow]:
+        """Yield a row per (point, opponent): cached rows first, then simulated rows as chunks finish."""
+        pending: dict[str, list[tuple[dict, str]]] = {} # key -> (params, opponent name) waiting on it
+        jobs = []
+        for params in points:
+            spec_a = apply_overrides(self.subject_spec, params, opponent=False)
+            for name, opponent_spec in zip(self.opponent_names, self.opponent_specs):
+                spec_b = apply_overrides(opponent_spec, params, opponent=True)
+                key = config_key(spec_a, spec_b, self.battles, self.max_turns, self.seed)
+                result = self.cache.get(key) if self.cache is not None else None
+                if result is not None:
+                    yield SweepRow(dict(params), name, cached=True, **result)
+                    continue
+                if key not in pending:
+                    pending[key] = []
+                    jobs.append((key, spec_a, spec_b))
+                pending[key].append((dict(params), name))
+        if not jobs:
+            return
+
+        pool = self._pool()
+        futures = [pool.submit(_simulate_chunk, chunk, self.battles, self.max_turns)
+                   for chunk in chunked(jobs, self.chunk_size)]
+        for future in as_completed(futures):
+            for key, result in future.result():
+                if self.cache is not None:
+                    self.cache.put(key, result)
+                for params, name in pending[key]:
+                    yield SweepRow(params, name, **result)
+
+    def run(self, points: list[dict[str, int]]) -> SweepResult:
+        """Run every point against every opponent and return the collected rows."""
+        return SweepResult(list(self.iter_run(points)))
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m game.sweep", description="Balance-tuning parameter sweep")
+    parser.add_argument("spec", help="JSON sweep spec (see README)")
+    parser.add_argument("--cache-dir", default=".sweep-cache", help="Where per-configuration results are cached")
+    parser.add_argument("--output", help="Write every result row to this CSV file")
+    parser.add_argument("--surface", action="append", default=[], metavar="X,Y",
+                        help="Print the win-rate surface over two fields (repeatable)")
+    parser.add_argument("--max-workers", type=int, help="Worker processes (default: one per core)")
+    args = parser.parse_args(argv)
+
+    from game.dex import get_default_dex
+    with open(args.spec, "r", encoding="utf-8") as f:
+        spec = json.load(f)
+    dex = get_default_dex()
+    subject = dex.create_pokemon(spec["subject"]["species"], spec["subject"].get("level", 5))
+    opponents = [dex.create_pokemon(entry["species"], entry.get("level", 5)) for entry in spec["opponents"]]
+    points = grid_points(spec["grid"]) if "grid" in spec else []
+    if "random" in spec:
+        search = spec["random"]
+        points += random_points({name: tuple(bounds) for name, bounds in search["ranges"].items()},
+                                search["samples"], search.get("seed"))
+
+    with Sweep(subject, opponents, cache_dir=args.cache_dir, battles=spec.get("battles", 1000),
+               max_turns=spec.get("max_turns", 500), max_workers=args.max_workers,
+               seed=spec.get("seed", 0)) as sweep:
+        result = sweep.run(points)
+    print(f"{len(result.rows)} configurations: {result.simulated} simulated, {result.cached} from cache")
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(result.to_csv())
+    for pair in args.surface:
+        x, y = pair.split(",")
+        print(f"\nWin rate by {x} (columns) and {y} (rows):")
+        print(result.surface_csv(x, y), end="")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
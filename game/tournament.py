@@ -0,0 +1,265 @@
+# game/tournament.py
+
+"""Round-robin and Swiss tournaments across a roster of Pokémon.
+
+Matchups are spread over a concurrent.futures process pool. The roster is sent
+to each worker once (via the pool initializer) and rebuilt there a single time;
+workers then reuse those Pokémon and Move objects for every battle, only
+resetting HP between battles. Matchups are submitted in chunks and results are
+folded into a WinTable as each chunk completes, so callers can watch standings
+fill in while the tournament is still running.
+"""
+
+import random
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Iterator
+
+from game.battle import Battle
+from game.classes.move import Move
+from game.classes.player import Player
+from game.classes.pokemon import Pokemon
+
+
+class WinTable:
+    """Pairwise win/draw counts for a roster, updated incrementally."""
+
+    def __init__(self, names: list[str]):
+        self.names: list[str] = list(names)
+        size = len(self.names)
+        self.wins: list[list[int]] = [[0] * size for _ in range(size)]  # wins[i][j]: battles i won against j
+        self.draws: list[list[int]] = [[0] * size for _ in range(size)]
+        self.battles_played: int = 0
+
+    def record(self, i: int, j: int, wins_i: int, wins_j: int, draws: int):
+        """Fold the result of a batch of i-vs-j battles into the table."""
+        self.wins[i][j] += wins_i
+        self.wins[j][i] += wins_j
+        self.draws[i][j] += draws
+        if i != j:
+            self.draws[j][i] += draws
+        self.battles_played += wins_i + wins_j + draws
+
+    def games(self, i: int, j: int) -> int:
+        """Number of battles played between i and j."""
+        if i == j:
+            return self.wins[i][i] + self.draws[i][i]
+        return self.wins[i][j] + self.wins[j][i] + self.draws[i][j]
+
+    def win_rate(self, i: int, j: int) -> float:
+        """Fraction of i-vs-j battles won by i (draws count as half)."""
+        games = self.games(i, j)
+        if games == 0:
+            return 0.0
+        if i == j:
+            return 0.5
+        return (self.wins[i][j] + 0.5 * self.draws[i][j]) / games
+
+    def standings(self) -> list[tuple[str, float]]:
+        """Return (name, overall win rate) pairs, best first, for entries that have played."""
+        rows = []
+        for i, name in enumerate(self.names):
+            played = sum(self.games(i, j) for j in range(len(self.names)) if j != i)
+            if played == 0:
+                continue
+            won = sum(self.wins[i][j] + 0.5 * self.draws[i][j] for j in range(len(self.names)) if j != i)
+            rows.append((name, won / played))
+        rows.sort(key=lambda row: row[1], reverse=True)
+        return rows
+
+
+# --- Worker side ---
+
+# Roster rebuilt once per worker process: index -> (player holding side A copy, side B copy)
+_WORKER_ROSTER: list[tuple[Player, Pokemon]] = []
+
+
+def pokemon_spec(pokemon: Pokemon) -> tuple:
+    """Reduce a Pokemon to a small picklable tuple for shipping to workers."""
+    moves = tuple((m.name, m.type, m.category, m.power, m.accuracy, m.pp) for m in pokemon.moves)
+    return (pokemon.species_name, pokemon.nickname, tuple(pokemon.types), pokemon.level,
+            pokemon.max_hp, pokemon.current_hp, pokemon.attack, pokemon.defense, pokemon.speed, moves)
+
+
+def build_pokemon(spec: tuple, moves: list[Move]) -> Pokemon:
+    """Rebuild a Pokemon from a pokemon_spec tuple, with `moves` (built from the spec's move tuples)."""
+    species_name, nickname, types, level, max_hp, current_hp, attack, defense, speed, _ = spec
+    pokemon = Pokemon(species_name=species_name, types=list(types), level=level,
+                      max_hp=max_hp, attack=attack, defense=defense, speed=speed)
+    pokemon.nickname = nickname
+    pokemon.current_hp = current_hp
+    pokemon.moves = moves # Shared between both copies; moves are never mutated in battle
+    return pokemon
+
+
+def _init_worker(specs: list[tuple]):
+    """Pool initializer: build every roster entry once for this worker."""
+    _WORKER_ROSTER.clear()
+    for index, spec in enumerate(specs):
+        moves = [Move(*move) for move in spec[-1]]
+        player = Player(f"Entry {index}")
+        player.team.append(build_pokemon(spec, moves)) # Direct append skips add_pokemon's printing
+        _WORKER_ROSTER.append((player, build_pokemon(spec, moves)))
+
+
+def _run_chunk(chunk: list[tuple[int, int]], battles_per_matchup: int, max_turns: int,
+               seed: int | None) -> list[tuple[int, int, int, int, int]]:
+    """Run every matchup in a chunk; return (i, j, wins_i, wins_j, draws) rows."""
+    seeds = random.Random(seed) # Hands each battle its own seed
+    results = []
+    for i, j in chunk:
+        player, _ = _WORKER_ROSTER[i]
+        _, opponent = _WORKER_ROSTER[j]
+        player_poke = player.team[0]
+        start_hp = (player_poke.current_hp, opponent.current_hp)
+        wins_i = wins_j = draws = 0
+        for _ in range(battles_per_matchup):
+            player_poke.current_hp, opponent.current_hp = start_hp
+            battle = Battle(player, opponent, headless=True, max_turns=max_turns, seed=seeds.getrandbits(64))
+            winner = battle.run_battle()
+            if winner is player_poke:
+                wins_i += 1
+            elif winner is opponent:
+                wins_j += 1
+            else:
+                draws += 1
+        player_poke.current_hp, opponent.current_hp = start_hp
+        results.append((i, j, wins_i, wins_j, draws))
+    return results
+
+
+# --- Driver side ---
+
+def chunked(items: list, size: int) -> Iterator[list]:
+    """Split `items` into lists of at most `size`, e.g. one per worker job."""
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+class Tournament:
+    """Runs tournaments for a roster of Pokémon on a process pool."""
+
+    def __init__(self, roster: list[Pokemon], battles_per_matchup: int = 20,
+                 max_workers: int | None = None, chunk_size: int = 8,
+                 max_turns: int = 500, seed: int | None = None):
+        if len(roster) < 2:
+            raise ValueError("A tournament needs at least two Pokemon.")
+        if any(not pokemon.moves or pokemon.is_fainted() for pokemon in roster):
+            raise ValueError("Every roster entry must have moves and be able to battle.")
+        self.roster: list[Pokemon] = roster
+        self.names: list[str] = [pokemon.nickname or pokemon.species_name for pokemon in roster]
+        self.battles_per_matchup: int = battles_per_matchup
+        self.max_workers: int | None = max_workers
+        self.chunk_size: int = max(1, chunk_size)
+        self.max_turns: int = max_turns
+        self.seed: int | None = seed
+        self._executor: ProcessPoolExecutor | None = None
+        self._chunks_submitted: int = 0
+
+    def __enter__(self) -> "Tournament":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """Shut down the worker pool."""
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def _pool(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            specs = [pokemon_spec(pokemon) for pokemon in self.roster]
+            self._executor = ProcessPoolExecutor(max_workers=self.max_workers,
+                                                 initializer=_init_worker, initargs=(specs,))
+        return self._executor
+
+    def _next_seed(self) -> int | None:
+        """Derive a per-chunk seed so a seeded tournament is reproducible."""
+        self._chunks_submitted += 1
+        if self.seed is None:
+            return None
+        return self.seed * 1_000_003 + self._chunks_submitted
+
+    def _play(self, matchups: list[tuple[int, int]], table: WinTable) -> Iterator[list[tuple]]:
+        """Submit matchups in chunks and fold each finished chunk into `table`."""
+        pool = self._pool()
+        futures = [pool.submit(_run_chunk, chunk, self.battles_per_matchup, self.max_turns, self._next_seed())
+                   for chunk in chunked(matchups, self.chunk_size)]
+        for future in as_completed(futures):
+            rows = future.result()
+            for row in rows:
+                table.record(*row)
+            yield rows
+
+    def iter_round_robin(self) -> Iterator[WinTable]:
+        """Play every pair once, yielding the (shared, growing) WinTable after each chunk."""
+        table = WinTable(self.names)
+        size = len(self.roster)
+        matchups = [(i, j) for i in range(size) for j in range(i + 1, size)]
+        for _ in self._play(matchups, table):
+            yield table
+
+    def round_robin(self) -> WinTable:
+        """Play a full round robin and return the final WinTable."""
+        table = None
+        for table in self.iter_round_robin():
+            pass
+        return table
+
+    def iter_swiss(self, rounds: int) -> Iterator[tuple[int, list[tuple[str, float]], WinTable]]:
+        """Play a Swiss tournament, yielding (round, scores, table) after each round.
+
+        Each matchup is worth 1 point to whoever wins the majority of its
+        battles (half a point each for an even split). Entries are paired with
+        others on a similar score, avoiding rematches where possible; with an
+        odd roster the lowest-ranked entry that has not had a bye yet gets one,
+        worth 1 point.
+        """
+        table = WinTable(self.names)
+        scores = [0.0] * len(self.roster)
+        played: set[tuple[int, int]] = set()
+        had_bye: set[int] = set()
+        for round_number in range(1, rounds + 1):
+            pairings, bye = self._swiss_pairings(scores, played, had_bye)
+            if bye is not None:
+                scores[bye] += 1.0
+                had_bye.add(bye)
+            for rows in self._play(pairings, table):
+                for i, j, wins_i, wins_j, _ in rows:
+                    played.add((min(i, j), max(i, j)))
+                    if wins_i > wins_j:
+                        scores[i] += 1.0
+                    elif wins_j > wins_i:
+                        scores[j] += 1.0
+                    else:
+                        scores[i] += 0.5
+                        scores[j] += 0.5
+            ranking = sorted(zip(self.names, scores), key=lambda row: row[1], reverse=True)
+            yield round_number, ranking, table
+
+    def swiss(self, rounds: int) -> list[tuple[str, float]]:
+        """Play a Swiss tournament and return the final (name, score) ranking."""
+        ranking = []
+        for _, ranking, _ in self.iter_swiss(rounds):
+            pass
+        return ranking
+
+    @staticmethod
+    def _swiss_pairings(scores: list[float], played: set[tuple[int, int]],
+                        had_bye: set[int] = frozenset()) -> tuple[list[tuple[int, int]], int | None]:
+        """Greedily pair entries by score, avoiding rematches when possible."""
+        order = sorted(range(len(scores)), key=lambda i: scores[i], reverse=True)
+        bye = None
+        if len(order) % 2:
+            # Lowest-ranked entry without a bye yet (everyone has had one: the lowest-ranked)
+            position = next((pos for pos in range(len(order) - 1, -1, -1) if order[pos] not in had_bye),
+                            len(order) - 1)
+            bye = order.pop(position)
+        pairings = []
+        while order:
+            first = order.pop(0)
+            partner_pos = next((pos for pos, other in enumerate(order)
+                                if (min(first, other), max(first, other)) not in played), 0)
+            pairings.append((first, order.pop(partner_pos)))
+        return pairings, bye
@@ -0,0 +1,132 @@
+# game/types.py
+
+"""Type registry and precomputed type-effectiveness tables.
+
+Type names are interned to small integers once (when a Pokemon or Move is
+created), and every possible defending type combination gets a single
+integer "defender key". The damage pipeline then looks up effectiveness and
+STAB with plain list indexing instead of comparing strings or walking
+Pokemon.types on every hit.
+
+Only registered types are accepted: a misspelt type name raises instead of
+quietly becoming a new type. The standard types always get the same ids.
+Extra types must be added with TypeRegistry.register() before any Pokemon or
+Move uses them, always in the same order, because type ids and defender keys
+are persisted (PC storage indexes, encoded observations).
+"""
+
+# Upper bound on distinct types; fixed so defender keys never change when a new type is registered
+MAX_TYPES = 32
+
+# The standard types, in their conventional order (ids are list positions)
+STANDARD_TYPES = [
+    "Normal", "Fire", "Water", "Electric", "Grass", "Ice", "Fighting", "Poison", "Ground",
+    "Flying", "Psychic", "Bug", "Rock", "Ghost", "Dragon", "Dark", "Steel", "Fairy",
+]
+
+# Non-neutral matchups: attacking type -> {defending type: multiplier}
+_CHART = {
+    "Normal":   {"Rock": 0.5, "Ghost": 0, "Steel": 0.5},
+    "Fire":     {"Fire": 0.5, "Water": 0.5, "Grass": 2, "Ice": 2, "Bug": 2, "Rock": 0.5, "Dragon": 0.5, "Steel": 2},
+    "Water":    {"Fire": 2, "Water": 0.5, "Grass": 0.5, "Ground": 2, "Rock": 2, "Dragon": 0.5},
+    "Electric": {"Water": 2, "Electric": 0.5, "Grass": 0.5, "Ground": 0, "Flying": 2, "Dragon": 0.5},
+    "Grass":    {"Fire": 0.5, "Water": 2, "Grass": 0.5, "Poison": 0.5, "Ground": 2, "Flying": 0.5, "Bug": 0.5,
+                 "Rock": 2, "Dragon": 0.5, "Steel": 0.5},
+    "Ice":      {"Fire": 0.5, "Water": 0.5, "Grass": 2, "Ice": 0.5, "Ground": 2, "Flying": 2, "Dragon": 2, "Steel": 0.5},
+    "Fighting": {"Normal": 2, "Ice": 2, "Poison": 0.5, "Flying": 0.5, "Psychic": 0.5, "Bug": 0.5, "Rock": 2,
+                 "Ghost": 0, "Dark": 2, "Steel": 2, "Fairy": 0.5},
+    "Poison":   {"Grass": 2, "Poison": 0.5, "Ground": 0.5, "Rock": 0.5, "Ghost": 0.5, "Steel": 0, "Fairy": 2},
+    "Ground":   {"Fire": 2, "Electric": 2, "Grass": 0.5, "Poison": 2, "Flying": 0, "Bug": 0.5, "Rock": 2, "Steel": 2},
+    "Flying":   {"Electric": 0.5, "Grass": 2, "Fighting": 2, "Bug": 2, "Rock": 0.5, "Steel": 0.5},
+    "Psychic":  {"Fighting": 2, "Poison": 2, "Psychic": 0.5, "Dark": 0, "Steel": 0.5},
+    "Bug":      {"Fire": 0.5, "Grass": 2, "Fighting": 0.5, "Poison": 0.5, "Flying": 0.5, "Psychic": 2, "Ghost": 0.5,
+                 "Dark": 2, "Steel": 0.5, "Fairy": 0.5},
+    "Rock":     {"Fire": 2, "Ice": 2, "Fighting": 0.5, "Ground": 0.5, "Flying": 2, "Bug": 2, "Steel": 0.5},
+    "Ghost":    {"Normal": 0, "Psychic": 2, "Ghost": 2, "Dark": 0.5},
+    "Dragon":   {"Dragon": 2, "Steel": 0.5, "Fairy": 0},
+    "Dark":     {"Fighting": 0.5, "Psychic": 2, "Ghost": 2, "Dark": 0.5, "Fairy": 0.5},
+    "Steel":    {"Fire": 0.5, "Water": 0.5, "Electric": 0.5, "Ice": 2, "Rock": 2, "Steel": 0.5, "Fairy": 2},
+    "Fairy":    {"Fire": 0.5, "Fighting": 2, "Poison": 0.5, "Dragon": 2, "Dark": 2, "Steel": 0.5},
+}
+
+STAB_MULTIPLIER = 1.5
+
+
+class TypeRegistry:
+    """Interns type names to ids and holds the precomputed effectiveness tables.
+
+    A defender key packs up to two type ids as `primary * MAX_TYPES + secondary`;
+    single-typed Pokémon use their type as both halves. `dual_chart[attack][key]`
+    is the combined multiplier against that type combination.
+    """
+
+    def __init__(self, names: list[str] = STANDARD_TYPES, chart: dict[str, dict[str, float]] = _CHART):
+        self.names: list[str] = []
+        self._ids: dict[str, int] = {}
+        self._single: list[list[float]] = [[1.0] * MAX_TYPES for _ in range(MAX_TYPES)]
+        for name in names:
+            self._register(name)
+        for attacking, row in chart.items():
+            for defending, multiplier in row.items():
+                self._single[self._ids[attacking]][self._ids[defending]] = float(multiplier)
+        self.dual_chart: list[list[float]] = [self._build_row(atk) for atk in range(MAX_TYPES)]
+
+    def _register(self, name: str) -> int:
+        if len(self.names) >= MAX_TYPES:
+            raise ValueError(f"Cannot register type '{name}': the registry is limited to {MAX_TYPES} types.")
+        type_id = len(self.names)
+        self.names.append(name)
+        self._ids[name] = type_id
+        return type_id
+
+    def _build_row(self, attack_id: int) -> list[float]:
+        single = self._single[attack_id]
+        row = [1.0] * (MAX_TYPES * MAX_TYPES)
+        for primary in range(MAX_TYPES):
+            for secondary in range(MAX_TYPES):
+                multiplier = single[primary]
+                if secondary != primary:
+                    multiplier *= single[secondary]
+                row[primary * MAX_TYPES + secondary] = multiplier
+        return row
+
+    def register(self, name: str) -> int:
+        """Add a new type, neutral to and from everything, and return its id (or the existing id)."""
+        type_id = self._ids.get(name)
+        if type_id is None:
+            type_id = self._register(name) # New types start neutral, so the tables need no update
+        return type_id
+
+    def type_id(self, name: str) -> int:
+        """Return the id for a registered type name; raise ValueError for unknown names."""
+        type_id = self._ids.get(name)
+        if type_id is None:
+            raise ValueError(f"Unknown type {name!r} (register new types with TYPES.register() first).")
+        return type_id
+
+    def type_name(self, type_id: int) -> str:
+        return self.names[type_id]
+
+    def defender_key(self, types: list[str]) -> int:
+        """Pack a Pokémon's one or two types into a single table index."""
+        if not types:
+            raise ValueError("A Pokemon needs at least one type.")
+        if len(types) > 2:
+            raise ValueError(f"A Pokemon can have at most two types, got {types}.")
+        primary = self.type_id(types[0])
+        secondary = self.type_id(types[1]) if len(types) == 2 else primary
+        return primary * MAX_TYPES + secondary
+
+    def effectiveness(self, attack_id: int, defender_key: int) -> float:
+        """Combined multiplier of an attacking type against a defender key."""
+        return self.dual_chart[attack_id][defender_key]
+
+    @staticmethod
+    def has_type(defender_key: int, type_id: int) -> bool:
+        """Whether the type combination behind `defender_key` includes `type_id` (used for STAB)."""
+        primary, secondary = divmod(defender_key, MAX_TYPES)
+        return type_id == primary or type_id == secondary
+
+
+# Shared registry used by Pokemon, Move and the battle engine
+TYPES = TypeRegistry()
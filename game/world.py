@@ -0,0 +1,323 @@
+# game/world.py
+
+"""Tile-based world map built from lazily loaded chunks.
+
+The world is split into CHUNK_SIZE x CHUNK_SIZE chunks. Each chunk stores
+its tiles as one byte per tile in a bytearray, plus the name of the zone it
+belongs to (used for wild encounters). World keeps only `cache_chunks`
+chunks in memory, loading them from a ChunkStore on first use and evicting
+the least recently used ones (writing back any edits first), so maps of any
+size can be explored with bounded memory.
+
+find_path() runs A* over walkable tiles. Results are cached and each cached
+path remembers which chunks its search looked at; editing a tile only drops
+the cached paths that depended on that tile's chunk.
+"""
+
+import heapq
+import os
+import random
+import struct
+from collections import OrderedDict
+
+CHUNK_SIZE = 32
+_CHUNK_SHIFT = 5 # log2(CHUNK_SIZE)
+_CHUNK_MASK = CHUNK_SIZE - 1
+
+# Tile ids
+PATH = 0
+GRASS = 1 # Walkable; wild Pokémon live here
+WATER = 2
+WALL = 3
+TREE = 4
+WALKABLE = bytes([1, 1, 0, 0, 0]) # Indexed by tile id
+
+CHUNK_VERSION = 1
+_CHUNK_MAGIC = b"PKCH"
+_CHUNK_HEADER = struct.Struct("<4sHiiH") # magic, version, chunk x, chunk y, chunk size
+_U16 = struct.Struct("<H")
+
+Point = tuple[int, int]
+
+
+class Chunk:
+    """One CHUNK_SIZE x CHUNK_SIZE block of tiles."""
+
+    __slots__ = ("cx", "cy", "zone", "tiles", "version", "dirty")
+
+    def __init__(self, cx: int, cy: int, zone: str = "route", tiles: bytearray | None = None):
+        self.cx: int = cx
+        self.cy: int = cy
+        self.zone: str = zone
+        self.tiles: bytearray = tiles if tiles is not None else bytearray(CHUNK_SIZE * CHUNK_SIZE)
+        self.version: int = 0     # Bumped on every edit
+        self.dirty: bool = False  # Edited since it was loaded or saved
+
+    def to_bytes(self) -> bytes:
+        zone = self.zone.encode("utf-8")
+        return b"".join((_CHUNK_HEADER.pack(_CHUNK_MAGIC, CHUNK_VERSION, self.cx, self.cy, CHUNK_SIZE),
+                         _U16.pack(len(zone)), zone, bytes(self.tiles)))
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "Chunk":
+        magic, version, cx, cy, size = _CHUNK_HEADER.unpack_from(data)
+        if magic != _CHUNK_MAGIC or version != CHUNK_VERSION or size != CHUNK_SIZE:
+            raise ValueError("Not a chunk file, or an unsupported version.")
+        offset = _CHUNK_HEADER.size
+        (length,) = _U16.unpack_from(data, offset)
+        offset += _U16.size
+        zone = data[offset:offset + length].decode("utf-8")
+        tiles = bytearray(data[offset + length:])
+        if len(tiles) != CHUNK_SIZE * CHUNK_SIZE:
+            raise ValueError("Chunk file has the wrong number of tiles.")
+        return cls(cx, cy, zone, tiles)
+
+
+class TerrainGenerator:
+    """Deterministic procedural chunks: paths with grass patches, trees, walls and ponds."""
+
+    def __init__(self, seed: int = 0, zones: tuple[str, ...] = ("route",), grass: float = 0.25,
+                 obstacles: float = 0.12):
+        self.seed: int = seed
+        self.zones: tuple[str, ...] = zones
+        self.grass: float = grass
+        self.obstacles: float = obstacles
+
+    def __call__(self, cx: int, cy: int) -> Chunk:
+        rng = random.Random(f"{self.seed}:{cx}:{cy}") # Same chunk every time, in any order
+        chunk = Chunk(cx, cy, self.zones[rng.randrange(len(self.zones))])
+        tiles = chunk.tiles
+        area = CHUNK_SIZE * CHUNK_SIZE
+        for tile, share, blob in ((GRASS, self.grass, 4), (TREE, self.obstacles / 2, 2),
+                                  (WATER, self.obstacles / 4, 3), (WALL, self.obstacles / 4, 1)):
+            for _ in range(int(area * share) // (blob * blob)):
+                x0, y0 = rng.randrange(CHUNK_SIZE), rng.randrange(CHUNK_SIZE)
+                for y in range(y0, min(CHUNK_SIZE, y0 + blob)):
+                    for x in range(x0, min(CHUNK_SIZE, x0 + blob)):
+                        tiles[y * CHUNK_SIZE + x] = tile
+        return chunk
+
+
+class ChunkStore:
+    """Where chunks come from and go back to.
+
+    Chunks are read from `directory` (one file per chunk) when present;
+    missing chunks come from `generator` (e.g. a TerrainGenerator), or are
+    blank. Edited chunks are written back to `directory` when one is set.
+    """
+
+    def __init__(self, directory: str | None = None, generator=None):
+        self.directory: str | None = directory
+        self.generator = generator
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+
+    def _path(self, cx: int, cy: int) -> str:
+        return os.path.join(self.directory, f"chunk_{cx}_{cy}.pkc")
+
+    def load(self, cx: int, cy: int) -> Chunk:
+        if self.directory is not None:
+            try:
+                with open(self._path(cx, cy), "rb") as f:
+                    return Chunk.from_bytes(f.read())
+            except FileNotFoundError:
+                pass
+        if self.generator is not None:
+            return self.generator(cx, cy)
+        return Chunk(cx, cy)
+
+    def save(self, chunk: Chunk) -> bool:
+        """Persist an edited chunk; returns False if there is nowhere to write it."""
+        if self.directory is None:
+            return False
+        path = self._path(chunk.cx, chunk.cy)
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        with open(temp_path, "wb") as f:
+            f.write(chunk.to_bytes())
+        os.replace(temp_path, path)
+        return True
+
+
+class World:
+    """Tile map of (optionally bounded) size backed by an LRU cache of chunks.
+
+    `width`/`height` are in tiles; without them the world is unbounded.
+    Edits to chunks that cannot be saved (no store directory) are pinned in
+    memory instead of being evicted, so they are never lost.
+    """
+
+    def __init__(self, store: ChunkStore, width: int | None = None, height: int | None = None,
+                 cache_chunks: int = 64, path_cache_size: int = 1024):
+        self.store: ChunkStore = store
+        self.width: int | None = width
+        self.height: int | None = height
+        self.cache_chunks: int = cache_chunks
+        self.path_cache_size: int = path_cache_size
+        self._chunks: OrderedDict[Point, Chunk] = OrderedDict()
+        self._pinned: dict[Point, Chunk] = {} # Unsaveable edited chunks
+        self._paths: OrderedDict[tuple[Point, Point], tuple[list[Point] | None, int]] = OrderedDict() # (path, tiles expanded)
+        self._paths_by_chunk: dict[Point, set[tuple[Point, Point]]] = {}
+        self._path_chunks: dict[tuple[Point, Point], set[Point]] = {} # Chunks each cached search looked at
+        self.chunk_loads: int = 0
+        self.path_cache_hits: int = 0
+
+    # --- Chunks ---
+
+    def chunk(self, cx: int, cy: int) -> Chunk:
+        """The chunk at chunk coordinates (cx, cy), loading it if needed."""
+        key = (cx, cy)
+        chunk = self._chunks.get(key)
+        if chunk is not None:
+            self._chunks.move_to_end(key)
+            return chunk
+        chunk = self._pinned.get(key)
+        if chunk is None:
+            chunk = self.store.load(cx, cy)
+            self.chunk_loads += 1
+        self._chunks[key] = chunk
+        while len(self._chunks) > self.cache_chunks:
+            old_key, old = self._chunks.popitem(last=False)
+            if old.dirty:
+                if self.store.save(old):
+                    old.dirty = False
+                else:
+                    self._pinned[old_key] = old
+        return chunk
+
+    def loaded_chunks(self) -> int:
+        return len(self._chunks)
+
+    def flush(self):
+        """Write every edited chunk back to the store."""
+        for chunk in list(self._chunks.values()) + list(self._pinned.values()):
+            if chunk.dirty and self.store.save(chunk):
+                chunk.dirty = False
+                self._pinned.pop((chunk.cx, chunk.cy), None)
+
+    # --- Tiles ---
+
+    def in_bounds(self, x: int, y: int) -> bool:
+        if self.width is not None and not 0 <= x < self.width:
+            return False
+        if self.height is not None and not 0 <= y < self.height:
+            return False
+        return True
+
+    def tile(self, x: int, y: int) -> int:
+        """Tile id at (x, y); out-of-bounds tiles read as WALL."""
+        if not self.in_bounds(x, y):
+            return WALL
+        chunk = self.chunk(x >> _CHUNK_SHIFT, y >> _CHUNK_SHIFT)
+        return chunk.tiles[(y & _CHUNK_MASK) * CHUNK_SIZE + (x & _CHUNK_MASK)]
+
+    def is_walkable(self, x: int, y: int) -> bool:
+        return bool(WALKABLE[self.tile(x, y)])
+
+    def zone_at(self, x: int, y: int) -> str:
+        return self.chunk(x >> _CHUNK_SHIFT, y >> _CHUNK_SHIFT).zone
+
+    def set_tile(self, x: int, y: int, tile: int):
+        """Change one tile; cached paths that depended on its chunk are dropped."""
+        if not self.in_bounds(x, y):
+            raise IndexError(f"({x}, {y}) is outside the world.")
+        key = (x >> _CHUNK_SHIFT, y >> _CHUNK_SHIFT)
+        chunk = self.chunk(*key)
+        index = (y & _CHUNK_MASK) * CHUNK_SIZE + (x & _CHUNK_MASK)
+        if chunk.tiles[index] == tile:
+            return
+        chunk.tiles[index] = tile
+        chunk.version += 1
+        chunk.dirty = True
+        self._invalidate_chunk(key)
+
+    # --- Pathfinding ---
+
+    def find_path(self, start: Point, goal: Point, max_nodes: int = 100_000) -> list[Point] | None:
+        """Shortest 4-directional walking path from start to goal (both included), or None.
+
+        The search gives up (returning None) after expanding `max_nodes`
+        tiles, which bounds the cost of asking for unreachable goals in an
+        unbounded world. Only finished searches are cached, together with how
+        many tiles they expanded, so a cached answer is the one a search with
+        this caller's budget would give.
+        """
+        cache_key = (start, goal)
+        if cache_key in self._paths:
+            self._paths.move_to_end(cache_key)
+            self.path_cache_hits += 1
+            path, expanded = self._paths[cache_key]
+            if expanded > max_nodes:
+                return None # This budget would have run out first
+            return list(path) if path is not None else None
+        path, touched, expanded = self._a_star(start, goal, max_nodes)
+        if expanded <= max_nodes: # Giving up says nothing about larger budgets
+            self._remember_path(cache_key, (path, expanded), touched)
+        return list(path) if path is not None else None
+
+    def _a_star(self, start: Point, goal: Point, max_nodes: int) -> tuple[list[Point] | None, set[Point], int]:
+        """Returns (path or None, chunks whose tiles the result depends on, tiles expanded).
+
+        More than `max_nodes` tiles expanded means the search gave up.
+        """
+        touched = {(start[0] >> _CHUNK_SHIFT, start[1] >> _CHUNK_SHIFT), (goal[0] >> _CHUNK_SHIFT, goal[1] >> _CHUNK_SHIFT)}
+        if not (self.is_walkable(*start) and self.is_walkable(*goal)):
+            return None, touched, 0
+        gx, gy = goal
+        came_from: dict[Point, Point | None] = {start: None}
+        cost: dict[Point, int] = {start: 0}
+        frontier = [(abs(start[0] - gx) + abs(start[1] - gy), 0, start)]
+        local_chunks: dict[Point, bytearray] = {} # Tiles of chunks seen during this search
+        expanded = 0
+        while frontier:
+            _, g, current = heapq.heappop(frontier)
+            if current == goal:
+                path = []
+                while current is not None:
+                    path.append(current)
+                    current = came_from[current]
+                path.reverse()
+                return path, touched.union(local_chunks), expanded
+            if g > cost[current]:
+                continue # Stale queue entry
+            expanded += 1
+            if expanded > max_nodes:
+                break
+            x, y = current
+            for nx, ny in ((x + 1, y), (x - 1, y), (x, y + 1), (x, y - 1)):
+                if not self.in_bounds(nx, ny):
+                    continue
+                key = (nx >> _CHUNK_SHIFT, ny >> _CHUNK_SHIFT)
+                tiles = local_chunks.get(key)
+                if tiles is None:
+                    tiles = local_chunks[key] = self.chunk(*key).tiles
+                if not WALKABLE[tiles[(ny & _CHUNK_MASK) * CHUNK_SIZE + (nx & _CHUNK_MASK)]]:
+                    continue
+                new_cost = g + 1
+                neighbour = (nx, ny)
+                if new_cost < cost.get(neighbour, 1 << 62):
+                    cost[neighbour] = new_cost
+                    came_from[neighbour] = current
+                    heapq.heappush(frontier, (new_cost + abs(nx - gx) + abs(ny - gy), new_cost, neighbour))
+        return None, touched.union(local_chunks), expanded
+
+    def _remember_path(self, cache_key: tuple[Point, Point], result: tuple[list[Point] | None, int], touched: set[Point]):
+        self._paths[cache_key] = result
+        self._path_chunks[cache_key] = touched
+        for chunk_key in touched:
+            self._paths_by_chunk.setdefault(chunk_key, set()).add(cache_key)
+        while len(self._paths) > self.path_cache_size:
+            old_key, _ = self._paths.popitem(last=False)
+            self._forget_path(old_key)
+
+    def _forget_path(self, cache_key: tuple[Point, Point]):
+        self._paths.pop(cache_key, None)
+        for chunk_key in self._path_chunks.pop(cache_key, ()):
+            keys = self._paths_by_chunk.get(chunk_key)
+            if keys is not None:
+                keys.discard(cache_key)
+                if not keys:
+                    del self._paths_by_chunk[chunk_key]
+
+    def _invalidate_chunk(self, chunk_key: Point):
+        for cache_key in list(self._paths_by_chunk.get(chunk_key, ())):
+            self._forget_path(cache_key)
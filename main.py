@@ -1,10 +1,12 @@
 print("Welcome to the Pokémon-like CLI Game!")
 
 # Import necessary classes
-from game.classes.pokemon import Pokemon
-from game.classes.move import Move
 from game.classes.player import Player
+from game.dex import get_default_dex
+from game.encounters import EncounterGenerator
 from game.battle import Battle
+from game.output import SleepPacer
+from game.render import TerminalRenderer
 
 
 def main():
@@ -16,44 +18,25 @@ def main():
     print(f"Created Player: {player.name}")
     
     # --- Create Sample Pokémon --- 
-    # TODO: Replace with loading player data / generating wild encounters
-    player_pokemon = Pokemon(
-        species_name="Pikachu", 
-        types=["Electric"], 
-        level=50, 
-        max_hp=145, 
-        attack=55, 
-        defense=40, 
-        speed=90
-    )
-    player_pokemon.nickname = "Pika"
-    player_pokemon.moves = [
-        Move(name="Thunder Shock", type="Electric", category="Special", power=40, accuracy=100, pp=30),
-        Move(name="Quick Attack", type="Normal", category="Physical", power=40, accuracy=100, pp=30),
-        Move(name="Growl", type="Normal", category="Status", power=0, accuracy=100, pp=40)
-    ]
+    # TODO: Replace with loading player data
+    dex = get_default_dex()
+    player_pokemon = dex.create_pokemon("Pikachu", level=50, nickname="Pika")
     player.add_pokemon(player_pokemon)
     
-    opponent_pokemon = Pokemon(
-        species_name="Meowth", 
-        types=["Normal"], 
-        level=48, 
-        max_hp=130, 
-        attack=45, 
-        defense=35, 
-        speed=90
-    )
-    opponent_pokemon.moves = [
-        Move(name="Scratch", type="Normal", category="Physical", power=40, accuracy=100, pp=35),
-        Move(name="Tail Whip", type="Normal", category="Status", power=0, accuracy=100, pp=30)
-    ]
+    # A wild Pokémon from the route's encounter table
+    opponent_pokemon = EncounterGenerator(dex).encounter("route")
 
     print(f"Player starts with: {player.get_active_pokemon()}")
     print(f"Opponent starts with: {opponent_pokemon}")
 
     # --- Start Battle --- 
-    battle = Battle(player, opponent_pokemon)
-    winner = battle.run_battle()
+    # The CLI runs at human pace; evaluation harnesses use Battle(..., headless=True)
+    renderer = TerminalRenderer() # Status panel on a terminal, plain text when piped
+    battle = Battle(player, opponent_pokemon, output=renderer, pacer=SleepPacer())
+    try:
+        winner = battle.run_battle()
+    finally:
+        renderer.close()
 
     # --- Post-Battle --- 
     if winner:
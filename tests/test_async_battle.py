@@ -0,0 +1,165 @@
+# tests/test_async_battle.py
+import asyncio
+import unittest
+from collections import defaultdict
+from unittest.mock import patch
+from game.async_battle import ChooserProvider, QueueProvider, run_battles
+from game.battle import Battle
+from game.classes.move import Move
+from game.classes.player import Player
+from game.classes.pokemon import Pokemon
+from game.output import BufferedSink, NoPacer, Pacer, SleepPacer
+
+def make_battle(seed: int = 1, **battle_kwargs) -> Battle:
+    with patch('builtins.print'):
+        player = Player("Tester")
+        hero = Pokemon(species_name="Hero", types=["Normal"], level=20, max_hp=60, attack=30, defense=30, speed=50)
+        hero.moves = [Move(name="Tackle", type="Normal", category="Physical", power=40, accuracy=90, pp=35),
+                      Move(name="Growl", type="Normal", category="Status", power=0, accuracy=100, pp=40)]
+        player.add_pokemon(hero)
+    foe = Pokemon(species_name="Foe", types=["Normal"], level=20, max_hp=60, attack=30, defense=30, speed=50)
+    foe.moves = [Move(name="Scratch", type="Normal", category="Physical", power=40, accuracy=95, pp=35)]
+    battle_kwargs.setdefault("headless", True)
+    return Battle(player, foe, seed=seed, **battle_kwargs)
+
+async def slow_first_move(battle: Battle) -> Move:
+    await asyncio.sleep(0.02) # Stand-in for a remote agent
+    return battle.player_active_pokemon.moves[0]
+
+class TestAsyncBattle(unittest.TestCase):
+
+    def test_matches_sync_battle(self):
+        """With the same seed and choices, the async loop should play the same battle."""
+        sync_sink, async_sink = BufferedSink(), BufferedSink()
+        make_battle(seed=4, output=sync_sink).run_battle()
+        asyncio.run(make_battle(seed=4, output=async_sink).run_battle_async(slow_first_move))
+        self.assertEqual(async_sink.lines, sync_sink.lines)
+
+    def test_battles_run_concurrently(self):
+        """Every battle should be waiting on its provider at once instead of taking turns."""
+        battles = [make_battle(seed=i) for i in range(50)]
+        in_flight = peak = 0
+        everyone_waiting = None
+
+        async def gated_first_move(battle: Battle) -> Move:
+            # Holds each decision until all battles are waiting; a sequential loop would never get there
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            if peak == len(battles):
+                everyone_waiting.set()
+            await everyone_waiting.wait()
+            in_flight -= 1
+            return battle.player_active_pokemon.moves[0]
+
+        async def scenario():
+            nonlocal everyone_waiting
+            everyone_waiting = asyncio.Event()
+            jobs = [(b, gated_first_move, None) for b in battles]
+            return await asyncio.wait_for(run_battles(jobs), timeout=30) # Guards against a hang only
+
+        winners = asyncio.run(scenario())
+        self.assertEqual(len(winners), 50)
+        self.assertTrue(all(w is not None for w in winners))
+        self.assertEqual(peak, len(battles))
+        self.assertEqual(in_flight, 0)
+
+    def test_decision_timeout_falls_back(self):
+        async def never_decides(battle):
+            await asyncio.sleep(60)
+
+        battle = make_battle()
+        winner = asyncio.run(battle.run_battle_async(never_decides, decision_timeout=0.001))
+        self.assertIsNotNone(winner)
+        self.assertEqual(battle.decision_timeouts[0], battle.turn_count)
+        self.assertEqual(battle.decision_timeouts[1], 0)
+
+    def test_queue_and_chooser_providers(self):
+        async def scenario():
+            battle = make_battle()
+            agent = QueueProvider("player")
+            opponent = ChooserProvider(lambda b: b.opponent.moves[0], in_thread=True)
+            task = asyncio.create_task(battle.run_battle_async(agent, opponent))
+            await agent.queue.put(7)  # Out of range: ignored
+            await agent.queue.put(1)  # Growl
+            await agent.queue.put(None)  # Give up on turn 2
+            return battle, await task
+
+        battle, winner = asyncio.run(scenario())
+        self.assertIsNone(winner)
+        self.assertEqual(battle.replay.turn(1)[0], 1)
+        self.assertEqual(battle.turn_count, 2)
+
+    def test_team_battle_replacements_come_from_the_provider(self):
+        """Forced replacements ask the provider, never stdin."""
+        def make_team_battle():
+            with patch('builtins.print'):
+                player = Player("Tester")
+                for name in ("A", "B", "C"):
+                    pokemon = Pokemon(species_name=name, types=["Normal"], level=5, max_hp=10, attack=5, defense=5, speed=5)
+                    pokemon.moves = [Move(name="Tackle", type="Normal", category="Physical", power=40, accuracy=100, pp=35)]
+                    player.add_pokemon(pokemon)
+            foe = Pokemon(species_name="Foe", types=["Normal"], level=30, max_hp=200, attack=60, defense=40, speed=60)
+            foe.moves = [Move(name="Scratch", type="Normal", category="Physical", power=40, accuracy=100, pp=35)]
+            return Battle(player, foe, seed=3, output=BufferedSink(), pacer=NoPacer()) # Interactive, not headless
+
+        last_alive = lambda b: b.player.team.alive_slots()[-1]
+        first_move = lambda b: b.player_active_pokemon.moves[0]
+        with patch('builtins.input', side_effect=AssertionError("prompted on stdin")):
+            battle = make_team_battle()
+            asyncio.run(battle.run_battle_async(ChooserProvider(first_move, replacement_chooser=last_alive)))
+            self.assertEqual([battle.replay.replacements[i + 2] for i in range(0, len(battle.replay.replacements), 3)], [2, 1])
+
+            async def plain_provider(b):
+                return first_move(b)
+            battle = make_team_battle()
+            asyncio.run(battle.run_battle_async(plain_provider))
+            self.assertEqual([battle.replay.replacements[i + 2] for i in range(0, len(battle.replay.replacements), 3)], [1, 2])
+        self.assertEqual(battle.alive_count(0), 0)
+
+    def test_both_sides_decide_at_once(self):
+        """Each side's provider only answers once the other has been asked too."""
+        both_asked = defaultdict(asyncio.Event) # Per turn
+        asked = []
+
+        def gated(moves):
+            async def provider(battle: Battle):
+                turn = battle.turn_count
+                asked.append(turn)
+                if asked.count(turn) == 2:
+                    both_asked[turn].set()
+                await both_asked[turn].wait() # Asking one side after the other would time out here
+                return moves(battle)[0]
+            return provider
+
+        battle = make_battle(seed=2)
+        winner = asyncio.run(battle.run_battle_async(gated(lambda b: b.player_active_pokemon.moves),
+                                                     gated(lambda b: b.opponent.moves), decision_timeout=10))
+        self.assertIsNotNone(winner)
+        self.assertEqual(battle.decision_timeouts, [0, 0])
+        self.assertEqual(len(asked), 2 * battle.turn_count)
+
+    def test_pacer_without_async_pause_still_paces(self):
+        class BlockingOnlyPacer(Pacer):
+            def pause(self, seconds: float):
+                raise AssertionError("blocking pause in async mode")
+
+        slept = []
+
+        async def fake_sleep(seconds):
+            slept.append(seconds)
+
+        battle = make_battle(headless=False, output=BufferedSink(), pacer=BlockingOnlyPacer())
+        with patch('game.output.asyncio.sleep', fake_sleep):
+            asyncio.run(battle.run_battle_async(ChooserProvider(lambda b: b.player_active_pokemon.moves[0])))
+        self.assertGreater(sum(slept), 0)
+
+    def test_pauses_do_not_block_the_loop(self):
+        blocking_sleeps = []
+        battle = make_battle(headless=False, output=BufferedSink(), pacer=SleepPacer(scale=0.0001, sleep=blocking_sleeps.append))
+        asyncio.run(battle.run_battle_async(slow_first_move))
+        self.assertEqual(blocking_sleeps, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
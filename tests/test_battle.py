@@ -0,0 +1,210 @@
+# tests/test_battle.py
+import copy
+import unittest
+from unittest.mock import patch
+from game.battle import Battle, Switch
+from game.classes.move import Move
+from game.classes.player import Player
+from game.classes.pokemon import Pokemon
+from game.events import EventRecorder, EventBus
+from game.output import BufferedSink, NoPacer, SleepPacer
+from game.replay import BattleReplay, replay_battle
+from game.state import PLAYER, OPPONENT
+
+def make_battle(**battle_kwargs) -> Battle:
+    """Build a small Pikachu vs Rattata battle."""
+    with patch('builtins.print'): # Silence Player.add_pokemon
+        player = Player("Tester")
+        pika = Pokemon(species_name="Pikachu", types=["Electric"], level=50, max_hp=150, attack=55, defense=40, speed=90)
+        pika.moves = [Move(name="Thunder Shock", type="Electric", category="Special", power=40, accuracy=100, pp=30)]
+        player.add_pokemon(pika)
+    rattata = Pokemon(species_name="Rattata", types=["Normal"], level=48, max_hp=120, attack=56, defense=35, speed=72)
+    rattata.moves = [Move(name="Quick Attack", type="Normal", category="Physical", power=40, accuracy=100, pp=30)]
+    return Battle(player, rattata, **battle_kwargs)
+
+class TestHeadlessBattle(unittest.TestCase):
+
+    @patch('builtins.print')
+    @patch('time.sleep')
+    def test_headless_battle_is_silent_and_never_sleeps(self, mock_sleep, mock_print):
+        """A headless battle should finish without printing or sleeping."""
+        battle = make_battle(headless=True)
+        winner = battle.run_battle()
+        self.assertIs(winner, battle.player_active_pokemon) # Faster and stronger
+        self.assertTrue(battle.opponent.is_fainted())
+        mock_sleep.assert_not_called()
+        mock_print.assert_not_called()
+
+    def test_buffered_output_and_injected_pacer(self):
+        """Battle text should go to the sink and pauses to the pacer."""
+        sink = BufferedSink()
+        pauses = []
+        battle = make_battle(output=sink, pacer=SleepPacer(sleep=pauses.append),
+                             player_move_chooser=lambda b: b.player_active_pokemon.moves[0])
+        battle.run_battle()
+        self.assertIn("--- Turn 1 ---", sink.lines)
+        self.assertTrue(any(line.startswith("Pikachu uses Thunder Shock! - It hits!") for line in sink.lines))
+        self.assertIn(f"--- Battle End --- Turn {battle.turn_count}", sink.lines)
+        self.assertGreater(len(pauses), 0)
+
+    def test_player_move_chooser_cancel_ends_battle(self):
+        """Returning None from the chooser should end the battle without a winner."""
+        battle = make_battle(headless=True, player_move_chooser=lambda b: None)
+        self.assertIsNone(battle.run_battle())
+
+
+class TestBattleStateIntegration(unittest.TestCase):
+
+    def test_apply_and_undo_turn(self):
+        """apply_turn should advance the state and undo_turn should roll HP and replay back."""
+        battle = make_battle(headless=True, seed=11)
+        pika, rattata = battle.player_active_pokemon, battle.opponent
+        start = battle.snapshot()
+        after = battle.apply_turn(pika.moves[0], rattata.moves[0])
+        self.assertEqual(after.turn_count, 1)
+        self.assertLess(rattata.current_hp, 120)
+        self.assertEqual(after.hp, ((pika.current_hp,), (rattata.current_hp,)))
+        self.assertEqual(battle.replay.turn_count, 1)
+
+        restored = battle.undo_turn()
+        self.assertIs(restored, start)
+        self.assertEqual((pika.current_hp, rattata.current_hp), (150, 120))
+        self.assertEqual((battle.turn_count, battle.replay.turn_count), (0, 0))
+        with self.assertRaises(IndexError):
+            battle.undo_turn()
+
+    def test_restore_snapshot(self):
+        battle = make_battle(headless=True, seed=2)
+        fork = battle.snapshot()
+        battle.run_battle()
+        self.assertTrue(battle.is_over)
+        battle.restore(fork)
+        self.assertFalse(battle.is_over)
+        self.assertEqual(battle.opponent.current_hp, 120)
+        battle.restore(fork.damage(1, 999))
+        self.assertTrue(battle.opponent.is_fainted())
+        with self.assertRaises(ValueError): # Cannot play on after the battle is over
+            battle.apply_turn(battle.player_active_pokemon.moves[0], battle.opponent.moves[0])
+
+
+TACKLE = Move(name="Tackle", type="Normal", category="Physical", power=40, accuracy=100, pp=35)
+
+def make_trainer(name: str, *stat_lines: tuple[str, int, int]) -> Player:
+    """A trainer whose team has one Pokémon per (name, max_hp, attack), all knowing Tackle."""
+    with patch('builtins.print'):
+        trainer = Player(name)
+        for species, max_hp, attack in stat_lines:
+            pokemon = Pokemon(species_name=species, types=["Normal"], level=20, max_hp=max_hp, attack=attack,
+                              defense=30, speed=40)
+            pokemon.moves = [TACKLE]
+            trainer.add_pokemon(pokemon)
+    return trainer
+
+class TestTeam(unittest.TestCase):
+
+    def test_alive_mask_follows_hp(self):
+        player = make_trainer("Tester", ("A", 30, 30), ("B", 30, 30), ("C", 30, 30))
+        team = player.team
+        self.assertEqual((team.alive_mask, team.alive_count), (0b111, 3))
+        team[0].current_hp = 0
+        self.assertIs(player.get_active_pokemon(), team[1])
+        team[1].current_hp -= 100
+        self.assertEqual(team.alive_slots(), [2])
+        team[0].current_hp = 5 # Revived
+        self.assertIs(player.get_active_pokemon(), team[0])
+        del team[0] # Structural changes rebuild the mask
+        self.assertEqual(team.alive_mask, 0b10)
+        player.team[1].current_hp = 0
+        self.assertIsNone(player.get_active_pokemon())
+        self.assertFalse(player.has_usable_pokemon())
+
+    def test_plain_list_assignment(self):
+        player = make_trainer("Tester")
+        player.team = [Pokemon(species_name="A", types=["Normal"], level=5, max_hp=10, attack=5, defense=5, speed=5)]
+        self.assertEqual(player.team.alive_count, 1)
+        player.team[0].current_hp = 0
+        self.assertEqual(player.team.alive_count, 0)
+
+    def test_copies_of_one_pokemon(self):
+        """Copies share `uid`, but each team member is still tracked on its own."""
+        player = make_trainer("Tester")
+        original = Pokemon(species_name="A", types=["Normal"], level=5, max_hp=10, attack=5, defense=5, speed=5)
+        player.team = [original, copy.deepcopy(original)]
+        player.team[0].current_hp = 0
+        self.assertEqual(player.team.alive_mask, 0b10)
+        self.assertIs(player.get_active_pokemon(), player.team[1])
+
+
+class TestTeamBattle(unittest.TestCase):
+
+    def test_forced_replacement_until_a_team_is_out(self):
+        player = make_trainer("Tester", ("Ace", 200, 80))
+        rival = make_trainer("Rival", ("R1", 20, 20), ("R2", 20, 20), ("R3", 20, 20))
+        recorder = EventRecorder()
+        events = EventBus()
+        events.subscribe(recorder)
+        battle = Battle(player, rival, headless=True, seed=1, events=events)
+        winner = battle.run_battle()
+        self.assertIs(winner, player.team[0])
+        self.assertEqual(rival.team.alive_count, 0)
+        switches = recorder.of_kind("switch")
+        self.assertEqual([(e.side, e.pokemon, e.forced) for e in switches], [(OPPONENT, "R2", True), (OPPONENT, "R3", True)])
+        self.assertEqual(len(recorder.of_kind("faint")), 3)
+        self.assertEqual(recorder.of_kind("battle_end")[-1].winner, PLAYER)
+
+    def test_chosen_switch_goes_before_moves(self):
+        player = make_trainer("Tester", ("Lead", 100, 30), ("Tank", 300, 30))
+        rival = make_trainer("Rival", ("Foe", 100, 30))
+        battle = Battle(player, rival, headless=True, seed=2)
+        lead, tank = player.team
+        battle.apply_turn(Switch(1), TACKLE)
+        self.assertIs(battle.player_active_pokemon, tank)
+        self.assertEqual(lead.current_hp, 100)
+        self.assertLess(tank.current_hp, 300) # Took the hit meant for the lead
+        self.assertEqual(battle.state.active, (1, 0))
+        battle.undo_turn()
+        self.assertIs(battle.player_active_pokemon, lead)
+        self.assertEqual(battle.replay.turn_count, 0)
+        with self.assertRaises(ValueError):
+            battle.apply_turn(Switch(0), TACKLE) # Already active
+        self.assertEqual(battle.turn_count, 0)
+
+    def test_apply_turn_never_prompts_for_a_replacement(self):
+        """Forking states with apply_turn must not block on input(), even in an interactive battle."""
+        player = make_trainer("Tester", ("Weak", 1, 30), ("Backup", 100, 30))
+        rival = make_trainer("Rival", ("Foe", 100, 80))
+        battle = Battle(player, rival, output=BufferedSink(), pacer=NoPacer(), seed=2) # Interactive: no move chooser
+        with patch('builtins.input', side_effect=AssertionError("prompted on stdin")):
+            battle.apply_turn(TACKLE, TACKLE)
+        self.assertIs(battle.player_active_pokemon, player.team[1])
+
+    def test_replay_with_switches_and_replacements(self):
+        def switch_then_tackle(battle: Battle):
+            return Switch(1) if battle.turn_count == 1 else battle.player_active_pokemon.moves[0]
+
+        sides = lambda: (make_trainer("Tester", ("A", 40, 30), ("B", 40, 30), ("C", 40, 30)),
+                         make_trainer("Rival", ("X", 60, 40), ("Y", 60, 40)))
+        player, rival = sides()
+        sink = BufferedSink()
+        battle = Battle(player, rival, headless=True, seed=3, output=sink, player_move_chooser=switch_then_tackle,
+                        player_switch_chooser=lambda b: b.player.team.alive_slots()[-1]) # Last usable first
+        battle.run_battle()
+        self.assertTrue(battle.replay.replacements)
+        replay = BattleReplay.from_bytes(battle.replay.to_bytes())
+        self.assertEqual(replay, battle.replay)
+
+        player2, rival2 = sides()
+        replay_sink = BufferedSink()
+        replay_battle(replay, player2, rival2, output=replay_sink)
+        self.assertEqual(replay_sink.lines, sink.lines)
+        self.assertEqual([p.current_hp for p in player2.team], [p.current_hp for p in player.team])
+
+    def test_trainer_without_usable_pokemon(self):
+        player = make_trainer("Tester", ("A", 30, 30))
+        rival = make_trainer("Rival", ("X", 30, 30))
+        rival.team[0].current_hp = 0
+        with self.assertRaises(ValueError):
+            Battle(player, rival, headless=True)
+
+if __name__ == '__main__':
+    unittest.main()
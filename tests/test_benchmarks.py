@@ -0,0 +1,35 @@
+# tests/test_benchmarks.py
+import json
+import os
+import tempfile
+import unittest
+from benchmarks.cases import CASES
+from benchmarks.harness import compare, load_report, run_suite, save_report
+
+class TestBenchmarkSuite(unittest.TestCase):
+
+    def test_every_case_runs(self):
+        report = run_suite(CASES, repeat=1, min_time=0.001)
+        self.assertEqual(set(report["results"]), {case.name for case in CASES})
+        for result in report["results"].values():
+            self.assertGreater(result["ops_per_sec"], 0)
+            self.assertGreater(result["units_per_sec"], 0)
+        json.dumps(report) # Must be serialisable
+
+    def test_compare_flags_regressions(self):
+        baseline = {"results": {"a": {"ops_per_sec": 100.0}, "b": {"ops_per_sec": 100.0}}}
+        report = {"results": {"a": {"ops_per_sec": 85.0}, "b": {"ops_per_sec": 95.0}, "new": {"ops_per_sec": 1.0}}}
+        changes = {c["name"]: c for c in compare(report, baseline, tolerance=0.10)}
+        self.assertEqual(set(changes), {"a", "b"})
+        self.assertTrue(changes["a"]["regression"])
+        self.assertFalse(changes["b"]["regression"])
+
+    def test_report_round_trip(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "nested", "baseline.json")
+            save_report({"results": {}}, path)
+            self.assertEqual(load_report(path), {"results": {}})
+
+
+if __name__ == '__main__':
+    unittest.main()
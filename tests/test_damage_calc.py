@@ -0,0 +1,120 @@
+# tests/test_damage_calc.py
+import random
+import unittest
+from collections import Counter
+from unittest.mock import patch
+from game.battle import Battle
+from game.classes.move import Move
+from game.classes.player import Player
+from game.classes.pokemon import Pokemon
+from game.damage_calc import DamageCalculator, damage_distribution, ko_chances
+
+GROWL = Move(name="Growl", type="Normal", category="Status", power=0, accuracy=100, pp=40)
+TACKLE = Move(name="Tackle", type="Normal", category="Physical", power=40, accuracy=100, pp=35)
+SLAM = Move(name="Slam", type="Normal", category="Physical", power=80, accuracy=75, pp=20)
+EMBER = Move(name="Ember", type="Fire", category="Special", power=40, accuracy=100, pp=25)
+
+def make_pokemon(name: str, types: list[str], **stats) -> Pokemon:
+    values = dict(level=20, max_hp=60, attack=30, defense=30, speed=40)
+    values.update(stats)
+    return Pokemon(species_name=name, types=types, **values)
+
+class TestDamageDistribution(unittest.TestCase):
+
+    def setUp(self):
+        self.attacker = make_pokemon("A", ["Normal"])
+        self.defender = make_pokemon("D", ["Normal"])
+
+    def test_matches_battle_damage_rolls(self):
+        """The exact distribution agrees with sampling Battle._calculate_damage."""
+        with patch('builtins.print'):
+            player = Player("Tester")
+            player.add_pokemon(self.attacker)
+        battle = Battle(player, self.defender, headless=True, seed=3)
+        samples = 50_000
+        counts = Counter(battle._calculate_damage(self.attacker, self.defender, TACKLE) for _ in range(samples))
+        distribution = DamageCalculator().distribution(self.attacker, self.defender, TACKLE)
+        self.assertEqual({damage for damage, _ in distribution.outcomes}, set(counts))
+        for damage, chance in distribution.outcomes:
+            self.assertAlmostEqual(counts[damage] / samples, chance, delta=0.01)
+
+    def test_accuracy_and_immunity(self):
+        distribution = damage_distribution(self.attacker, self.defender, SLAM)
+        self.assertAlmostEqual(sum(chance for _, chance in distribution.outcomes), 1.0)
+        self.assertEqual(distribution.outcomes[0], (0, 0.25))
+        self.assertEqual(damage_distribution(self.attacker, self.defender, GROWL).outcomes, ((0, 1.0),))
+        ghost = make_pokemon("G", ["Ghost"])
+        self.assertEqual(damage_distribution(self.attacker, ghost, TACKLE).max_damage, 0)
+
+    def test_minimum_damage_is_one(self):
+        weak = make_pokemon("W", ["Normal"], level=1, attack=1)
+        wall = make_pokemon("R", ["Rock"], defense=255) # Resisted, so the base drops below 2
+        distribution = damage_distribution(weak, wall, TACKLE)
+        self.assertEqual(distribution.outcomes, ((1, 1.0),))
+
+    def test_type_effectiveness_scales_damage(self):
+        grass = make_pokemon("G", ["Grass"])
+        water = make_pokemon("W", ["Water"])
+        self.assertGreater(damage_distribution(self.attacker, grass, EMBER).mean,
+                           damage_distribution(self.attacker, water, EMBER).mean)
+
+    def test_crits_add_a_high_branch(self):
+        plain = DamageCalculator().distribution(self.attacker, self.defender, TACKLE)
+        crits = DamageCalculator(crit_chance=0.25).distribution(self.attacker, self.defender, TACKLE)
+        self.assertAlmostEqual(sum(chance for _, chance in crits.outcomes), 1.0)
+        self.assertGreater(crits.max_damage, plain.max_damage)
+        self.assertGreater(crits.mean, plain.mean)
+
+
+class TestKoChances(unittest.TestCase):
+
+    def setUp(self):
+        self.attacker = make_pokemon("A", ["Normal"])
+        self.defender = make_pokemon("D", ["Normal"])
+
+    def test_matches_simulation(self):
+        calculator = DamageCalculator()
+        distribution = calculator.distribution(self.attacker, self.defender, SLAM)
+        chances = calculator.ko_chances(self.attacker, self.defender, SLAM, max_hits=4)
+        self.assertEqual(list(chances), sorted(chances)) # Cumulative
+        damages = [damage for damage, _ in distribution.outcomes]
+        weights = [chance for _, chance in distribution.outcomes]
+        rng = random.Random(5)
+        trials, within = 20_000, [0] * 4
+        for _ in range(trials):
+            hp = self.defender.max_hp
+            for hit in range(4):
+                hp -= rng.choices(damages, weights)[0]
+                if hp <= 0:
+                    for n in range(hit, 4):
+                        within[n] += 1
+                    break
+        for n in range(4):
+            self.assertAlmostEqual(within[n] / trials, chances[n], delta=0.015)
+
+    def test_edge_cases(self):
+        self.assertEqual(ko_chances(self.attacker, self.defender, TACKLE, hp=1, max_hits=2), (1.0, 1.0))
+        self.assertEqual(ko_chances(self.attacker, self.defender, GROWL, max_hits=3), (0.0, 0.0, 0.0))
+        calculator = DamageCalculator()
+        self.assertIsNone(calculator.expected_hits_to_ko(self.attacker, self.defender, GROWL))
+        self.assertEqual(calculator.expected_hits_to_ko(self.attacker, self.defender, TACKLE, hp=1), 1.0)
+
+    def test_memoised_with_bounded_cache(self):
+        calculator = DamageCalculator(cache_size=2)
+        for _ in range(3):
+            calculator.ko_chances(self.attacker, self.defender, TACKLE)
+        info = calculator.cache_info()
+        self.assertEqual(info["ko"].hits, 2)
+        self.assertEqual(info["distribution"].misses, 1)
+        for power in (10, 20, 30):
+            move = Move(name="Test", type="Normal", category="Physical", power=power, accuracy=100, pp=10)
+            calculator.distribution(self.attacker, self.defender, move)
+        self.assertEqual(calculator.cache_info()["distribution"].currsize, 2)
+        # Same numbers, different objects: still a cache hit
+        twin = make_pokemon("Twin", ["Normal"])
+        before = calculator.cache_info()["ko"].hits
+        calculator.ko_chances(self.attacker, twin, TACKLE)
+        self.assertEqual(calculator.cache_info()["ko"].hits, before + 1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,114 @@
+# tests/test_dex.py
+import copy
+import json
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+from game import dex as dex_module
+from game.dex import Dex, compile_dex, get_default_dex
+
+SAMPLE = {
+    "moves": [
+        {"name": "Tackle", "type": "Normal", "category": "Physical", "power": 40, "accuracy": 100, "pp": 35},
+        {"name": "Ember", "type": "Fire", "category": "Special", "power": 40, "accuracy": 100, "pp": 25},
+        {"name": "Growl", "type": "Normal", "category": "Status", "power": 0, "accuracy": 100, "pp": 40},
+    ],
+    "species": [
+        {"name": "Charmander", "types": ["Fire"], "max_hp": 39, "attack": 52, "defense": 43, "speed": 65,
+         "moves": ["Ember", "Growl"]},
+        {"name": "Bulbasaur", "types": ["Grass", "Poison"], "max_hp": 45, "attack": 49, "defense": 49, "speed": 45,
+         "moves": ["Tackle"]},
+    ],
+}
+
+class TestDex(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.source = os.path.join(self.tmp.name, "dex.json")
+        self.write_source(SAMPLE)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write_source(self, data: dict, mtime_ns: int | None = None):
+        with open(self.source, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        if mtime_ns is not None:
+            os.utime(self.source, ns=(mtime_ns, mtime_ns))
+
+    def test_lookups_by_name_and_id(self):
+        dex = Dex(self.source)
+        self.assertEqual((dex.species_count, dex.move_count), (2, 3))
+        self.assertEqual(dex.species_id("Bulbasaur"), 1)
+        self.assertEqual(dex.species(1).types, ["Grass", "Poison"])
+        self.assertEqual(dex.move("Ember").type, "Fire")
+        self.assertEqual(dex.move(2).category, "Status")
+        self.assertEqual(dex.species_names(), ["Charmander", "Bulbasaur"])
+        with self.assertRaises(KeyError):
+            dex.species("Missingno")
+        with self.assertRaises(KeyError):
+            dex.move(99)
+
+    def test_create_pokemon_uses_shared_moves(self):
+        dex = Dex(self.source)
+        first = dex.create_pokemon("Charmander", level=10, nickname="Char")
+        second = dex.create_pokemon(0)
+        self.assertEqual((first.species_name, first.level, first.max_hp, first.nickname), ("Charmander", 10, 39, "Char"))
+        self.assertEqual(first.species_id, 0)
+        self.assertEqual([move.name for move in first.moves], ["Ember", "Growl"])
+        self.assertIs(first.moves[0], second.moves[0]) # Flyweight
+        self.assertIsNot(first.moves, second.moves)
+
+    def test_shared_moves_are_read_only(self):
+        """Changing a flyweight would change it for every Pokémon, so it is refused."""
+        dex = Dex(self.source)
+        ember = dex.create_pokemon("Charmander").moves[0]
+        for field, value in (("pp", 1), ("power", 999), ("type", "Water"), ("category", "Status")):
+            with self.assertRaises(AttributeError):
+                setattr(ember, field, value)
+        self.assertEqual((ember.pp, ember.power, ember.type_id), (25, 40, dex.move("Ember").type_id))
+        clone = copy.deepcopy(ember)
+        self.assertEqual(str(clone), str(ember))
+        with self.assertRaises(AttributeError):
+            clone.pp = 1
+
+    def test_cache_reused_until_source_changes(self):
+        Dex(self.source).species_count # Builds the cache
+        cache_path = os.path.join(self.tmp.name, "dex.dexc")
+        self.assertTrue(os.path.exists(cache_path))
+        with patch.object(dex_module, "compile_dex", side_effect=AssertionError("recompiled")):
+            self.assertEqual(Dex(self.source).species("Charmander").speed, 65)
+
+        changed = json.loads(json.dumps(SAMPLE))
+        changed["species"][0]["speed"] = 99
+        self.write_source(changed, mtime_ns=os.stat(self.source).st_mtime_ns + 10**9)
+        self.assertEqual(Dex(self.source).species("Charmander").speed, 99)
+
+    def test_unwritable_cache_falls_back_to_memory(self):
+        dex = Dex(self.source, cache_path=os.path.join(self.tmp.name, "missing_dir", "dex.dexc"))
+        self.assertEqual(dex.species("Bulbasaur").max_hp, 45)
+        dex.close()
+        self.assertEqual(dex.move_id("Tackle"), 0) # Reloads after close
+
+    def test_invalid_data(self):
+        bad = json.loads(json.dumps(SAMPLE))
+        bad["species"][0]["moves"].append("Hyper Beam")
+        with self.assertRaises(ValueError):
+            compile_dex(bad)
+        bad = json.loads(json.dumps(SAMPLE))
+        bad["moves"].append(dict(SAMPLE["moves"][0]))
+        with self.assertRaises(ValueError):
+            compile_dex(bad)
+
+    def test_default_dex(self):
+        """The shipped data file should load and every species should be creatable."""
+        dex = get_default_dex()
+        for name in dex.species_names():
+            pokemon = dex.create_pokemon(name)
+            self.assertTrue(pokemon.moves)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,92 @@
+# tests/test_encoding.py
+import unittest
+from unittest.mock import patch
+from game.battle import Battle
+from game.classes.move import Move
+from game.classes.player import Player
+from game.classes.pokemon import Pokemon
+from game.dex import get_default_dex
+from game.types import TYPES
+
+try:
+    import numpy as np
+    from game.encoding import (BattleEncoder, SharedBattleBuffer, encode_pokemon, read_consistent,
+                               BATTLE_SIZE, HEADER_FIELD, POKEMON_FIELD, POKEMON_SIZE, STATUS_CODES)
+except ImportError: # NumPy is optional for the core game
+    np = None
+
+def make_battle() -> Battle:
+    with patch('builtins.print'):
+        player = Player("Tester")
+        hero = Pokemon(species_name="Hero", types=["Water", "Flying"], level=20, max_hp=60, attack=30, defense=30, speed=50)
+        hero.moves = [Move(name="Tackle", type="Normal", category="Physical", power=40, accuracy=100, pp=35)]
+        player.add_pokemon(hero)
+    foe = Pokemon(species_name="Foe", types=["Fire"], level=18, max_hp=55, attack=30, defense=30, speed=40)
+    foe.moves = [Move(name="Ember", type="Fire", category="Special", power=40, accuracy=100, pp=25)]
+    return Battle(player, foe, headless=True, seed=2)
+
+@unittest.skipIf(np is None, "NumPy is not installed")
+class TestEncoding(unittest.TestCase):
+
+    def test_encode_pokemon(self):
+        pikachu = Pokemon(species_name="Pikachu", types=["Electric"], level=12, max_hp=40, attack=20, defense=15, speed=30)
+        pikachu.status = "Paralyzed"
+        pikachu.moves = [Move(name="Thunder Shock", type="Electric", category="Special", power=40, accuracy=100, pp=30)]
+        out = np.zeros(POKEMON_SIZE, dtype=np.int32)
+        encode_pokemon(pikachu, out)
+        self.assertEqual(out[POKEMON_FIELD["present"]], 1)
+        self.assertEqual(out[POKEMON_FIELD["type1"]], TYPES.type_id("Electric"))
+        self.assertEqual(out[POKEMON_FIELD["type2"]], -1)
+        self.assertEqual(out[POKEMON_FIELD["level"]], 12)
+        self.assertEqual(out[POKEMON_FIELD["status"]], STATUS_CODES["Paralyzed"])
+        self.assertEqual(out[POKEMON_FIELD["move0_power"]], 40)
+        self.assertEqual(out[POKEMON_FIELD["move0_pp"]], 30)
+        self.assertEqual(out[POKEMON_FIELD["move1_id"]], -1)
+
+        encode_pokemon(None, out)
+        self.assertEqual(out[POKEMON_FIELD["present"]], 0)
+
+    def test_dex_move_ids(self):
+        dex = get_default_dex()
+        pikachu = dex.create_pokemon("Pikachu", level=10)
+        out = np.zeros(POKEMON_SIZE, dtype=np.int32)
+        encode_pokemon(pikachu, out, dex)
+        self.assertEqual(out[POKEMON_FIELD["species_id"]], dex.species_id("Pikachu"))
+        self.assertEqual(out[POKEMON_FIELD["move0_id"]], dex.move_id(pikachu.moves[0].name))
+
+    def test_battle_encoder_updates_in_place(self):
+        battle = make_battle()
+        encoder = BattleEncoder()
+        array = encoder.encode(battle)
+        self.assertEqual(encoder.teams[0, 0, POKEMON_FIELD["type2"]], TYPES.type_id("Flying"))
+        self.assertEqual(encoder.teams[1, 0, POKEMON_FIELD["max_hp"]], 55)
+        self.assertEqual(encoder.teams[1, 1, POKEMON_FIELD["present"]], 0)
+        self.assertEqual(encoder.header[HEADER_FIELD["winner"]], -1)
+
+        battle.apply_turn(battle.player_active_pokemon.moves[0], battle.opponent.moves[0])
+        self.assertIs(encoder.encode(battle), array) # Same buffer, rewritten
+        self.assertEqual(array[HEADER_FIELD["turn"]], 1)
+        self.assertEqual(encoder.teams[1, 0, POKEMON_FIELD["current_hp"]], battle.opponent.current_hp)
+        self.assertEqual(array[HEADER_FIELD["sequence"]] % 2, 0)
+
+    def test_memoryview_buffer(self):
+        storage = bytearray(BATTLE_SIZE * 4)
+        encoder = BattleEncoder(memoryview(storage))
+        encoder.encode(make_battle())
+        self.assertEqual(np.frombuffer(storage, dtype=np.int32)[HEADER_FIELD["player_count"]], 1)
+
+    def test_shared_memory(self):
+        with SharedBattleBuffer(2) as owner:
+            battle = make_battle()
+            owner.encoder(1).encode(battle)
+            reader = SharedBattleBuffer(2, name=owner.name)
+            try:
+                copy = read_consistent(reader.arrays[1], np.empty(BATTLE_SIZE, dtype=np.int32))
+                self.assertEqual(copy[HEADER_FIELD["opponent_count"]], 1)
+                self.assertTrue((reader.arrays[0] == 0).all())
+            finally:
+                reader.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
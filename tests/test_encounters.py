@@ -0,0 +1,85 @@
+# tests/test_encounters.py
+import random
+import unittest
+from collections import Counter
+from game.dex import get_default_dex
+from game.encounters import AliasTable, EncounterGenerator
+from game.world import GRASS, PATH, ChunkStore, World
+
+TABLES = {
+    "meadow": [{"species": "Pidgey", "weight": 6, "min_level": 2, "max_level": 4},
+               {"species": "Rattata", "weight": 3, "min_level": 3, "max_level": 3},
+               {"species": "Pikachu", "weight": 1, "min_level": 5, "max_level": 7}],
+}
+
+class TestAliasTable(unittest.TestCase):
+
+    def test_matches_weights(self):
+        weights = [1, 0, 5, 2, 12]
+        table = AliasTable(weights)
+        rng = random.Random(1)
+        counts = Counter(table.sample(rng) for _ in range(100_000))
+        self.assertNotIn(1, counts) # Zero weight is never drawn
+        for i, weight in enumerate(weights):
+            self.assertAlmostEqual(counts[i] / 100_000, weight / sum(weights), delta=0.01)
+
+    def test_rejects_bad_weights(self):
+        for weights in ([], [0, 0], [1, -1]):
+            with self.assertRaises(ValueError):
+                AliasTable(weights)
+
+
+class TestEncounterGenerator(unittest.TestCase):
+
+    def setUp(self):
+        self.dex = get_default_dex()
+        self.generator = EncounterGenerator(self.dex, tables=TABLES, seed=7)
+
+    def test_encounter(self):
+        pokemon = self.generator.encounter("meadow")
+        self.assertIn(pokemon.species_name, {"Pidgey", "Rattata", "Pikachu"})
+        self.assertTrue(pokemon.moves)
+        with self.assertRaises(KeyError):
+            self.generator.encounter("volcano")
+
+    def test_batch_is_compact_and_reproducible(self):
+        batch = self.generator.sample_batch("meadow", 20_000)
+        self.assertEqual(len(batch), 20_000)
+        self.assertEqual(batch.species_ids.itemsize, 2)
+        self.assertEqual(batch.levels.itemsize, 1)
+        counts = Counter(batch.species_ids)
+        self.assertAlmostEqual(counts[self.dex.species_id("Pidgey")] / 20_000, 0.6, delta=0.02)
+        for species_id, level in zip(batch.species_ids, batch.levels):
+            slot = {"Pidgey": (2, 4), "Rattata": (3, 3), "Pikachu": (5, 7)}[self.dex.species(species_id).name]
+            self.assertTrue(slot[0] <= level <= slot[1])
+        again = EncounterGenerator(self.dex, tables=TABLES, seed=7).sample_batch("meadow", 20_000)
+        self.assertEqual(again.species_ids, batch.species_ids)
+
+    def test_create_batch_shares_moves(self):
+        team = self.generator.create_batch("meadow", 50)
+        self.assertEqual(len(team), 50)
+        pidgeys = [p for p in team if p.species_name == "Pidgey"]
+        self.assertIs(pidgeys[0].moves[0], pidgeys[1].moves[0])
+
+    def test_default_tables_resolve(self):
+        generator = EncounterGenerator(seed=1)
+        self.assertIn("route", generator.zones)
+        for zone in generator.zones:
+            generator.encounter(zone)
+
+    def test_bad_level_range(self):
+        with self.assertRaises(ValueError):
+            EncounterGenerator(self.dex, tables={"x": [{"species": "Pidgey", "weight": 1, "min_level": 5, "max_level": 2}]})
+
+    def test_encounter_at(self):
+        world = World(ChunkStore())
+        world.chunk(0, 0).zone = "meadow"
+        world.set_tile(1, 1, GRASS)
+        self.assertIsNone(self.generator.encounter_at(world, 0, 0, rate=1.0)) # Not grass
+        self.assertEqual(world.tile(0, 0), PATH)
+        self.assertIsNotNone(self.generator.encounter_at(world, 1, 1, rate=1.0))
+        self.assertIsNone(self.generator.encounter_at(world, 1, 1, rate=0.0))
+
+
+if __name__ == '__main__':
+    unittest.main()
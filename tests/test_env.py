@@ -0,0 +1,111 @@
+# tests/test_env.py
+import unittest
+from game.battle import Battle
+from game.classes.move import Move
+from game.classes.player import Player
+from game.classes.pokemon import Pokemon
+
+try:
+    import numpy as np
+    from game.env import BattleEnv, VectorBattleEnv, MAX_MOVES, OBS_HEADER, OBS_SIZE
+except ImportError: # NumPy is optional for the core game
+    np = None
+
+def make_pokemon(name: str, attack: int = 30, n_moves: int = 2) -> Pokemon:
+    pokemon = Pokemon(species_name=name, types=["Normal"], level=20, max_hp=60, attack=attack, defense=30, speed=50)
+    pokemon.moves = [Move(name="Tackle", type="Normal", category="Physical", power=40, accuracy=100, pp=35),
+                     Move(name="Growl", type="Normal", category="Status", power=0, accuracy=100, pp=40)][:n_moves]
+    return pokemon
+
+@unittest.skipIf(np is None, "NumPy is not installed")
+class TestBattleEnv(unittest.TestCase):
+
+    def test_episode(self):
+        env = BattleEnv.for_matchup(make_pokemon("Hero", attack=60), make_pokemon("Foe", n_moves=1), seed=3)
+        obs, info = env.reset()
+        self.assertEqual(obs.shape, (OBS_SIZE,))
+        self.assertEqual(obs.dtype, np.float32)
+        self.assertEqual(obs[0], 1.0)
+        self.assertEqual(env.action_mask().tolist(), [True, True, False, False])
+        self.assertEqual(info["turn"], 0)
+
+        terminated = truncated = False
+        steps = 0
+        while not (terminated or truncated):
+            obs, reward, terminated, truncated, info = env.step(0)
+            steps += 1
+        # Hero needs at most 3 Tackles, Foe at least 4
+        self.assertTrue(terminated)
+        self.assertEqual(reward, 1.0)
+        self.assertEqual(obs[1], 0.0)
+        self.assertEqual(info["turn"], steps)
+        with self.assertRaises(ValueError):
+            env.step(0)
+
+    def test_illegal_action(self):
+        env = BattleEnv.for_matchup(make_pokemon("Hero"), make_pokemon("Foe"))
+        with self.assertRaises(ValueError):
+            env.step(0) # Before reset
+        env.reset()
+        for action in (2, MAX_MOVES, -1):
+            with self.assertRaises(ValueError):
+                env.step(action)
+
+    def test_truncation_and_reproducibility(self):
+        env = BattleEnv.for_matchup(make_pokemon("Hero"), make_pokemon("Foe"), max_turns=3)
+        env.reset(seed=5)
+        results = [env.step(1)[1:4] for _ in range(3)] # Growl never ends it
+        self.assertEqual(results[-1], (0.0, False, True))
+        first_seed = env.battle.seed
+        env.reset(seed=5)
+        self.assertEqual(env.battle.seed, first_seed)
+
+    def test_move_features_follow_replacements(self):
+        """After a forced replacement the observation describes the new active Pokemon's moves."""
+        def make_battle(seed):
+            player = Player("Agent")
+            player.team = [make_pokemon("Weak", attack=5, n_moves=1), make_pokemon("Backup", n_moves=2)]
+            player.team[0].max_hp = player.team[0].current_hp = 1
+            return Battle(player, make_pokemon("Foe", attack=60, n_moves=1), headless=True, seed=seed)
+
+        env = BattleEnv(make_battle, seed=1)
+        obs, _ = env.reset()
+        self.assertEqual(obs[OBS_HEADER + 3], 0.0) # Weak has no second move
+        obs = env.step(0)[0]
+        self.assertEqual(env.battle.state.active[0], 1)
+        self.assertEqual(obs[OBS_HEADER + 3], 1.0) # Backup's Growl always hits
+        self.assertEqual(env.action_mask().tolist(), [True, True, False, False])
+
+
+@unittest.skipIf(np is None, "NumPy is not installed")
+class TestVectorBattleEnv(unittest.TestCase):
+
+    def test_batched_step_and_autoreset(self):
+        k = 8
+        vec = VectorBattleEnv.for_matchups([(make_pokemon(f"Hero{i}", attack=60), make_pokemon(f"Foe{i}"))
+                                            for i in range(k)], seed=1)
+        obs, infos = vec.reset()
+        self.assertEqual(obs.shape, (k, OBS_SIZE))
+        self.assertEqual(vec.action_masks().shape, (k, MAX_MOVES))
+
+        finished = np.zeros(k, dtype=bool)
+        for _ in range(20):
+            obs, rewards, terminated, truncated, infos = vec.step(np.zeros(k, dtype=np.int64))
+            self.assertEqual(rewards.dtype, np.float32)
+            for i in np.flatnonzero(terminated):
+                self.assertEqual(rewards[i], 1.0)
+                self.assertEqual(infos[i]["final_observation"][1], 0.0)
+                self.assertEqual(obs[i][1], 1.0) # Already the next episode
+                self.assertEqual(infos[i]["turn"], 0)
+            finished |= terminated
+        self.assertTrue(finished.all())
+
+    def test_wrong_action_count(self):
+        vec = VectorBattleEnv.for_matchups([(make_pokemon("Hero"), make_pokemon("Foe"))])
+        vec.reset()
+        with self.assertRaises(ValueError):
+            vec.step([0, 0])
+
+
+if __name__ == '__main__':
+    unittest.main()
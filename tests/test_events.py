@@ -0,0 +1,117 @@
+# tests/test_events.py
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+from game.battle import Battle
+from game.classes.move import Move
+from game.classes.player import Player
+from game.classes.pokemon import Pokemon
+from game.events import (EventBus, EventRecorder, EventLogWriter, read_event_log, BattleStarted, TurnStarted,
+                         _last_record)
+from game.state import PLAYER
+
+def make_battle(events: EventBus | None = None) -> Battle:
+    with patch('builtins.print'):
+        player = Player("Tester")
+        hero = Pokemon(species_name="Hero", types=["Normal"], level=20, max_hp=60, attack=60, defense=30, speed=60)
+        hero.moves = [Move(name="Tackle", type="Normal", category="Physical", power=40, accuracy=100, pp=35)]
+        player.add_pokemon(hero)
+    foe = Pokemon(species_name="Foe", types=["Normal"], level=20, max_hp=60, attack=30, defense=30, speed=50)
+    foe.moves = [Move(name="Scratch", type="Normal", category="Physical", power=40, accuracy=100, pp=35)]
+    return Battle(player, foe, headless=True, seed=9, events=events)
+
+class TestBattleEvents(unittest.TestCase):
+
+    def test_battle_publishes_typed_events(self):
+        bus = EventBus()
+        recorder = bus.subscribe(EventRecorder())
+        battle = make_battle(bus)
+        battle.run_battle()
+
+        kinds = [event.kind for event in recorder.events]
+        self.assertEqual(kinds[0], "battle_start")
+        self.assertEqual(kinds[-2:], ["faint", "battle_end"])
+        self.assertEqual(recorder.events[0].seed, 9)
+        self.assertEqual(len(recorder.of_kind("turn_start")), battle.turn_count)
+        self.assertEqual(recorder.events[-1].winner, PLAYER)
+        # Damage events track the defender's HP
+        last_damage = recorder.of_kind("damage")[-1]
+        self.assertEqual(last_damage.hp_left, 0)
+        self.assertGreaterEqual(sum(e.amount for e in recorder.of_kind("damage") if e.side == 1), 60)
+
+    def test_no_events_without_subscribers(self):
+        with patch.object(EventBus, "publish") as publish:
+            make_battle().run_battle()
+        publish.assert_not_called()
+
+    def test_unsubscribe(self):
+        bus = EventBus()
+        recorder = bus.subscribe(EventRecorder())
+        bus.unsubscribe(recorder)
+        make_battle(bus).run_battle()
+        self.assertEqual(recorder.events, [])
+
+    def test_xp_events(self):
+        bus = EventBus()
+        recorder = bus.subscribe(EventRecorder())
+        pokemon = Pokemon(species_name="Hero", types=["Normal"], level=5, max_hp=20, attack=10, defense=10, speed=10)
+        with patch('builtins.print'):
+            pokemon.gain_xp(250, events=bus)
+        self.assertEqual([e.kind for e in recorder.events], ["xp", "level_up", "level_up"])
+        self.assertEqual(recorder.events[-1].level, 7)
+
+
+class TestEventLogWriter(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+    def test_batches_writes(self):
+        writer = EventLogWriter(self.tmp.name, batch_size=3)
+        writer(BattleStarted(1, "Hero", "Foe"))
+        writer(TurnStarted(1, 60, 60))
+        self.assertEqual(writer.paths, []) # Still buffered
+        writer(TurnStarted(2, 50, 40))
+        self.assertEqual(len(writer.paths), 1)
+        writer.close()
+        records = list(read_event_log(writer.paths[0]))
+        self.assertEqual(records[0], {"event": "battle_start", "seed": 1, "player": "Hero", "opponent": "Foe", "episode": 0})
+        self.assertEqual(records[2]["opponent_hp"], 40)
+
+    def test_rotation_and_episodes(self):
+        bus = EventBus()
+        with EventLogWriter(self.tmp.name, max_bytes=2000, batch_size=16) as writer:
+            bus.subscribe(writer)
+            for _ in range(10):
+                make_battle(bus).run_battle()
+        self.assertGreater(len(writer.paths), 1)
+        self.assertEqual(sorted(os.listdir(self.tmp.name)), [os.path.basename(p) for p in writer.paths])
+        records = [r for path in writer.paths for r in read_event_log(path)]
+        self.assertEqual(sum(r["event"] == "battle_end" for r in records), 10)
+        self.assertEqual(records[-1]["episode"], 9)
+
+    def test_new_writer_continues_numbering(self):
+        with EventLogWriter(self.tmp.name, batch_size=1) as first:
+            first(BattleStarted(1, "Hero", "Foe"))
+        with EventLogWriter(self.tmp.name, batch_size=1) as second:
+            second(BattleStarted(2, "Hero", "Foe"))
+        self.assertEqual([os.path.basename(p) for p in first.paths + second.paths],
+                         ["events-000000.jsonl", "events-000001.jsonl"])
+        self.assertEqual(next(read_event_log(first.paths[0]))["seed"], 1) # Not overwritten
+
+    def test_new_writer_continues_episodes(self):
+        with EventLogWriter(self.tmp.name, batch_size=1) as first:
+            for seed in range(3):
+                first(BattleStarted(seed, "Hero", "Foe"))
+        with open(first.paths[0], "ab") as f:
+            f.write(b'{"kind":"battle_sta') # Cut off by a crash
+        with EventLogWriter(self.tmp.name, batch_size=1) as second:
+            second(BattleStarted(3, "Hero", "Foe"))
+        self.assertEqual(next(read_event_log(second.paths[0]))["episode"], 3)
+        self.assertEqual(_last_record(first.paths[0], block_size=4)["seed"], 2) # Records span several blocks
+
+
+if __name__ == '__main__':
+    unittest.main()
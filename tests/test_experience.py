@@ -0,0 +1,104 @@
+# tests/test_experience.py
+import random
+import unittest
+from unittest.mock import patch
+from game.classes.pokemon import Pokemon
+from game.experience import CURVES, FAST, MEDIUM_SLOW, MAX_LEVEL, SLOW, award_xp, flat_curve
+
+def make_pokemon(level: int = 5) -> Pokemon:
+    return Pokemon(species_name="Testachu", types=["Electric"], level=level, max_hp=40, attack=6, defense=4, speed=7)
+
+def step_by_step(curve, level: int, xp: int, amount: int) -> tuple[int, int]:
+    """Reference implementation: the original one-level-at-a-time loop."""
+    xp += amount
+    while level < MAX_LEVEL and xp >= curve.xp_to_next(level):
+        xp -= curve.xp_to_next(level)
+        level += 1
+    return (level, 0) if level >= MAX_LEVEL else (level, xp)
+
+class TestExperienceCurve(unittest.TestCase):
+
+    def test_tables_increase(self):
+        for curve in list(CURVES.values()) + [flat_curve(100)]:
+            self.assertEqual(curve.totals[1], 0)
+            self.assertTrue(all(curve.xp_to_next(level) > 0 for level in range(1, MAX_LEVEL)))
+        self.assertEqual(SLOW.totals[MAX_LEVEL], 1_250_000)
+        self.assertEqual(FAST.xp_to_next(MAX_LEVEL), 0)
+
+    def test_advance_matches_loop(self):
+        rng = random.Random(7)
+        for curve in (FAST, MEDIUM_SLOW, SLOW, flat_curve(100)):
+            for _ in range(300):
+                level = rng.randint(1, MAX_LEVEL - 1)
+                xp = rng.randrange(curve.xp_to_next(level))
+                amount = rng.choice([1, 50, 5_000, 200_000, 2_000_000])
+                self.assertEqual(curve.advance(level, xp, amount), step_by_step(curve, level, xp, amount))
+
+    def test_flat_curves_are_shared(self):
+        self.assertIs(flat_curve(100), flat_curve(100))
+
+
+class TestGainXp(unittest.TestCase):
+
+    def test_curve_assignment(self):
+        pokemon = make_pokemon(level=10)
+        pokemon.curve = SLOW
+        with patch('builtins.print'):
+            gained = pokemon.gain_xp(SLOW.totals[20] - SLOW.totals[10] + 7)
+        self.assertEqual((gained, pokemon.level, pokemon.xp), (10, 20, 7))
+        self.assertEqual(pokemon.xp_to_next_level(), SLOW.xp_to_next(20) - 7)
+
+    def test_multi_level_growth_in_one_step(self):
+        pokemon = make_pokemon(level=1)
+        with patch('builtins.print') as mock_print:
+            pokemon.gain_xp(10_000, rng=random.Random(5))
+        self.assertEqual(pokemon.level, MAX_LEVEL)
+        self.assertLess(mock_print.call_count, 6) # Not one message per level
+        levels = MAX_LEVEL - 1
+        self.assertTrue(40 + 3 * levels <= pokemon.max_hp <= 40 + 4 * levels)
+        self.assertTrue(6 + levels <= pokemon.attack <= 6 + 2 * levels)
+        self.assertEqual(pokemon.attack - 6, pokemon.speed - 7) # One shared bonus for attack, defense and speed
+
+    def test_growth_distribution_matches_single_steps(self):
+        """Multi-level growth should average the same as repeated single level ups."""
+        rng = random.Random(11)
+        bulk, single = make_pokemon(level=1), make_pokemon(level=1)
+        with patch('builtins.print'):
+            for _ in range(200):
+                bulk._apply_growth(10, rng)
+                for _ in range(10):
+                    single._apply_growth(1, rng)
+        self.assertAlmostEqual(bulk.max_hp / single.max_hp, 1.0, delta=0.01)
+        self.assertAlmostEqual(bulk.attack / single.attack, 1.0, delta=0.03)
+
+    def test_quiet_mode(self):
+        pokemon = make_pokemon()
+        with patch('builtins.print') as mock_print:
+            pokemon.gain_xp(250, verbose=False)
+        mock_print.assert_not_called()
+        self.assertEqual(pokemon.level, 7)
+
+
+class TestAwardXp(unittest.TestCase):
+
+    def test_team_award(self):
+        team = [make_pokemon(level) for level in (5, 10, 99)]
+        team.append(make_pokemon())
+        team[-1].current_hp = 0 # Fainted: skipped
+        with patch('builtins.print') as mock_print:
+            gained = award_xp(team, 250, rng=random.Random(1))
+        mock_print.assert_not_called()
+        self.assertEqual([p.level for p in team], [7, 12, 100, 5])
+        self.assertEqual(gained, 5)
+
+    def test_per_pokemon_amounts(self):
+        roster = [make_pokemon() for _ in range(1000)]
+        award_xp(roster, [i for i in range(1000)], rng=random.Random(2))
+        self.assertEqual(roster[999].level, 14)
+        self.assertEqual(roster[999].xp, 99)
+        with self.assertRaises(ValueError):
+            award_xp(roster, [1, 2])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,94 @@
+# tests/test_instrumentation.py
+import asyncio
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+from game.battle import Battle
+from game.classes.move import Move
+from game.classes.player import Player
+from game.classes.pokemon import Pokemon
+from game.events import EventBus
+from game.instrumentation import BattleStats, profiled
+from game.state import PLAYER, OPPONENT
+
+def make_battle(seed: int = 3, **battle_kwargs) -> Battle:
+    with patch('builtins.print'):
+        player = Player("Tester")
+        hero = Pokemon(species_name="Hero", types=["Normal"], level=20, max_hp=60, attack=30, defense=30, speed=60)
+        hero.moves = [Move(name="Tackle", type="Normal", category="Physical", power=40, accuracy=80, pp=35)]
+        player.add_pokemon(hero)
+    foe = Pokemon(species_name="Foe", types=["Normal"], level=20, max_hp=60, attack=30, defense=30, speed=50)
+    foe.moves = [Move(name="Scratch", type="Normal", category="Physical", power=40, accuracy=80, pp=35)]
+    return Battle(player, foe, headless=True, seed=seed, **battle_kwargs)
+
+class TestBattleStats(unittest.TestCase):
+
+    def test_counts_one_battle(self):
+        stats = BattleStats()
+        battle = make_battle(stats=stats)
+        battle.run_battle()
+        turns = battle.turn_count
+        self.assertEqual(stats.battles, 1)
+        self.assertEqual(stats.phase_calls["turn_order"], turns)
+        self.assertEqual(stats.phase_calls["execution"], turns)
+        self.assertEqual(stats.decisions, [turns, turns])
+        self.assertEqual(stats.phase_calls["move_selection"], 2 * turns)
+        self.assertEqual(stats.hits, sum(stats.damage_histogram.values()))
+        self.assertGreater(stats.hits + stats.misses, 0)
+        self.assertGreater(stats.phase_seconds["execution"], 0)
+        self.assertIn("turn_order", stats.summary())
+
+    def test_batch_aggregation_and_results_unchanged(self):
+        stats = BattleStats()
+        for seed in range(5):
+            plain, instrumented = make_battle(seed), make_battle(seed, stats=stats)
+            plain.run_battle()
+            instrumented.run_battle()
+            self.assertEqual(instrumented.snapshot(), plain.snapshot())
+        self.assertEqual(stats.battles, 5)
+        self.assertEqual(stats.to_dict()["battles"], 5)
+
+    def test_shared_event_bus_counts_each_move_once(self):
+        shared, separate, events = BattleStats(), BattleStats(), EventBus()
+        for seed in range(3):
+            make_battle(seed, stats=shared, events=events).run_battle()
+            make_battle(seed, stats=separate).run_battle()
+        self.assertEqual(len(events._subscribers), 1)
+        self.assertEqual((shared.hits, shared.misses), (separate.hits, separate.misses))
+        self.assertEqual(shared.damage_histogram, separate.damage_histogram)
+
+    def test_disabled_battles_are_not_wrapped(self):
+        battle = make_battle()
+        self.assertNotIn("_get_turn_order", vars(battle))
+        self.assertFalse(battle.events.active)
+
+    def test_async_decision_latency(self):
+        async def slow(battle):
+            await asyncio.sleep(0.01)
+            return battle.player_active_pokemon.moves[0]
+
+        stats = BattleStats()
+        battle = make_battle(stats=stats)
+        asyncio.run(battle.run_battle_async(slow))
+        self.assertEqual(stats.decisions, [battle.turn_count, battle.turn_count])
+        self.assertGreaterEqual(stats.mean_decision_seconds(PLAYER), 0.009)
+        self.assertLess(stats.mean_decision_seconds(OPPONENT), 0.009)
+
+
+class TestProfiled(unittest.TestCase):
+
+    def test_dumps_cpu_and_memory_profiles(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            with profiled(tmp, name="batch", memory=True) as report:
+                for seed in range(3):
+                    make_battle(seed).run_battle()
+            self.assertIsNotNone(report.cpu)
+            self.assertTrue(report.memory)
+            self.assertEqual(sorted(os.listdir(tmp)), ["batch.cpu.txt", "batch.memory.txt", "batch.prof"])
+            with open(os.path.join(tmp, "batch.cpu.txt")) as f:
+                self.assertIn("run_battle", f.read())
+
+
+if __name__ == '__main__':
+    unittest.main()
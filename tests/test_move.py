@@ -52,5 +52,11 @@ class TestMove(unittest.TestCase):
         expected_growl_str = "Growl (Normal) Cat:Status Pow:0 Acc:100 PP:40"
         self.assertEqual(str(self.growl), expected_growl_str)
 
+    def test_slots(self):
+        """Moves should have a fixed attribute layout."""
+        self.assertFalse(hasattr(self.tackle, "__dict__"))
+        with self.assertRaises(AttributeError):
+            self.tackle.current_pp = 10
+
 if __name__ == '__main__':
     unittest.main() 
\ No newline at end of file
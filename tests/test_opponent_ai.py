@@ -0,0 +1,90 @@
+# tests/test_opponent_ai.py
+import unittest
+from unittest.mock import patch
+from game.battle import Battle
+from game.classes.move import Move
+from game.classes.player import Player
+from game.classes.pokemon import Pokemon
+from game.opponent_ai import SearchOpponent, damage_outcomes
+
+GROWL = Move(name="Growl", type="Normal", category="Status", power=0, accuracy=100, pp=40)
+TACKLE = Move(name="Tackle", type="Normal", category="Physical", power=40, accuracy=100, pp=35)
+SLAM = Move(name="Slam", type="Normal", category="Physical", power=80, accuracy=75, pp=20)
+
+def make_battle(opponent_moves: list[Move], ai: SearchOpponent, player_hp: int | None = None) -> Battle:
+    with patch('builtins.print'):
+        player = Player("Tester")
+        hero = Pokemon(species_name="Hero", types=["Normal"], level=20, max_hp=60, attack=30, defense=30, speed=40)
+        hero.moves = [TACKLE]
+        player.add_pokemon(hero)
+    if player_hp is not None:
+        hero.current_hp = player_hp
+    foe = Pokemon(species_name="Foe", types=["Normal"], level=20, max_hp=60, attack=30, defense=30, speed=60)
+    foe.moves = opponent_moves
+    return Battle(player, foe, headless=True, seed=1, opponent_move_chooser=ai)
+
+class TestDamageOutcomes(unittest.TestCase):
+
+    def test_probabilities_sum_to_one(self):
+        attacker = Pokemon(species_name="A", types=["Normal"], level=20, max_hp=60, attack=30, defense=30, speed=40)
+        outcomes = damage_outcomes(attacker, attacker, SLAM, rolls=4)
+        self.assertAlmostEqual(sum(chance for _, chance in outcomes), 1.0)
+        self.assertEqual(outcomes[0], (0, 0.25)) # Miss chance
+        self.assertEqual(damage_outcomes(attacker, attacker, GROWL), [(0, 1.0)])
+
+class TestSearchOpponent(unittest.TestCase):
+
+    def test_prefers_damage_over_status(self):
+        """Unlike the default AI (first move), the search should not waste turns on Growl."""
+        ai = SearchOpponent(max_depth=2)
+        battle = make_battle([GROWL, TACKLE], ai)
+        self.assertIs(ai(battle), TACKLE)
+        self.assertEqual(ai.last_stats["depth"], 2)
+
+    def test_takes_sure_ko_over_risky_power(self):
+        """When Tackle is a guaranteed KO, the accurate move beats the stronger inaccurate one."""
+        ai = SearchOpponent(max_depth=1)
+        battle = make_battle([SLAM, TACKLE], ai, player_hp=5)
+        self.assertIs(ai.choose_move(battle), TACKLE)
+
+    def test_node_budget_limits_depth(self):
+        """A tiny node budget should stop deepening but still return a move."""
+        ai = SearchOpponent(max_depth=6, node_budget=50)
+        battle = make_battle([GROWL, TACKLE, SLAM], ai)
+        self.assertIsNotNone(ai(battle))
+        self.assertLess(ai.last_stats["depth"], 6)
+        self.assertGreaterEqual(ai.last_stats["depth"], 1)
+        timed = SearchOpponent(max_depth=50, node_budget=None, time_budget=0.01)
+        timed(battle)
+        self.assertLess(timed.last_stats["depth"], 50)
+
+    def test_transposition_table_reused(self):
+        ai = SearchOpponent(max_depth=3)
+        battle = make_battle([GROWL, TACKLE, SLAM], ai)
+        ai(battle)
+        first_nodes = ai.last_stats["nodes"]
+        self.assertGreater(ai.last_stats["table_entries"], 0)
+        ai(battle) # Same position: answered mostly from the table
+        self.assertLess(ai.last_stats["nodes"], first_nodes)
+
+    def test_table_follows_the_matchup(self):
+        """Values cached for one matchup are reused by an identical one and dropped when stats change."""
+        ai = SearchOpponent(max_depth=3)
+        ai(make_battle([GROWL, TACKLE, SLAM], ai))
+        first_nodes = ai.last_stats["nodes"]
+        ai(make_battle([GROWL, TACKLE, SLAM], ai)) # New battle, same stats
+        self.assertLess(ai.last_stats["nodes"], first_nodes)
+
+        stronger = make_battle([GROWL, TACKLE, SLAM], ai)
+        stronger.opponent.attack = 90 # E.g. after levelling up
+        fresh = SearchOpponent(max_depth=3)
+        self.assertIs(ai(stronger), fresh(stronger))
+        self.assertEqual(ai.last_stats, {**fresh.last_stats, "seconds": ai.last_stats["seconds"]})
+
+    def test_full_battle(self):
+        battle = make_battle([GROWL, TACKLE, SLAM], SearchOpponent(max_depth=2, node_budget=5_000))
+        self.assertIsNotNone(battle.run_battle())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,64 @@
+# tests/test_output.py
+import io
+import os
+import tempfile
+import unittest
+from game.output import BufferedSink, FileSink, NullSink, SleepPacer, NoPacer
+
+class TestOutputSinks(unittest.TestCase):
+
+    def test_buffered_sink_joins_partial_lines(self):
+        """Text written with end='' should be joined with the next write."""
+        sink = BufferedSink()
+        sink.write("Pika uses Tackle!", end="")
+        sink.write(" - It hits!", end="")
+        sink.write(" - Dealt 5 damage.")
+        sink.write("Rattata HP: 10/15")
+        self.assertEqual(sink.lines, ["Pika uses Tackle! - It hits! - Dealt 5 damage.", "Rattata HP: 10/15"])
+
+    def test_buffered_sink_leading_newline_and_getvalue(self):
+        """A leading newline produces an empty line, like print()."""
+        sink = BufferedSink()
+        sink.write("\n--- Turn 1 ---")
+        sink.write("pending", end="")
+        self.assertEqual(sink.lines, ["", "--- Turn 1 ---"])
+        self.assertEqual(sink.getvalue(), "\n--- Turn 1 ---\npending")
+        sink.clear()
+        self.assertEqual(sink.getvalue(), "")
+
+    def test_file_sink_with_path_and_stream(self):
+        """FileSink should accept both a path and an open stream."""
+        stream = io.StringIO()
+        FileSink(stream).write("hello", end="!")
+        self.assertEqual(stream.getvalue(), "hello!")
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "battle.log")
+            sink = FileSink(path)
+            sink.write("line one")
+            sink.close()
+            with open(path, encoding="utf-8") as f:
+                self.assertEqual(f.read(), "line one\n")
+
+    def test_null_sink_discards(self):
+        """NullSink should accept writes without error."""
+        NullSink().write("ignored")
+
+
+class TestPacers(unittest.TestCase):
+
+    def test_sleep_pacer_uses_injected_clock(self):
+        """SleepPacer should scale pauses and call the injected sleep function."""
+        calls = []
+        pacer = SleepPacer(scale=0.5, sleep=calls.append)
+        pacer.pause(1.0)
+        pacer.pause(0)
+        self.assertEqual(calls, [0.5])
+
+    def test_no_pacer(self):
+        """NoPacer should return immediately."""
+        NoPacer().pause(100)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,4 +1,6 @@
 # tests/test_pokemon.py
+import pickle
+import random
 import unittest
 import uuid
 from unittest.mock import patch # Used to control randomness in stat gain tests
@@ -19,7 +21,7 @@ class TestPokemon(unittest.TestCase):
         }
         self.pokemon = Pokemon(**self.pokemon_data)
         # Ensure consistent XP threshold for tests
-        self.pokemon.XP_PER_LEVEL = 100
+        self.pokemon.xp_per_level = 100
 
     def test_initialization(self):
         """Test that Pokémon attributes are initialized correctly."""
@@ -44,6 +46,39 @@ class TestPokemon(unittest.TestCase):
         pokemon2 = Pokemon(**self.pokemon_data)
         self.assertNotEqual(self.pokemon.id, pokemon2.id)
 
+    def test_uid_counter_and_lazy_uuid(self):
+        """Cheap integer IDs should increase monotonically; the UUID is stable once created."""
+        pokemon2 = Pokemon(**self.pokemon_data)
+        self.assertGreater(pokemon2.uid, self.pokemon.uid)
+        self.assertIsNone(pokemon2._uuid) # Not generated until asked for
+        first = pokemon2.id
+        self.assertIs(pokemon2.id, first)
+        restored = uuid.uuid4()
+        pokemon2.id = restored
+        self.assertEqual(pokemon2.id, restored)
+
+    def test_slots_and_pickle(self):
+        """Pokemon should have no per-instance __dict__ and survive pickling."""
+        self.assertFalse(hasattr(self.pokemon, "__dict__"))
+        with self.assertRaises(AttributeError):
+            self.pokemon.not_a_field = 1
+        self.pokemon.nickname = "Testy"
+        clone = pickle.loads(pickle.dumps(self.pokemon))
+        self.assertEqual(str(clone), str(self.pokemon))
+        self.assertEqual((clone.uid, clone.id, clone.type_key), (self.pokemon.uid, self.pokemon.id, self.pokemon.type_key))
+
+    def test_xp_per_level_class_default_and_override(self):
+        """XP_PER_LEVEL stays a plain class attribute; a Pokémon can override it for itself."""
+        self.assertEqual(Pokemon.XP_PER_LEVEL, 100)
+        other = Pokemon(**self.pokemon_data)
+        with patch.object(Pokemon, "XP_PER_LEVEL", 50): # Tuning levelling for everyone
+            self.assertEqual(other.xp_per_level, 50)
+            self.assertEqual(self.pokemon.xp_per_level, 100) # Overridden in setUp
+            other.gain_xp(50)
+        self.assertEqual(other.level, 6)
+        self.pokemon.xp_per_level = None
+        self.assertEqual(self.pokemon.xp_per_level, Pokemon.XP_PER_LEVEL)
+
     def test_is_fainted(self):
         """Test the is_fainted method."""
         self.assertFalse(self.pokemon.is_fainted()) # Should not be fainted initially
@@ -166,6 +201,15 @@ class TestPokemon(unittest.TestCase):
         # Check current HP also increased by the max HP gain
         self.assertEqual(self.pokemon.current_hp, initial_current_hp + 3)
 
+    def test_gain_xp_seeded_rng_is_reproducible(self):
+        """Stat gains drawn from the same seeded stream should match."""
+        other = Pokemon(**self.pokemon_data)
+        self.pokemon.gain_xp(500, rng=random.Random(3))
+        other.gain_xp(500, rng=random.Random(3))
+        self.assertEqual(self.pokemon.level, 10)
+        self.assertEqual((self.pokemon.max_hp, self.pokemon.attack, self.pokemon.defense, self.pokemon.speed),
+                         (other.max_hp, other.attack, other.defense, other.speed))
+
 
 if __name__ == '__main__':
     unittest.main() 
\ No newline at end of file
@@ -0,0 +1,102 @@
+# tests/test_render.py
+import io
+import unittest
+from unittest.mock import patch
+from game.battle import Battle
+from game.classes.move import Move
+from game.classes.player import Player
+from game.classes.pokemon import Pokemon
+from game.output import BufferedSink, NoPacer
+from game.render import TerminalRenderer, hp_bar
+
+def make_battle(output, seed: int = 7) -> Battle:
+    player = Player("Ash")
+    pika = Pokemon(species_name="Pikachu", types=["Electric"], level=10, max_hp=40, attack=20, defense=15, speed=30)
+    pika.moves = [Move(name="Tackle", type="Normal", category="Physical", power=40, accuracy=90, pp=35)]
+    player.team.append(pika)
+    rattata = Pokemon(species_name="Rattata", types=["Normal"], level=8, max_hp=30, attack=15, defense=10, speed=25)
+    rattata.moves = [Move(name="Tackle", type="Normal", category="Physical", power=40, accuracy=90, pp=35)]
+    return Battle(player, rattata, output=output, pacer=NoPacer(), seed=seed,
+                  player_move_chooser=Battle._first_move_chooser)
+
+class CountingStream(io.StringIO):
+    """StringIO that remembers each write separately."""
+
+    def __init__(self):
+        super().__init__()
+        self.writes: list[str] = []
+
+    def write(self, text: str) -> int:
+        self.writes.append(text)
+        return super().write(text)
+
+class TestTerminalRenderer(unittest.TestCase):
+
+    def test_hp_bar(self):
+        self.assertEqual(hp_bar(10, 10, width=4), "[####]")
+        self.assertEqual(hp_bar(1, 100, width=4), "[#---]") # Any HP left shows
+        self.assertEqual(hp_bar(0, 10, width=4), "[----]")
+
+    def test_non_tty_matches_plain_output(self):
+        """Without a TTY the text is identical to a plain sink, written once per frame."""
+        plain = BufferedSink()
+        make_battle(plain).run_battle()
+        stream = CountingStream()
+        renderer = TerminalRenderer(stream)
+        self.assertFalse(renderer.tty)
+        make_battle(renderer).run_battle()
+        renderer.close()
+        self.assertEqual(stream.getvalue(), plain.getvalue())
+        self.assertEqual(len(stream.writes), renderer.frames_written)
+        self.assertLess(len(stream.writes), len(plain.lines))
+
+    def test_tty_redraws_only_changed_rows(self):
+        stream = CountingStream()
+        renderer = TerminalRenderer(stream, tty=True, size=(80, 24))
+        battle = make_battle(renderer)
+        battle.output.frame(battle)
+        first = stream.writes[-1]
+        self.assertIn("\x1b[5;24r", first) # Log scrolls below the panel
+        for row in range(1, 5):
+            self.assertIn(f"\x1b[{row};1H", first)
+        self.assertIn("1:Tackle PP 35", first)
+
+        battle.output.frame(battle) # Nothing changed: nothing to send
+        self.assertEqual(len(stream.writes), 1)
+
+        battle.apply_turn(battle.player_active_pokemon.moves[0], battle.opponent.moves[0])
+        battle.output.frame(battle)
+        update = "".join(stream.writes[1:]) # Every frame drawn during the turn
+        self.assertIn("\x1b[4;1H--- Turn 1", update)
+        self.assertNotIn("\x1b[3;1H", update) # Move menu unchanged
+        self.assertIn("uses Tackle!", update)
+
+    def test_reprompts_are_on_screen_before_input(self):
+        stream = io.StringIO()
+        renderer = TerminalRenderer(stream, tty=True, size=(80, 24))
+        battle = make_battle(renderer)
+        battle.player_move_chooser = None # Interactive
+        answers = iter(["9", "x", "1"])
+        screens = []
+
+        def fake_input(prompt):
+            screens.append(stream.getvalue())
+            return next(answers)
+
+        with patch('builtins.input', fake_input):
+            battle._get_player_move_choice()
+        self.assertIn("1: Tackle", screens[0])
+        self.assertIn("Invalid choice.", screens[1])
+        self.assertIn("Invalid input.", screens[2])
+
+    def test_tty_battle_skips_turn_hp_lines(self):
+        stream = io.StringIO()
+        renderer = TerminalRenderer(stream, tty=True, size=(80, 24))
+        make_battle(renderer).run_battle()
+        renderer.close()
+        self.assertNotIn("Pikachu: 40/40 HP", stream.getvalue()) # Shown in the panel instead
+        self.assertTrue(stream.getvalue().startswith("\x1b[2J"))
+        self.assertIn("\x1b[r", stream.getvalue())
+
+if __name__ == '__main__':
+    unittest.main()
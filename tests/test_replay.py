@@ -0,0 +1,101 @@
+# tests/test_replay.py
+import random
+import unittest
+from unittest.mock import patch
+from game.battle import Battle
+from game.classes.move import Move
+from game.classes.player import Player
+from game.classes.pokemon import Pokemon
+from game.output import BufferedSink
+from game.replay import BattleReplay, ReplayMismatchError, replay_battle
+
+def make_sides() -> tuple[Player, Pokemon]:
+    """Evenly matched sides with speed ties and imperfect accuracy, so the RNG matters."""
+    with patch('builtins.print'):
+        player = Player("Tester")
+        alpha = Pokemon(species_name="Alpha", types=["Normal"], level=20, max_hp=60, attack=30, defense=30, speed=50)
+        alpha.moves = [Move(name="Tackle", type="Normal", category="Physical", power=40, accuracy=90, pp=35),
+                       Move(name="Slam", type="Normal", category="Physical", power=80, accuracy=60, pp=20)]
+        player.add_pokemon(alpha)
+    beta = Pokemon(species_name="Beta", types=["Normal"], level=20, max_hp=60, attack=30, defense=30, speed=50)
+    beta.moves = [Move(name="Scratch", type="Normal", category="Physical", power=40, accuracy=95, pp=35)]
+    return player, beta
+
+def alternate_moves(battle: Battle) -> Move:
+    """Player policy that switches between its two moves every turn."""
+    return battle.player_active_pokemon.moves[battle.turn_count % 2]
+
+class TestBattleReplay(unittest.TestCase):
+
+    def test_same_seed_same_battle(self):
+        """Two battles with the same seed and choices should play out identically."""
+        logs = []
+        for _ in range(2):
+            sink = BufferedSink()
+            player, beta = make_sides()
+            Battle(player, beta, output=sink, headless=True, seed=42,
+                   player_move_chooser=alternate_moves).run_battle()
+            logs.append(sink.lines)
+        self.assertEqual(logs[0], logs[1])
+
+    def test_record_and_replay(self):
+        """Replaying the recorded seed and move indices should reproduce the battle exactly."""
+        random.seed(5)
+        player, beta = make_sides()
+        sink = BufferedSink()
+        battle = Battle(player, beta, output=sink, player_move_chooser=alternate_moves, headless=True)
+        winner = battle.run_battle()
+        replay = BattleReplay.from_bytes(battle.replay.to_bytes())
+        self.assertEqual(replay, battle.replay)
+        self.assertEqual(replay.turn_count, battle.turn_count)
+        self.assertEqual(len(battle.replay.to_bytes()), 17 + 2 * battle.turn_count + 4) # + replacement count
+
+        player2, beta2 = make_sides()
+        replay_sink = BufferedSink()
+        replayed = replay_battle(replay, player2, beta2, output=replay_sink)
+        self.assertEqual(replay_sink.lines, sink.lines)
+        self.assertEqual(replayed.turn_count, battle.turn_count)
+        self.assertEqual((player2.team[0].current_hp, beta2.current_hp), (player.team[0].current_hp, beta.current_hp))
+        self.assertEqual(winner.species_name, (player2.team[0] if beta2.is_fainted() else beta2).species_name)
+
+    def test_stop_after_turn(self):
+        """Fast-forwarding should stop at the requested turn."""
+        player, beta = make_sides()
+        battle = Battle(player, beta, headless=True, seed=9, player_move_chooser=alternate_moves)
+        battle.run_battle()
+        self.assertGreater(battle.turn_count, 2)
+        player2, beta2 = make_sides()
+        partial = replay_battle(battle.replay, player2, beta2, stop_after_turn=2)
+        self.assertEqual(partial.turn_count, 2)
+        self.assertFalse(player2.team[0].is_fainted() or beta2.is_fainted())
+
+    def test_mismatched_pokemon(self):
+        replay = BattleReplay(1)
+        replay.record_turn(3, 0)
+        player, beta = make_sides()
+        with self.assertRaises(ReplayMismatchError):
+            replay_battle(replay, player, beta)
+
+    def test_invalid_data(self):
+        with self.assertRaises(ValueError):
+            BattleReplay(-1)
+        with self.assertRaises(ValueError):
+            BattleReplay.from_bytes(b"XXXX" + bytes(13))
+        data = BattleReplay(1, None).to_bytes()[:-4] + (5).to_bytes(4, "little")
+        with self.assertRaises(ValueError):
+            BattleReplay.from_bytes(data)
+
+    def test_replacements_are_little_endian(self):
+        """The replacement table has a fixed layout, whatever the machine's byte order."""
+        replay = BattleReplay(1)
+        replay.record_turn(0, 0)
+        replay.record_replacement(1, 1, 2)
+        data = replay.to_bytes()
+        self.assertEqual(data[-16:], bytes([1, 0, 0, 0, 1, 0, 0, 0, 1, 0, 0, 0, 2, 0, 0, 0]))
+        self.assertEqual(BattleReplay.from_bytes(data), replay)
+        with self.assertRaises(ValueError):
+            BattleReplay.from_bytes(data[:-1])
+
+
+if __name__ == '__main__':
+    unittest.main()
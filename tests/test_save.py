@@ -0,0 +1,120 @@
+# tests/test_save.py
+import json
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+from game.classes.player import Player
+from game.dex import get_default_dex
+from game.experience import SLOW, ExperienceCurve, flat_curve
+from game.save import (SaveError, SaveManager, decode_pokemon, dump_player, encode_pokemon,
+                       export_json, load_player, load_player_file, save_player)
+
+def make_player() -> Player:
+    dex = get_default_dex()
+    with patch('builtins.print'):
+        player = Player("Hero")
+        pika = dex.create_pokemon("Pikachu", level=12, nickname="Pika")
+        pika.xp = 42
+        pika.current_hp = 17
+        pika.status = "Paralyzed"
+        player.add_pokemon(pika)
+        player.add_pokemon(dex.create_pokemon("Bulbasaur", level=9))
+    return player
+
+def snapshot(pokemon) -> tuple:
+    return (pokemon.id, pokemon.species_id, pokemon.species_name, pokemon.nickname, pokemon.types, pokemon.level,
+            pokemon.xp, pokemon.max_hp, pokemon.current_hp, pokemon.attack, pokemon.defense, pokemon.speed,
+            pokemon.status, [str(move) for move in pokemon.moves])
+
+class TestSaveFormat(unittest.TestCase):
+
+    def test_pokemon_round_trip(self):
+        pokemon = make_player().team[0]
+        record = encode_pokemon(pokemon)
+        restored, offset = decode_pokemon(record)
+        self.assertEqual(offset, len(record))
+        self.assertEqual(snapshot(restored), snapshot(pokemon))
+
+    def test_experience_curve_round_trip(self):
+        pokemon = make_player().team[0]
+        for curve in (SLOW, flat_curve(250), None):
+            pokemon.curve = curve
+            restored, _ = decode_pokemon(encode_pokemon(pokemon))
+            self.assertIs(restored.curve, curve)
+        pokemon.curve = ExperienceCurve("custom", lambda n: n * 7)
+        with self.assertRaises(SaveError): # Could not be looked up again on load
+            encode_pokemon(pokemon)
+
+    def test_player_round_trip_and_file(self):
+        player = make_player()
+        restored = load_player(dump_player(player))
+        self.assertEqual(restored.name, "Hero")
+        self.assertEqual([snapshot(p) for p in restored.team], [snapshot(p) for p in player.team])
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "hero.sav")
+            save_player(path, player)
+            self.assertEqual([p.id for p in load_player_file(path).team], [p.id for p in player.team])
+
+    def test_corrupt_data(self):
+        data = dump_player(make_player())
+        with self.assertRaises(SaveError):
+            load_player(b"NOPE" + data[4:])
+        with self.assertRaises(SaveError):
+            load_player(data[:-3])
+
+    def test_json_export(self):
+        exported = json.loads(export_json(make_player()))
+        self.assertEqual(exported["team"][0]["nickname"], "Pika")
+        self.assertEqual(exported["team"][0]["moves"][0]["name"], "Thunder Shock")
+
+class TestSaveManager(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.directory = os.path.join(self.tmp.name, "slot1")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_deltas_only_contain_changed_pokemon(self):
+        player = make_player()
+        manager = SaveManager(self.directory)
+        first = manager.save(player)
+        self.assertTrue(first.endswith("snapshot.sav"))
+        self.assertIsNone(manager.save(player)) # Nothing changed
+
+        player.team[1].current_hp -= 5
+        delta = manager.save(player)
+        self.assertTrue(os.path.basename(delta).startswith("delta-"))
+        self.assertLess(os.path.getsize(delta), os.path.getsize(first))
+
+        restored = SaveManager(self.directory).load()
+        self.assertEqual([snapshot(p) for p in restored.team], [snapshot(p) for p in player.team])
+
+    def test_compaction_and_continuing_after_load(self):
+        player = make_player()
+        manager = SaveManager(self.directory, compact_every=2)
+        manager.save(player)
+        for hp in (10, 9):
+            player.team[0].current_hp = hp
+            manager.save(player)
+        self.assertEqual(len([f for f in os.listdir(self.directory) if f.startswith("delta-")]), 2)
+        player.team[0].current_hp = 8
+        self.assertTrue(manager.save(player).endswith("snapshot.sav")) # Compacted
+        self.assertEqual([f for f in os.listdir(self.directory) if f.startswith("delta-")], [])
+
+        resumed = SaveManager(self.directory, compact_every=2)
+        loaded = resumed.load()
+        self.assertEqual(loaded.team[0].current_hp, 8)
+        loaded.team.pop() # Release Bulbasaur
+        resumed.save(loaded)
+        self.assertEqual([p.species_name for p in SaveManager(self.directory).load().team], ["Pikachu"])
+
+    def test_missing_save(self):
+        with self.assertRaises(SaveError):
+            SaveManager(self.directory).load()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,178 @@
+# tests/test_server.py
+import asyncio
+import io
+import json
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+from game.server import GameServer, serve_stdio, serve_unix
+
+TEAM = [{"species": "Pikachu", "level": 20}, {"species": "Charmander", "level": 18}]
+RIVAL = [{"species": "Rattata", "level": 22}, {"species": "Pidgey", "level": 22}]
+
+def play(server: GameServer, session: str, turns: int) -> list[dict]:
+    return [server.handle({"op": "act", "session": session, "move": 0}) for _ in range(turns)]
+
+class TestGameServer(unittest.TestCase):
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        self.directory = self._tmp.name
+
+    def new_server(self, **kwargs) -> GameServer:
+        return GameServer(os.path.join(self.directory, "sessions"), **kwargs)
+
+    def start(self, server: GameServer, session: str, seed: int) -> dict:
+        self.assertTrue(server.handle({"op": "new_session", "session": session, "team": TEAM})["ok"])
+        return server.handle({"op": "start_battle", "session": session, "opponent": RIVAL, "trainer": "Rival",
+                              "seed": seed})
+
+    def test_eviction_and_rehydration_are_transparent(self):
+        """Sessions that went through the disk play out exactly like ones that never left memory."""
+        reference, pooled = self.new_server(), self.new_server(max_resident=1)
+        for server in (reference, pooled):
+            self.start(server, "a", seed=1)
+            self.start(server, "b", seed=2)
+        for _ in range(3): # Alternate so every request rehydrates the other session
+            for session in ("a", "b"):
+                self.assertEqual(play(pooled, session, 1), play(reference, session, 1))
+        self.assertEqual(pooled.resident_sessions, ["b"])
+        self.assertGreaterEqual(pooled.counters["rehydrations"], 5)
+        self.assertEqual(reference.counters["evictions"], 0)
+
+    def test_battle_to_the_end(self):
+        server = self.new_server()
+        self.start(server, "a", seed=3)
+        response = None
+        for _ in range(200):
+            response = server.handle({"op": "act", "session": "a", "move": 0})
+            if "result" in response:
+                break
+        self.assertIn(response["result"]["winner"], ("player", "opponent"))
+        self.assertNotIn("battle", server.handle({"op": "state", "session": "a"}))
+        wild = server.handle({"op": "start_battle", "session": "a", "zone": "route", "seed": 4})
+        if response["result"]["winner"] == "player":
+            self.assertEqual(wild["battle"]["opponent_remaining"], 1)
+
+    def test_restart_resumes_sessions(self):
+        server = self.new_server()
+        self.start(server, "a", seed=5)
+        before = play(server, "a", 2)[-1]
+        server.handle({"op": "shutdown"})
+        self.assertTrue(server.closed)
+        restarted = self.new_server()
+        state = restarted.handle({"op": "state", "session": "a"})
+        self.assertEqual((state["battle"], state["team"]), (before["battle"], before["team"]))
+        self.assertEqual(state["log"], []) # Already delivered before the restart
+
+    def test_idle_eviction(self):
+        server = self.new_server(idle_seconds=60)
+        self.start(server, "a", seed=6)
+        server.handle({"op": "new_session", "session": "b"})
+        server.evict_idle(now=server.session("b").last_used + 61)
+        self.assertEqual(server.resident_sessions, [])
+        self.assertEqual(server.handle({"op": "state", "session": "a"})["battle"]["turn"], 0)
+
+    def test_errors(self):
+        server = self.new_server()
+        self.start(server, "a", seed=7)
+        for request in ({"op": "nope"}, {"op": "state", "session": "missing"}, {"op": "state", "session": "../x"},
+                        {"op": "act", "session": "a", "move": 9}, {"op": "act", "session": "a", "switch": 0},
+                        {"op": "new_session", "session": "a"}, {"op": "start_battle", "session": "a"},
+                        {"op": "new_session", "team": [{"species": "Missingno"}]}, ["not", "an", "object"]):
+            response = server.handle(request)
+            self.assertFalse(response["ok"], request)
+            self.assertIn("error", response)
+        self.assertFalse(json.loads(server.handle_line("{oops"))["ok"])
+        self.assertEqual(server.handle({"op": "ping", "id": 12}), {"ok": True, "id": 12})
+        self.assertEqual(server.handle({"op": "state", "session": "a"})["battle"]["turn"], 0)
+
+    def test_bad_fields_are_rejected_up_front(self):
+        server = self.new_server(max_resident=1)
+        self.assertFalse(server.handle({"op": "new_session", "session": "n",
+                                        "team": [{"species": "Pikachu", "nickname": 5}]})["ok"])
+        self.start(server, "a", seed=8)
+        server.handle({"op": "end_session", "session": "a"})
+        self.assertTrue(server.handle({"op": "new_session", "session": "a", "team": TEAM})["ok"])
+        for seed in ("x", -1, 2**70, 1.5, True):
+            response = server.handle({"op": "start_battle", "session": "a", "zone": "route", "seed": seed})
+            self.assertFalse(response["ok"], seed)
+        self.assertTrue(server.handle({"op": "start_battle", "session": "a", "zone": "route", "seed": 2**64 - 1})["ok"])
+
+    def test_failed_eviction_keeps_the_session(self):
+        server = self.new_server(max_resident=1)
+        self.start(server, "a", seed=9)
+        with patch.object(server, "_encode", side_effect=RuntimeError("disk full")):
+            response = server.handle({"op": "new_session", "session": "b"})
+        self.assertFalse(response["ok"])
+        self.assertIn("disk full", response["error"])
+        self.assertEqual(server.resident_sessions, ["a"])
+        self.assertEqual(server.handle({"op": "state", "session": "a"})["battle"]["turn"], 0)
+        self.assertTrue(server.handle({"op": "new_session", "session": "b"})["ok"]) # Still serving
+
+    def test_damaged_session_files_are_save_errors(self):
+        server = self.new_server()
+        self.start(server, "a", seed=10)
+        play(server, "a", 2)
+        server.handle({"op": "shutdown"})
+        with open(server._path("a"), "rb") as f:
+            data = f.read()
+        # Cut mid-section, drop whole sections, and garble the replay
+        for damaged in (data[:-3], data[:len(data) - 4 - len(data) // 3], data[:-6] + b"\xff" * 6):
+            with open(server._path("a"), "wb") as f:
+                f.write(damaged)
+            response = self.new_server().handle({"op": "state", "session": "a"})
+            self.assertFalse(response["ok"])
+            self.assertNotIn("Internal error", response["error"])
+
+    def test_agent_picks_replacement(self):
+        server = self.new_server(max_resident=1)
+        team = [{"species": "Caterpie", "level": 3}, {"species": "Weedle", "level": 3}, {"species": "Pidgey", "level": 3}]
+        server.handle({"op": "new_session", "session": "a", "team": team})
+        server.handle({"op": "start_battle", "session": "a", "opponent": [{"species": "Charmander", "level": 60}],
+                       "trainer": "Rival", "seed": 1})
+        response = None
+        for _ in range(20):
+            response = server.handle({"op": "act", "session": "a", "move": 0, "replace": 2})
+            if response["team"][0]["hp"] == 0:
+                break
+        self.assertEqual(response["battle"]["active"], 2)
+        server.handle({"op": "new_session", "session": "b"}) # Evicts "a"; the replacement survives rehydration
+        self.assertEqual(server.handle({"op": "state", "session": "a"})["battle"]["active"], 2)
+
+    def test_stdio(self):
+        requests = [{"op": "new_session", "session": "s"}, {"op": "ping"}, {"op": "shutdown"}, {"op": "ping"}]
+        stdout = io.StringIO()
+        server = self.new_server()
+        serve_stdio(server, io.StringIO("\n".join(json.dumps(r) for r in requests) + "\n"), stdout)
+        responses = [json.loads(line) for line in stdout.getvalue().splitlines()]
+        self.assertEqual(len(responses), 3) # Nothing is served after shutdown
+        self.assertTrue(all(r["ok"] for r in responses))
+
+    def test_unix_socket(self):
+        server = self.new_server()
+        path = os.path.join(self.directory, "game.sock")
+
+        async def scenario():
+            ready = asyncio.Event()
+            serving = asyncio.create_task(serve_unix(server, path, ready))
+            await ready.wait()
+            reader, writer = await asyncio.open_unix_connection(path)
+            responses = []
+            for request in ({"op": "new_session", "session": "u"}, {"op": "stats"}, {"op": "shutdown"}):
+                writer.write(json.dumps(request).encode() + b"\n")
+                await writer.drain()
+                responses.append(json.loads(await reader.readline()))
+            writer.close()
+            await asyncio.wait_for(serving, 5)
+            return responses
+
+        responses = asyncio.run(scenario())
+        self.assertTrue(all(r["ok"] for r in responses))
+        self.assertEqual(responses[1]["sessions_created"], 1)
+        self.assertFalse(os.path.exists(path))
+
+if __name__ == '__main__':
+    unittest.main()
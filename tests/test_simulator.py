@@ -0,0 +1,82 @@
+# tests/test_simulator.py
+import random
+import unittest
+from unittest.mock import patch
+from game.battle import Battle
+from game.classes.move import Move
+from game.classes.player import Player
+from game.classes.pokemon import Pokemon
+
+try:
+    import numpy as np
+    from game.simulator import simulate_matchup, WIN_A
+except ImportError: # NumPy is optional for the core game
+    np = None
+
+def make_pokemon(name: str, speed: int, accuracy: int) -> Pokemon:
+    pokemon = Pokemon(species_name=name, types=["Normal"], level=20, max_hp=60, attack=30, defense=30, speed=speed)
+    pokemon.moves = [Move(name="Tackle", type="Normal", category="Physical", power=40, accuracy=accuracy, pp=35)]
+    return pokemon
+
+@unittest.skipIf(np is None, "NumPy is not installed")
+class TestSimulateMatchup(unittest.TestCase):
+
+    def test_matches_battle_statistically(self):
+        """Simulated win rates should agree with repeated Battle runs."""
+        random.seed(1234)
+        battle_wins = 0
+        battle_turns = 0
+        n_battles = 600
+        for _ in range(n_battles):
+            with patch('builtins.print'):
+                player = Player("Tester")
+                player.add_pokemon(make_pokemon("Alpha", speed=50, accuracy=70))
+            battle = Battle(player, make_pokemon("Beta", speed=50, accuracy=85), headless=True)
+            winner = battle.run_battle()
+            battle_wins += winner is battle.player_active_pokemon
+            battle_turns += battle.turn_count
+
+        result = simulate_matchup(make_pokemon("Alpha", 50, 70), make_pokemon("Beta", 50, 85), 50_000, seed=1)
+        self.assertEqual(result.n_battles, 50_000)
+        self.assertEqual(result.draws, 0)
+        self.assertAlmostEqual(result.win_rate_a, battle_wins / n_battles, delta=0.06)
+        self.assertAlmostEqual(result.turns.mean(), battle_turns / n_battles, delta=0.5)
+
+    def test_faster_pokemon_wins_one_hit_ko_race(self):
+        """When both sides KO in one hit, the faster side always wins on turn 1."""
+        fast = make_pokemon("Fast", 60, 100)
+        slow = make_pokemon("Slow", 40, 100)
+        fast.current_hp = slow.current_hp = 5
+        result = simulate_matchup(fast, slow, 1000, seed=0)
+        self.assertTrue((result.winners == WIN_A).all())
+        self.assertEqual(result.turn_histogram(), {1: 1000})
+
+    def test_status_moves_only_draw(self):
+        """Battles where neither side can deal damage should end as draws at max_turns."""
+        a = make_pokemon("A", 50, 100)
+        b = make_pokemon("B", 50, 100)
+        growl = Move(name="Growl", type="Normal", category="Status", power=0, accuracy=100, pp=40)
+        result = simulate_matchup(a, b, 100, move_a=growl, move_b=growl, max_turns=10, seed=0)
+        self.assertEqual(result.draws, 100)
+        self.assertEqual(result.turn_histogram(), {10: 100})
+        self.assertEqual(a.current_hp, 60) # Inputs are not modified
+
+    def test_seed_is_reproducible(self):
+        a = make_pokemon("A", 50, 80)
+        b = make_pokemon("B", 50, 80)
+        first = simulate_matchup(a, b, 500, seed=7)
+        second = simulate_matchup(a, b, 500, seed=7)
+        self.assertTrue(np.array_equal(first.winners, second.winners))
+        self.assertTrue(np.array_equal(first.turns, second.turns))
+        self.assertEqual(first.wins_a + first.wins_b + first.draws, 500)
+
+    def test_no_moves_raises(self):
+        a = make_pokemon("A", 50, 100)
+        b = make_pokemon("B", 50, 100)
+        b.moves = []
+        with self.assertRaises(ValueError):
+            simulate_matchup(a, b, 10)
+
+
+if __name__ == '__main__':
+    unittest.main()
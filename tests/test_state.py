@@ -0,0 +1,40 @@
+# tests/test_state.py
+import unittest
+from game.state import BattleState, PLAYER, OPPONENT
+
+class TestBattleState(unittest.TestCase):
+
+    def setUp(self):
+        self.state = BattleState(((30, 20), (25,)))
+
+    def test_transitions_do_not_mutate(self):
+        """Every transition should return a new state and leave the original untouched."""
+        hit = self.state.damage(OPPONENT, 10)
+        self.assertEqual(hit.hp, ((30, 20), (15,)))
+        self.assertEqual(self.state.hp, ((30, 20), (25,)))
+        self.assertIs(hit.hp[PLAYER], self.state.hp[PLAYER]) # Untouched side is shared
+        self.assertIs(self.state.clone(), self.state)
+        self.assertEqual(self.state.next_turn().turn_count, 1)
+        self.assertEqual(self.state.with_active(PLAYER, 1).active_hp(PLAYER), 20)
+
+    def test_fainting_and_winner(self):
+        state = self.state.damage(PLAYER, 99)
+        self.assertEqual(state.active_hp(PLAYER), 0) # Clamped
+        self.assertTrue(state.is_fainted(PLAYER))
+        self.assertFalse(state.is_over) # A benched Pokemon is still standing
+        self.assertEqual(state.alive_count(PLAYER), 1)
+        state = state.with_active(PLAYER, 1).damage(PLAYER, 20)
+        self.assertTrue(state.is_over)
+        self.assertEqual(state.winner, OPPONENT)
+        self.assertIsNone(self.state.winner)
+
+    def test_equality_and_hash(self):
+        """Equal states should hash the same so they can key transposition tables."""
+        a = self.state.damage(OPPONENT, 5).next_turn()
+        b = self.state.next_turn().damage(OPPONENT, 5)
+        self.assertEqual(a, b)
+        self.assertEqual(len({a, b, self.state}), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
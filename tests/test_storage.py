@@ -0,0 +1,111 @@
+# tests/test_storage.py
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+from game.classes.move import Move
+from game.classes.player import Player
+from game.classes.pokemon import Pokemon
+from game.storage import PCStorage
+
+SPECIES = [("Pikachu", ["Electric"]), ("Pidgey", ["Normal", "Flying"]), ("Squirtle", ["Water"]),
+           ("Gyarados", ["Water", "Flying"])]
+
+def make_pokemon(i: int) -> Pokemon:
+    name, types = SPECIES[i % len(SPECIES)]
+    pokemon = Pokemon(species_name=name, types=types, level=1 + i % 50, max_hp=30 + i % 7, attack=10, defense=10, speed=10)
+    pokemon.moves = [Move(name="Tackle", type="Normal", category="Physical", power=40, accuracy=100, pp=35)]
+    return pokemon
+
+class TestPCStorage(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+    def fill(self, pc: PCStorage, count: int) -> list[Pokemon]:
+        stored = [make_pokemon(i) for i in range(count)]
+        for pokemon in stored:
+            pc.deposit(pokemon)
+        return stored
+
+    def test_queries(self):
+        with PCStorage(self.tmp.name, box_size=10) as pc:
+            stored = self.fill(pc, 200)
+            self.assertEqual(len(pc), 200)
+            pikachu = pc.find(species="Pikachu")
+            self.assertEqual(len(pikachu), 50)
+            self.assertTrue(all(pc.get(slot).species_name == "Pikachu" for slot in pikachu))
+            flying = pc.find(type_name="Flying", min_level=10, max_level=20)
+            expected = [i for i, p in enumerate(stored) if "Flying" in p.types and 10 <= p.level <= 20]
+            self.assertEqual(flying, expected)
+            self.assertEqual(pc.find(species="Gyarados", type_name="Electric"), [])
+            self.assertEqual(pc.find(species="Mew"), [])
+            self.assertEqual(pc.get_by_id(stored[123].id).level, stored[123].level)
+            self.assertEqual(pc.species_counts()["Squirtle"], 50)
+
+    def test_pages_boxes_lazily(self):
+        with PCStorage(self.tmp.name, box_size=10, cache_boxes=2) as pc:
+            stored = self.fill(pc, 100)
+            self.assertLessEqual(len(pc._cache), 2) # Older boxes were written out and dropped
+        self.assertEqual(len([f for f in os.listdir(self.tmp.name) if f.endswith(".pcb")]), 10)
+
+        reopened = PCStorage(self.tmp.name, cache_boxes=2)
+        self.assertEqual(len(reopened), 100)
+        self.assertEqual(len(reopened._cache), 0) # Index only; no box read yet
+        slot = reopened.find(species="Squirtle", min_level=43, max_level=43)[0]
+        pokemon = reopened.get(slot)
+        self.assertEqual(pokemon.id, stored[slot].id)
+        self.assertEqual(pokemon.moves[0].name, "Tackle")
+        self.assertEqual(len(reopened._cache), 1)
+
+    def test_index_columns_are_little_endian(self):
+        """The index has one layout whatever the machine's byte order, so PCs move between machines."""
+        with PCStorage(self.tmp.name) as pc:
+            pokemon = make_pokemon(5) # Pidgey, level 6
+            pc.deposit(pokemon)
+        with open(os.path.join(self.tmp.name, "index.pci"), "rb") as f:
+            data = f.read()
+        columns = data[-16 - 8:-16] # Species code (i32), level (u16), type key (u16), then the ID
+        self.assertEqual(columns, (0).to_bytes(4, "little", signed=True) + (6).to_bytes(2, "little")
+                         + pokemon.type_key.to_bytes(2, "little"))
+        self.assertEqual(data[-16:], pokemon.id.bytes)
+        self.assertEqual(PCStorage(self.tmp.name).find(species="Pidgey", min_level=6, max_level=6), [0])
+
+    def test_withdraw_update_and_reuse(self):
+        with PCStorage(self.tmp.name, box_size=10) as pc:
+            stored = self.fill(pc, 30)
+            taken = pc.withdraw(5)
+            self.assertIs(taken, stored[5])
+            self.assertNotIn(taken.id, pc)
+            self.assertIsNone(pc.get(5))
+            with self.assertRaises(KeyError):
+                pc.withdraw(5)
+
+            pokemon = pc.get(7)
+            pokemon.level = 99
+            pc.update(pokemon)
+            self.assertEqual(pc.find(min_level=99), [7])
+
+            newcomer = make_pokemon(1000)
+            self.assertEqual(pc.deposit(newcomer), 5) # First free slot is reused
+            with self.assertRaises(ValueError):
+                pc.deposit(newcomer)
+
+        reopened = PCStorage(self.tmp.name)
+        self.assertEqual(reopened.get(7).level, 99)
+        self.assertEqual(reopened.get(5).id, newcomer.id)
+        self.assertEqual(reopened.deposit(make_pokemon(2000)), 30)
+
+    def test_full_team_goes_to_pc(self):
+        with patch('builtins.print'):
+            player = Player("Ash")
+            player.pc = PCStorage(self.tmp.name)
+            for i in range(8):
+                player.add_pokemon(make_pokemon(i))
+        self.assertEqual(len(player.team), 6)
+        self.assertEqual(len(player.pc), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
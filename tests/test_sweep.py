@@ -0,0 +1,90 @@
+# tests/test_sweep.py
+import os
+import shutil
+import tempfile
+import unittest
+from game.classes.move import Move
+from game.classes.pokemon import Pokemon
+
+try:
+    import numpy as np
+    from game.sweep import Sweep, SweepCache, apply_overrides, grid_points, random_points
+    from game.tournament import pokemon_spec
+except ImportError: # NumPy is optional for the core game
+    np = None
+
+def make_pokemon(name: str, attack: int, speed: int) -> Pokemon:
+    pokemon = Pokemon(species_name=name, types=["Normal"], level=20, max_hp=60, attack=attack, defense=30, speed=speed)
+    pokemon.moves = [Move(name="Tackle", type="Normal", category="Physical", power=40, accuracy=100, pp=35)]
+    return pokemon
+
+@unittest.skipIf(np is None, "NumPy is not installed")
+class TestSweepPoints(unittest.TestCase):
+
+    def test_grid_and_random_points(self):
+        points = grid_points({"attack": [20, 40], "opponent.speed": [10, 20, 30]})
+        self.assertEqual(len(points), 6)
+        self.assertIn({"attack": 40, "opponent.speed": 20}, points)
+        samples = random_points({"power": (30, 90), "accuracy": (70, 100)}, samples=20, seed=4)
+        self.assertEqual(samples, random_points({"power": (30, 90), "accuracy": (70, 100)}, samples=20, seed=4))
+        self.assertTrue(all(30 <= point["power"] <= 90 and 70 <= point["accuracy"] <= 100 for point in samples))
+        with self.assertRaises(ValueError):
+            grid_points({"level": [5]})
+
+    def test_overrides_apply_to_one_side(self):
+        spec = pokemon_spec(make_pokemon("A", 30, 30))
+        subject = apply_overrides(spec, {"max_hp": 90, "power": 70, "opponent.attack": 5}, opponent=False)
+        self.assertEqual((subject[4], subject[5], subject[6]), (90, 90, 30)) # Full health at the new max
+        self.assertEqual(subject[-1][0][3], 70)
+        opponent = apply_overrides(spec, {"max_hp": 90, "opponent.attack": 5}, opponent=True)
+        self.assertEqual((opponent[4], opponent[6]), (60, 5))
+
+@unittest.skipIf(np is None, "NumPy is not installed")
+class TestSweep(unittest.TestCase):
+
+    def setUp(self):
+        self.cache_dir = tempfile.mkdtemp()
+        self.subject = make_pokemon("Subject", 30, 50)
+        self.opponents = [make_pokemon("Slow", 30, 10), make_pokemon("Fast", 30, 90)]
+
+    def tearDown(self):
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+
+    def test_surface_tracks_attack(self):
+        """More attack should never lower the win rate, and the surface should have one cell per grid point."""
+        points = grid_points({"attack": [10, 30, 80], "speed": [5, 95]})
+        with Sweep(self.subject, self.opponents, battles=200, max_workers=2, chunk_size=3) as sweep:
+            result = sweep.run(points)
+        self.assertEqual(len(result.rows), 12)
+        xs, ys, rates = result.surface("attack", "speed")
+        self.assertEqual((xs, ys), ([10, 30, 80], [5, 95]))
+        self.assertEqual(rates.shape, (2, 3))
+        for row in rates:
+            self.assertTrue(row[0] <= row[1] <= row[2])
+        self.assertGreater(rates[0, 2], 0.5)
+        self.assertLess(rates[0, 0], 0.5)
+        csv = result.surface_csv("attack", "speed")
+        self.assertTrue(csv.startswith("speed\\attack,10,30,80\n"))
+
+    def test_cache_only_simulates_new_points(self):
+        with Sweep(self.subject, self.opponents, cache_dir=self.cache_dir, battles=50, max_workers=2) as sweep:
+            first = sweep.run(grid_points({"attack": [20, 40]}))
+            self.assertEqual((first.simulated, first.cached), (4, 0))
+            extended = sweep.run(grid_points({"attack": [20, 40, 60]}))
+        self.assertEqual((extended.simulated, extended.cached), (2, 4))
+        before = {(row.params["attack"], row.opponent): row.wins for row in first.rows}
+        after = {(row.params["attack"], row.opponent): row.wins for row in extended.rows}
+        self.assertTrue(all(after[key] == wins for key, wins in before.items())) # Cached rows are reused as is
+        self.assertEqual(sum(len(files) for _, _, files in os.walk(self.cache_dir)), 6)
+
+    def test_cache_ignores_unreadable_entries(self):
+        cache = SweepCache(self.cache_dir)
+        cache.put("ab" * 32, {"wins": 1, "losses": 0, "draws": 0, "mean_turns": 2.0})
+        self.assertEqual(cache.get("ab" * 32)["wins"], 1)
+        with open(os.path.join(self.cache_dir, "ab", "ab" * 32 + ".json"), "w") as f:
+            f.write("{truncated")
+        self.assertIsNone(cache.get("ab" * 32))
+        self.assertIsNone(cache.get("cd" * 32))
+
+if __name__ == '__main__':
+    unittest.main()
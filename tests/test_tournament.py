@@ -0,0 +1,76 @@
+# tests/test_tournament.py
+import unittest
+from game.classes.move import Move
+from game.classes.pokemon import Pokemon
+from game.tournament import Tournament, WinTable
+
+def make_pokemon(name: str, attack: int, speed: int) -> Pokemon:
+    pokemon = Pokemon(species_name=name, types=["Normal"], level=20, max_hp=60, attack=attack, defense=30, speed=speed)
+    pokemon.moves = [Move(name="Tackle", type="Normal", category="Physical", power=40, accuracy=100, pp=35)]
+    return pokemon
+
+class TestWinTable(unittest.TestCase):
+
+    def test_record_and_standings(self):
+        table = WinTable(["A", "B", "C"])
+        table.record(0, 1, wins_i=3, wins_j=1, draws=0)
+        table.record(1, 2, wins_i=2, wins_j=0, draws=2)
+        self.assertEqual(table.games(0, 1), 4)
+        self.assertEqual(table.win_rate(0, 1), 0.75)
+        self.assertEqual(table.win_rate(1, 0), 0.25)
+        self.assertEqual(table.win_rate(2, 1), 0.25) # 0 wins + 2 draws out of 4
+        self.assertEqual(table.battles_played, 8)
+        self.assertEqual([name for name, _ in table.standings()], ["A", "B", "C"])
+
+class TestTournament(unittest.TestCase):
+
+    def setUp(self):
+        # Strictly ordered roster: more attack and speed always wins with perfect accuracy
+        self.roster = [make_pokemon("Weak", 20, 10), make_pokemon("Strong", 80, 90),
+                       make_pokemon("Medium", 45, 50), make_pokemon("Tough", 60, 70)]
+
+    def test_round_robin_streams_tables(self):
+        """Round robin should yield a table per chunk and end with the expected ranking."""
+        with Tournament(self.roster, battles_per_matchup=5, max_workers=2, chunk_size=2, seed=3) as tournament:
+            snapshots = [table.battles_played for table in tournament.iter_round_robin()]
+        self.assertEqual(len(snapshots), 3) # 6 matchups in chunks of 2
+        self.assertEqual(snapshots[-1], 30)
+        self.assertEqual(snapshots, sorted(snapshots))
+        with Tournament(self.roster, battles_per_matchup=5, max_workers=2) as tournament:
+            table = tournament.round_robin()
+        self.assertEqual([name for name, _ in table.standings()], ["Strong", "Tough", "Medium", "Weak"])
+        self.assertEqual(table.win_rate(1, 0), 1.0)
+        self.assertEqual(self.roster[0].current_hp, 60) # Roster is untouched by the workers
+
+    def test_swiss_rounds(self):
+        """Swiss pairing should avoid rematches and rank the strongest entry first."""
+        with Tournament(self.roster, battles_per_matchup=3, max_workers=2) as tournament:
+            rounds = list(tournament.iter_swiss(rounds=3))
+        self.assertEqual([number for number, _, _ in rounds], [1, 2, 3])
+        final_ranking = rounds[-1][1]
+        self.assertEqual(final_ranking[0], ("Strong", 3.0))
+        self.assertEqual(rounds[-1][2].battles_played, 3 * 2 * 3) # 3 rounds x 2 matchups x 3 battles
+
+    def test_swiss_pairings_with_bye(self):
+        pairings, bye = Tournament._swiss_pairings([2.0, 1.0, 0.0], played={(0, 1)})
+        self.assertEqual(bye, 2)
+        self.assertEqual(pairings, [(0, 1)]) # Only option left, rematch allowed
+        _, bye = Tournament._swiss_pairings([2.0, 1.0, 0.0], played=set(), had_bye={2})
+        self.assertEqual(bye, 1) # Entry 2 already had one
+        _, bye = Tournament._swiss_pairings([2.0, 1.0, 0.0], played=set(), had_bye={0, 1, 2})
+        self.assertEqual(bye, 2)
+
+    def test_swiss_byes_rotate(self):
+        """With an odd field, no entry gets a second bye before everyone has had one."""
+        with Tournament(self.roster[:3], battles_per_matchup=1, max_workers=2) as tournament:
+            rounds = list(tournament.iter_swiss(rounds=3))
+        matchups = [rounds[-1][2].games(i, j) for i in range(3) for j in range(i + 1, 3)]
+        self.assertEqual(matchups, [1, 1, 1]) # Each round a different pair plays, so each entry sat out once
+
+    def test_invalid_roster(self):
+        with self.assertRaises(ValueError):
+            Tournament(self.roster[:1])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,85 @@
+# tests/test_types.py
+import unittest
+from game.battle import calculate_base_damage
+from game.classes.move import Move, PHYSICAL, SPECIAL, STATUS
+from game.classes.pokemon import Pokemon
+from game.types import TYPES, TypeRegistry, MAX_TYPES, STAB_MULTIPLIER
+
+def make_pokemon(types: list[str]) -> Pokemon:
+    return Pokemon(species_name="Testmon", types=types, level=20, max_hp=60, attack=30, defense=30, speed=50)
+
+def make_move(move_type: str, category: str = "Physical", power: int = 40) -> Move:
+    return Move(name="Test Move", type=move_type, category=category, power=power, accuracy=100, pp=10)
+
+class TestTypeRegistry(unittest.TestCase):
+
+    def test_single_and_dual_effectiveness(self):
+        """Dual-type keys should combine both single-type multipliers."""
+        fire = TYPES.type_id("Fire")
+        self.assertEqual(TYPES.effectiveness(fire, TYPES.defender_key(["Grass"])), 2.0)
+        self.assertEqual(TYPES.effectiveness(fire, TYPES.defender_key(["Grass", "Steel"])), 4.0)
+        self.assertEqual(TYPES.effectiveness(fire, TYPES.defender_key(["Water", "Rock"])), 0.25)
+        self.assertEqual(TYPES.effectiveness(TYPES.type_id("Electric"), TYPES.defender_key(["Water", "Ground"])), 0.0)
+        self.assertEqual(TYPES.effectiveness(TYPES.type_id("Normal"), TYPES.defender_key(["Normal"])), 1.0)
+
+    def test_registered_types_are_neutral(self):
+        registry = TypeRegistry()
+        with self.assertRaises(ValueError): # Typos and unregistered names are rejected
+            registry.type_id("Sound")
+        sound = registry.register("Sound")
+        self.assertEqual(registry.register("Sound"), sound) # Interned once
+        self.assertEqual(registry.type_id("Sound"), sound)
+        self.assertEqual(registry.register("Fire"), registry.type_id("Fire"))
+        self.assertEqual(registry.type_name(sound), "Sound")
+        self.assertEqual(registry.effectiveness(sound, registry.defender_key(["Ghost"])), 1.0)
+        self.assertEqual(registry.effectiveness(registry.type_id("Ghost"), registry.defender_key(["Sound"])), 1.0)
+
+    def test_invalid_type_lists(self):
+        with self.assertRaises(ValueError):
+            TYPES.defender_key([])
+        with self.assertRaises(ValueError):
+            TYPES.defender_key(["Fire", "Water", "Grass"])
+        registry = TypeRegistry(names=[f"T{i}" for i in range(MAX_TYPES)], chart={})
+        with self.assertRaises(ValueError):
+            registry.register("One Too Many")
+        with self.assertRaises(ValueError):
+            make_move("Fier")
+        with self.assertRaises(ValueError):
+            make_pokemon(["Fire", "Watr"])
+
+    def test_has_type(self):
+        key = TYPES.defender_key(["Water", "Flying"])
+        self.assertTrue(TYPES.has_type(key, TYPES.type_id("Flying")))
+        self.assertFalse(TYPES.has_type(key, TYPES.type_id("Fire")))
+
+class TestInternedIds(unittest.TestCase):
+
+    def test_move_and_pokemon_ids_stay_in_sync(self):
+        move = make_move("Water", "Special")
+        self.assertEqual((move.type_id, move.category_id), (TYPES.type_id("Water"), SPECIAL))
+        move.category = "Status"
+        self.assertEqual(move.category_id, STATUS)
+        with self.assertRaises(ValueError):
+            move.category = "Magic"
+        pokemon = make_pokemon(["Fire"])
+        pokemon.types = ["Grass", "Poison"]
+        self.assertEqual(pokemon.type_key, TYPES.defender_key(["Grass", "Poison"]))
+        self.assertEqual(make_move("Normal").category_id, PHYSICAL)
+
+class TestDamageMultipliers(unittest.TestCase):
+
+    def test_stab_and_effectiveness(self):
+        """Base damage should include STAB and the dual-type multiplier."""
+        neutral = calculate_base_damage(make_pokemon(["Normal"]), make_pokemon(["Water"]), make_move("Fighting"))
+        stab = calculate_base_damage(make_pokemon(["Fighting"]), make_pokemon(["Psychic"]), make_move("Fighting"))
+        super_effective = calculate_base_damage(make_pokemon(["Normal"]), make_pokemon(["Rock", "Ice"]), make_move("Fighting"))
+        self.assertAlmostEqual(stab, neutral * STAB_MULTIPLIER * 0.5)
+        self.assertAlmostEqual(super_effective, neutral * 4)
+
+    def test_immunity_and_status(self):
+        self.assertEqual(calculate_base_damage(make_pokemon(["Normal"]), make_pokemon(["Ghost"]), make_move("Normal")), 0.0)
+        self.assertEqual(calculate_base_damage(make_pokemon(["Normal"]), make_pokemon(["Normal"]), make_move("Normal", "Status", 0)), 0.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,110 @@
+# tests/test_world.py
+import tempfile
+import unittest
+from game.world import (CHUNK_SIZE, GRASS, PATH, TREE, WALL, Chunk, ChunkStore, TerrainGenerator, World)
+
+def bfs_length(world: World, start, goal, limit: int) -> int | None:
+    """Reference shortest path length within a bounded box."""
+    from collections import deque
+    seen = {start}
+    queue = deque([(start, 0)])
+    while queue:
+        (x, y), d = queue.popleft()
+        if (x, y) == goal:
+            return d
+        for n in ((x + 1, y), (x - 1, y), (x, y + 1), (x, y - 1)):
+            if n not in seen and 0 <= n[0] < limit and 0 <= n[1] < limit and world.is_walkable(*n):
+                seen.add(n)
+                queue.append((n, d + 1))
+    return None
+
+class TestWorld(unittest.TestCase):
+
+    def test_lru_chunk_loading(self):
+        world = World(ChunkStore(generator=TerrainGenerator(seed=1)), cache_chunks=4)
+        for cx in range(10):
+            world.tile(cx * CHUNK_SIZE, 0)
+        self.assertEqual(world.loaded_chunks(), 4)
+        self.assertEqual(world.chunk_loads, 10)
+        # Generated chunks are deterministic, so evicting and reloading is invisible
+        first = bytes(World(ChunkStore(generator=TerrainGenerator(seed=1))).chunk(0, 0).tiles)
+        self.assertEqual(bytes(world.chunk(0, 0).tiles), first)
+
+    def test_edits_survive_eviction(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            world = World(ChunkStore(tmp, TerrainGenerator(seed=2)), cache_chunks=2)
+            world.set_tile(5, 5, WALL)
+            for cx in range(1, 6):
+                world.tile(cx * CHUNK_SIZE, 0) # Evicts chunk (0, 0), writing it out
+            self.assertEqual(world.tile(5, 5), WALL)
+            self.assertEqual(World(ChunkStore(tmp)).tile(5, 5), WALL)
+
+        memory_only = World(ChunkStore(), cache_chunks=1)
+        memory_only.set_tile(3, 3, TREE)
+        memory_only.tile(CHUNK_SIZE * 4, 0)
+        self.assertEqual(memory_only.tile(3, 3), TREE) # Pinned instead of lost
+
+    def test_chunk_round_trip(self):
+        chunk = Chunk(-3, 7, "forest")
+        chunk.tiles[10] = GRASS
+        restored = Chunk.from_bytes(chunk.to_bytes())
+        self.assertEqual((restored.cx, restored.cy, restored.zone), (-3, 7, "forest"))
+        self.assertEqual(restored.tiles, chunk.tiles)
+
+    def test_a_star_is_shortest(self):
+        size = 3 * CHUNK_SIZE
+        world = World(ChunkStore(generator=TerrainGenerator(seed=3, obstacles=0.3)), width=size, height=size)
+        goals = [(size - 1 - i, size - 1 - 2 * i) for i in range(5)]
+        for goal in goals:
+            for point in ((0, 0), goal):
+                world.set_tile(*point, PATH)
+            path = world.find_path((0, 0), goal)
+            expected = bfs_length(world, (0, 0), goal, size)
+            if expected is None:
+                self.assertIsNone(path)
+                continue
+            self.assertEqual(len(path) - 1, expected)
+            self.assertEqual((path[0], path[-1]), ((0, 0), goal))
+            self.assertTrue(all(world.is_walkable(*p) for p in path))
+            self.assertTrue(all(abs(a[0] - b[0]) + abs(a[1] - b[1]) == 1 for a, b in zip(path, path[1:])))
+
+    def test_path_cache_invalidated_per_chunk(self):
+        world = World(ChunkStore(), width=4 * CHUNK_SIZE, height=CHUNK_SIZE) # All PATH tiles
+        short = world.find_path((0, 0), (10, 0))
+        far = world.find_path((100, 5), (120, 5))
+        self.assertEqual(len(short), 11)
+        world.find_path((0, 0), (10, 0))
+        self.assertEqual(world.path_cache_hits, 1)
+
+        world.set_tile(5, 0, WALL) # Chunk (0, 0) only
+        detour = world.find_path((0, 0), (10, 0))
+        self.assertNotIn((5, 0), detour)
+        self.assertEqual(len(detour), 13)
+        self.assertEqual(world.find_path((100, 5), (120, 5)), far)
+        self.assertEqual(world.path_cache_hits, 2) # The far path was still cached
+
+    def test_unreachable(self):
+        world = World(ChunkStore(), width=CHUNK_SIZE, height=CHUNK_SIZE)
+        for y in range(CHUNK_SIZE):
+            world.set_tile(10, y, WALL)
+        self.assertIsNone(world.find_path((0, 0), (20, 0)))
+        self.assertIsNone(world.find_path((0, 0), (10, 0))) # Goal is a wall
+        self.assertEqual(world.tile(-1, 0), WALL) # Out of bounds
+        unbounded = World(ChunkStore())
+        unbounded.set_tile(1, 0, WALL)
+        self.assertIsNone(unbounded.find_path((0, 0), (1, 0), max_nodes=50))
+
+    def test_path_cache_respects_node_budget(self):
+        world = World(ChunkStore(generator=TerrainGenerator(seed=1)), width=64, height=64)
+        for x in range(20):
+            world.set_tile(x, 0, PATH)
+        self.assertIsNone(world.find_path((0, 0), (19, 0), max_nodes=1)) # Gives up, and is not cached
+        path = world.find_path((0, 0), (19, 0))
+        self.assertEqual(len(path), 20)
+        self.assertIsNone(world.find_path((0, 0), (19, 0), max_nodes=1)) # Too small a budget to find it
+        self.assertEqual(world.find_path((0, 0), (19, 0)), path)
+        self.assertEqual(world.path_cache_hits, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()